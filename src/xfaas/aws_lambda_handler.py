@@ -2,57 +2,45 @@
 AWS Lambda Handler for Quantum Processing
 """
 
+import os
 import json
-import boto3
+import functools
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="braket")
-from braket.circuits import Circuit
-from braket.aws import AwsDevice
+from quantum_core import handle_request, prewarm_circuits
+from result_writer import ResultWriter
+
+# 'braket' runs on a Braket device, 'numpy' on the built-in statevector engine
+DEFAULT_SIMULATOR = os.environ.get('XFAAS_SIMULATOR', 'braket')
 
 def lambda_handler(event, context):
-    """AWS Lambda handler for quantum circuit execution"""
-    try:
-        circuit_data = event.get('circuit')
-        shots = event.get('shots', 100)
-        
-        # Create quantum circuit
-        circuit = Circuit()
-        if circuit_data == 'bell_state':
-            circuit.h(0).cnot(0, 1)
-        elif circuit_data == 'superposition':
-            circuit.h(0)
-        
-        # Execute on AWS Braket
-        device = AwsDevice("arn:aws:braket:::device/quantum-simulator/amazon/sv1")
-        task = device.run(circuit, shots=shots)
-        result = task.result()
-        
-        # Store results in S3
-        s3 = boto3.client('s3')
-        s3.put_object(
-            Bucket='quantum-xfaas-results',
-            Key=f'lambda-result-{context.aws_request_id}.json',
-            Body=json.dumps({
-                'measurement_counts': result.measurement_counts,
-                'execution_time': result.task_metadata.executionDuration
-            })
-        )
-        
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'provider': 'aws',
-                'measurement_counts': result.measurement_counts,
-                'shots': shots,
-                'success': True
-            })
-        }
-        
-    except Exception as e:
-        return {
-            'statusCode': 500,
-            'body': json.dumps({
-                'error': str(e),
-                'success': False
-            })
-        }
\ No newline at end of file
+    """AWS Lambda handler for quantum circuit execution
+    
+    The event is a quantum_core payload (see handle_request); 'device':
+    'local' runs on the Braket local simulator instead of SV1. Results are
+    stored in S3.
+    """
+    status, result_data = handle_request(
+        event, 'aws',
+        request_id=context.aws_request_id,
+        key_prefix='lambda',
+        writer=RESULT_WRITER,
+        simulator=DEFAULT_SIMULATOR
+    )
+    return {
+        'statusCode': status,
+        'body': json.dumps(result_data)
+    }
+
+@functools.lru_cache(maxsize=None)
+def s3_client():
+    """S3 client, created on first use and reused across warm invocations"""
+    import boto3
+    return boto3.client('s3')
+
+def upload_result(key, body):
+    s3_client().put_object(Bucket='quantum-xfaas-results', Key=key, Body=body)
+
+RESULT_WRITER = ResultWriter(upload_result, batch_prefix='lambda-results')
+
+prewarm_circuits(DEFAULT_SIMULATOR)
\ No newline at end of file
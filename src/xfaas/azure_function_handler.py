@@ -2,66 +2,62 @@
 Azure Functions Handler for Quantum Processing
 """
 
+import os
 import json
 import logging
+import functools
 import azure.functions as func
-from qiskit import QuantumCircuit, execute, Aer
-from azure.storage.blob import BlobServiceClient
+from quantum_core import handle_request, prewarm_circuits
+from result_writer import ResultWriter
+
+# 'qiskit' runs on Aer, 'numpy' on the built-in statevector engine
+DEFAULT_SIMULATOR = os.environ.get('XFAAS_SIMULATOR', 'qiskit')
 
 def main(req: func.HttpRequest) -> func.HttpResponse:
-    """Azure Function handler for quantum circuit execution"""
+    """Azure Function handler for quantum circuit execution
+    
+    The request body is a quantum_core payload (see handle_request); results
+    are stored in Azure Blob Storage.
+    """
     logging.info('Azure Function processing quantum request')
     
     try:
         req_body = req.get_json()
-        circuit_type = req_body.get('circuit')
-        shots = req_body.get('shots', 100)
-        
-        # Create quantum circuit using Qiskit
-        qc = QuantumCircuit(2, 2)
-        
-        if circuit_type == 'bell_state':
-            qc.h(0)
-            qc.cx(0, 1)
-            qc.measure_all()
-        elif circuit_type == 'superposition':
-            qc.h(0)
-            qc.measure_all()
-        
-        # Execute on local simulator
-        backend = Aer.get_backend('qasm_simulator')
-        job = execute(qc, backend, shots=shots)
-        result = job.result()
-        counts = result.get_counts(qc)
-        
-        # Store results in Azure Blob Storage
-        blob_service = BlobServiceClient.from_connection_string("DefaultEndpointsProtocol=https;...")
-        blob_client = blob_service.get_blob_client(
-            container="quantum-results", 
-            blob=f"azure-result-{req.url}.json"
-        )
-        
-        result_data = {
-            'provider': 'azure',
-            'measurement_counts': counts,
-            'shots': shots,
-            'success': True
-        }
-        
-        blob_client.upload_blob(json.dumps(result_data), overwrite=True)
-        
-        return func.HttpResponse(
-            json.dumps(result_data),
-            status_code=200,
-            mimetype="application/json"
-        )
-        
     except Exception as e:
         return func.HttpResponse(
             json.dumps({
                 'error': str(e),
                 'success': False
             }),
-            status_code=500,
+            status_code=400,
             mimetype="application/json"
-        )
\ No newline at end of file
+        )
+    
+    status, result_data = handle_request(
+        req_body, 'azure',
+        request_id=req.url,
+        key_prefix='azure',
+        writer=RESULT_WRITER,
+        simulator=DEFAULT_SIMULATOR
+    )
+    return func.HttpResponse(
+        json.dumps(result_data),
+        status_code=status,
+        mimetype="application/json"
+    )
+
+@functools.lru_cache(maxsize=None)
+def blob_service_client():
+    """Blob Storage client, created on first use and reused across warm invocations"""
+    from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(
+        os.environ.get('AZURE_STORAGE_CONNECTION_STRING', "DefaultEndpointsProtocol=https;...")
+    )
+
+def upload_result(key, body):
+    blob_client = blob_service_client().get_blob_client(container="quantum-results", blob=key)
+    blob_client.upload_blob(body, overwrite=True)
+
+RESULT_WRITER = ResultWriter(upload_result, batch_prefix='azure-results')
+
+prewarm_circuits(DEFAULT_SIMULATOR)
\ No newline at end of file
@@ -11,13 +11,37 @@ from qiskit import QuantumCircuit, execute, Aer
 from qiskit.algorithms import VQE, QAOA
 from qiskit.optimization import QuadraticProgram
 import asyncio
+import functools
 from xfaas_orchestrator import XFaaSOrchestrator
+from grover_engine import marked_indices
+from config import ANALYSIS_CONFIG
+
+# 'reference' keeps the original per-element Python loops for cross-checking the vectorized baselines
+CLASSICAL_METHODS = ('vectorized', 'reference')
 
 class BigDataQuantumAnalyzer:
-    def __init__(self):
+    def __init__(self, concurrency: int = None):
         self.orchestrator = XFaaSOrchestrator()
         self.classical_results = {}
         self.quantum_results = {}
+        # Orchestrator calls in flight at once, shared by every analysis this analyzer runs
+        self.concurrency = concurrency or ANALYSIS_CONFIG['concurrency']
+        self._window = None
+        self._window_loop = None
+    
+    async def _run_bounded(self, calls):
+        """Await zero-argument coroutine functions, at most `concurrency` at a time, results in input order"""
+        loop = asyncio.get_running_loop()
+        if self._window_loop is not loop:
+            # A semaphore belongs to one event loop, so every asyncio.run gets a fresh window
+            self._window, self._window_loop = asyncio.Semaphore(self.concurrency), loop
+        window = self._window
+        
+        async def run(call):
+            async with window:
+                return await call()
+        
+        return await asyncio.gather(*[run(call) for call in calls])
         
     def generate_large_dataset(self, size=10000):
         """Generate large dataset for analysis"""
@@ -34,16 +58,13 @@ class BigDataQuantumAnalyzer:
         """Perform quantum optimization on large dataset"""
         start_time = time.time()
         
-        # Quantum Approximate Optimization Algorithm (QAOA)
-        results = []
-        for i in range(0, len(dataset['optimization_problems']), 100):
-            batch = dataset['optimization_problems'][i:i+100]
-            
-            # Execute quantum optimization across all cloud providers
-            quantum_result = await self.orchestrator.execute_cross_platform_quantum(
-                'optimization_circuit', shots=1000
-            )
-            results.append(quantum_result)
+        # Quantum Approximate Optimization Algorithm (QAOA), one cross-platform
+        # execution per 100-problem batch, run through the concurrency window
+        calls = [
+            functools.partial(self.orchestrator.execute_cross_platform_quantum, 'optimization_circuit', shots=1000)
+            for _ in range(0, len(dataset['optimization_problems']), 100)
+        ]
+        results = await self._run_bounded(calls)
         
         execution_time = time.time() - start_time
         
@@ -56,16 +77,20 @@ class BigDataQuantumAnalyzer:
             'success_rate': self._calculate_success_rate(results)
         }
     
-    def classical_optimization_analysis(self, dataset):
+    def classical_optimization_analysis(self, dataset, method='vectorized'):
         """Perform classical optimization for comparison"""
+        self._check_classical_method(method)
         start_time = time.time()
         
         # Classical brute force optimization
-        results = []
-        for problem in dataset['optimization_problems']:
-            # Simulate classical optimization
-            classical_result = self._classical_optimize(problem)
-            results.append(classical_result)
+        if method == 'vectorized':
+            results = self._classical_optimize_all(dataset['optimization_problems'])
+        else:
+            results = []
+            for problem in dataset['optimization_problems']:
+                # Simulate classical optimization
+                classical_result = self._classical_optimize(problem)
+                results.append(classical_result)
         
         execution_time = time.time() - start_time
         
@@ -80,13 +105,22 @@ class BigDataQuantumAnalyzer:
         """Grover's algorithm for database search"""
         start_time = time.time()
         
-        # Quantum search using Grover's algorithm
-        search_results = []
-        for query in dataset['search_queries'][:100]:  # Limit for demo
-            quantum_result = await self.orchestrator.execute_cross_platform_quantum(
-                'grover_search', shots=500
+        # Quantum search using Grover's algorithm; the oracle marks every position holding the query
+        queries = dataset['search_queries']
+        targets = queries[:100]  # Limit for demo
+        marked_sets = [marked_indices(queries, lambda values: values == query, vectorized=True)
+                       for query in targets]
+        calls = [
+            functools.partial(
+                self.orchestrator.execute_cross_platform_quantum, 'grover_search', shots=500,
+                params={'marked': marked.tolist(), 'space_size': len(queries)}
             )
-            search_results.append(quantum_result)
+            for marked in marked_sets
+        ]
+        search_results = await self._run_bounded(calls)
+        for quantum_result, query, marked in zip(search_results, targets, marked_sets):
+            quantum_result['query'] = int(query)
+            quantum_result['n_marked'] = len(marked)
         
         execution_time = time.time() - start_time
         
@@ -98,16 +132,20 @@ class BigDataQuantumAnalyzer:
             'cross_platform_results': search_results
         }
     
-    def classical_search_analysis(self, dataset):
+    def classical_search_analysis(self, dataset, method='vectorized'):
         """Classical linear search for comparison"""
+        self._check_classical_method(method)
         start_time = time.time()
         
         # Classical linear search
-        search_results = []
-        for query in dataset['search_queries']:
-            # Simulate classical search
-            result = self._classical_search(query, dataset['search_queries'])
-            search_results.append(result)
+        if method == 'vectorized':
+            search_results = self._classical_search_all(dataset['search_queries'], dataset['search_queries'])
+        else:
+            search_results = []
+            for query in dataset['search_queries']:
+                # Simulate classical search
+                result = self._classical_search(query, dataset['search_queries'])
+                search_results.append(result)
         
         execution_time = time.time() - start_time
         
@@ -119,36 +157,42 @@ class BigDataQuantumAnalyzer:
         }
     
     async def comprehensive_analysis(self, dataset_sizes=[1000, 5000, 10000, 50000]):
-        """Run comprehensive analysis across different dataset sizes"""
-        analysis_results = {}
-        
-        for size in dataset_sizes:
-            print(f"Analyzing dataset size: {size}")
-            dataset = self.generate_large_dataset(size)
-            
-            # Quantum analysis
-            quantum_opt = await self.quantum_optimization_analysis(dataset)
-            quantum_search = await self.quantum_search_analysis(dataset)
-            
-            # Classical analysis
-            classical_opt = self.classical_optimization_analysis(dataset)
-            classical_search = self.classical_search_analysis(dataset)
-            
-            analysis_results[size] = {
-                'quantum': {
-                    'optimization': quantum_opt,
-                    'search': quantum_search
-                },
-                'classical': {
-                    'optimization': classical_opt,
-                    'search': classical_search
-                },
-                'performance_comparison': self._compare_performance(
-                    quantum_opt, classical_opt, quantum_search, classical_search
-                )
-            }
+        """Run comprehensive analysis across different dataset sizes
         
-        return analysis_results
+        Sizes are analyzed concurrently; their quantum calls share the
+        analyzer's concurrency window. Results are keyed by size in input order.
+        """
+        analyses = await asyncio.gather(*[self._analyze_dataset_size(size) for size in dataset_sizes])
+        return dict(zip(dataset_sizes, analyses))
+    
+    async def _analyze_dataset_size(self, size):
+        """Quantum and classical analysis of one generated dataset"""
+        print(f"Analyzing dataset size: {size}")
+        dataset = self.generate_large_dataset(size)
+        
+        # Quantum analysis
+        quantum_opt, quantum_search = await asyncio.gather(
+            self.quantum_optimization_analysis(dataset),
+            self.quantum_search_analysis(dataset)
+        )
+        
+        # Classical analysis, off the event loop so other sizes keep their calls moving
+        classical_opt = await asyncio.to_thread(self.classical_optimization_analysis, dataset)
+        classical_search = await asyncio.to_thread(self.classical_search_analysis, dataset)
+        
+        return {
+            'quantum': {
+                'optimization': quantum_opt,
+                'search': quantum_search
+            },
+            'classical': {
+                'optimization': classical_opt,
+                'search': classical_search
+            },
+            'performance_comparison': self._compare_performance(
+                quantum_opt, classical_opt, quantum_search, classical_search
+            )
+        }
     
     def _calculate_quantum_advantage(self, quantum_time):
         """Calculate theoretical quantum advantage"""
@@ -178,6 +222,35 @@ class BigDataQuantumAnalyzer:
                 return {'found': True, 'position': i, 'comparisons': i + 1}
         return {'found': False, 'comparisons': len(dataset)}
     
+    def _check_classical_method(self, method):
+        if method not in CLASSICAL_METHODS:
+            raise ValueError(f"Unknown classical method '{method}', expected one of {list(CLASSICAL_METHODS)}")
+    
+    def _classical_optimize_all(self, problems):
+        """_classical_optimize for every problem at once"""
+        problems = np.asarray(problems)
+        return [{'solution': solution, 'iterations': iterations}
+                for solution, iterations in zip((problems % 10).tolist(), (problems * 2).tolist())]
+    
+    def _classical_search_all(self, queries, dataset):
+        """_classical_search for every query, answered from a first-occurrence index
+        
+        A linear scan stops at the first match, so its position (and comparison
+        count) is the first index of the query, found by binary search over
+        the distinct values instead of rescanning the dataset per query.
+        """
+        dataset = np.asarray(dataset)
+        queries = np.asarray(queries)
+        if len(dataset) == 0:
+            return [{'found': False, 'comparisons': 0} for _ in range(len(queries))]
+        values, first_index = np.unique(dataset, return_index=True)
+        slots = np.minimum(np.searchsorted(values, queries), len(values) - 1)
+        found = values[slots] == queries
+        positions = first_index[slots]
+        return [{'found': True, 'position': position, 'comparisons': position + 1} if hit
+                else {'found': False, 'comparisons': len(dataset)}
+                for hit, position in zip(found.tolist(), positions.tolist())]
+    
     def _compare_performance(self, q_opt, c_opt, q_search, c_search):
         """Compare quantum vs classical performance"""
         return {
@@ -0,0 +1,79 @@
+"""
+Circuit Template Cache for XFaaS Handlers
+Module-level LRU of built and transpiled circuits that lives across warm invocations
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+DEFAULT_CACHE_SIZE = int(os.environ.get('XFAAS_CIRCUIT_CACHE_SIZE', '128'))
+
+def prewarm_circuit_names() -> List[str]:
+    """Circuit names to build at import time, from XFAAS_PREWARM_CIRCUITS (comma separated)"""
+    names = os.environ.get('XFAAS_PREWARM_CIRCUITS', 'bell_state,superposition')
+    return [name.strip() for name in names.split(',') if name.strip()]
+
+def _freeze(value):
+    """Hashable, order-independent form of a JSON-like parameter value"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if hasattr(value, 'tolist'):
+        # NumPy scalars and arrays
+        return _freeze(value.tolist())
+    return value
+
+def circuit_spec(payload: Dict[str, Any]) -> tuple:
+    """Canonical (name, qubit count, parameters) key for a circuit payload"""
+    return (payload.get('circuit'), payload.get('n_qubits'), _freeze(payload.get('params') or {}))
+
+class CircuitCache:
+    """Thread-safe LRU of circuit objects keyed by canonical spec
+    
+    Cached circuits are shared between invocations and must not be mutated.
+    """
+    
+    def __init__(self, maxsize: int = None):
+        self.maxsize = maxsize if maxsize is not None else DEFAULT_CACHE_SIZE
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        """Return the cached circuit for `key`, building it with `builder` on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        # Build outside the lock; a concurrent miss on the same key just builds twice
+        circuit = builder()
+        with self._lock:
+            self._entries[key] = circuit
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return circuit
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Named Circuit Catalog for XFaaS
+Builds every circuit type the analyzers request for the NumPy engines
+"""
+
+import inspect
+from typing import Dict, Any, Callable
+from statevector import Circuit, InvalidRequestError
+from qaoa_engine import QAOAPortfolioOptimizer
+from grover_engine import search_qubits, optimal_iterations, success_probability, decode_search
+from parameter_sweep import symbolic
+from circuit_cache import CircuitCache, circuit_spec
+
+# Built catalog circuits, reused across warm invocations
+CATALOG_CACHE = CircuitCache()
+
+def bell_state(n_qubits: int = None) -> Circuit:
+    """Entangled two-qubit Bell pair"""
+    return Circuit(2).h(0).cx(0, 1)
+
+def superposition(n_qubits: int = None) -> Circuit:
+    """Uniform superposition via Hadamards (one qubit by default)"""
+    return Circuit(n_qubits or 1).h_all()
+
+def optimization_circuit(n_qubits: int = None, gammas=(0.5, 0.3, 0.2), beta: float = 0.4) -> Circuit:
+    """Single-layer QAOA-style optimization circuit (cost layer on q0/q1, RX mixer)"""
+    circuit = Circuit(max(n_qubits or 4, 2)).h_all()
+    circuit.rz(gammas[0], 0).rz(gammas[1], 1)
+    circuit.cx(0, 1).rz(gammas[2], 1).cx(0, 1)
+    for q in range(circuit.n_qubits):
+        circuit.rx(beta, q)
+    return circuit
+
+def grover_search(n_qubits: int = None, marked=None, iterations: int = None,
+                  space_size: int = None) -> Circuit:
+    """Grover search with a phase-flip oracle over the marked indices
+    
+    `space_size` sizes the register to a search space (n_qubits otherwise,
+    three by default); iterations default to the optimal count.
+    """
+    n = n_qubits or (search_qubits(space_size) if space_size else 3)
+    marked = [2 ** n - 1] if marked is None else [int(m) for m in marked]
+    if iterations is None:
+        iterations = optimal_iterations(2 ** n, len(set(marked)))
+    
+    circuit = Circuit(n).h_all()
+    for _ in range(iterations):
+        circuit.oracle(marked).diffusion()
+    circuit.metadata.update({
+        'search_space': space_size or 2 ** n,
+        'marked': sorted(set(marked)),
+        'n_marked': len(set(marked)),
+        'iterations': iterations,
+        'success_probability': success_probability(2 ** n, len(set(marked)), iterations)
+    })
+    return circuit
+
+def portfolio_qaoa(n_qubits: int = None, gamma: float = 0.5, beta: float = 0.4, layers: int = 1,
+                   returns=None, cov=None, risk_aversion: float = 0.5, budget: int = None,
+                   penalty: float = None, angles=None) -> Circuit:
+    """QAOA circuit for portfolio selection, one qubit per asset
+    
+    With `returns` and `cov` the cost layers encode the Markowitz QUBO and,
+    unless `angles` are given, the angles are optimized classically before
+    the circuit is built. Without them a ring ZZ ansatz is used.
+    """
+    if returns is not None:
+        optimizer = QAOAPortfolioOptimizer(returns, cov, risk_aversion, budget, penalty, layers)
+        if angles is None:
+            metadata = optimizer.optimize()
+            angles = metadata['angles']
+        else:
+            metadata = {'layers': layers}
+        metadata['budget'] = optimizer.budget
+        return optimizer.circuit(angles, metadata)
+    
+    n = n_qubits or 4
+    circuit = Circuit(n).h_all()
+    for _ in range(layers):
+        for q in range(n if n > 2 else n - 1):
+            circuit.rzz(gamma, q, (q + 1) % n)
+        for q in range(n):
+            circuit.rx(2 * beta, q)
+    return circuit
+
+CIRCUIT_BUILDERS: Dict[str, Callable[..., Circuit]] = {
+    'bell_state': bell_state,
+    'superposition': superposition,
+    'optimization_circuit': optimization_circuit,
+    'grover_search': grover_search,
+    'portfolio_qaoa': portfolio_qaoa
+}
+
+def _decode_grover(circuit: Circuit, counts: Dict[str, int]) -> Dict[str, Any]:
+    # From the metadata, not the oracle ops: zero optimal iterations leave no oracle in the circuit
+    return decode_search(counts, circuit.metadata['marked'])
+
+# Circuit-specific fields derived from the measured counts, added to every result
+RESULT_DECODERS: Dict[str, Callable[[Circuit, Dict[str, int]], Dict[str, Any]]] = {
+    'grover_search': _decode_grover
+}
+
+def build_catalog_circuit(name: str, n_qubits: int = None, params: Dict[str, Any] = None) -> Circuit:
+    """Build a named circuit; params are passed to the builder as keyword arguments
+    
+    {'parameter': i} placeholders become sweep Parameters, giving a parametric circuit.
+    """
+    if name not in CIRCUIT_BUILDERS:
+        raise InvalidRequestError(f"Unknown circuit '{name}', expected one of {sorted(CIRCUIT_BUILDERS)}")
+    builder = CIRCUIT_BUILDERS[name]
+    unknown = set(params or {}) - set(inspect.signature(builder).parameters)
+    if unknown:
+        raise InvalidRequestError(f"Unknown parameters {sorted(unknown)} for circuit '{name}'")
+    return builder(n_qubits, **symbolic(params or {}))
+
+def cached_catalog_circuit(payload: Dict[str, Any]) -> Circuit:
+    """Catalog circuit for a payload, built once per (circuit, n_qubits, params)"""
+    return CATALOG_CACHE.get_or_build(
+        circuit_spec(payload),
+        lambda: build_catalog_circuit(payload.get('circuit'), payload.get('n_qubits'), payload.get('params'))
+    )
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Shared Client Pool for XFaaS
+Process-wide, connection-pooled cloud SDK and HTTP clients reused across managers
+"""
+
+import threading
+import boto3
+import requests
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import CLOUD_PROVIDERS, CONNECTION_POOL_CONFIG
+
+_lock = threading.Lock()
+_session = None
+_lambda_clients = {}
+_http_session = None
+
+def get_lambda_client(region: str = None, endpoint_url: str = None):
+    """Return the shared Lambda client for a region and endpoint, creating it on first use
+    
+    boto3 clients are thread-safe once built, so a single client (and its
+    urllib3 connection pool) serves every manager and executor thread.
+    Creation goes through a private session under a lock because building
+    clients from the default session is not thread-safe.
+    """
+    global _session
+    region = region or CLOUD_PROVIDERS['aws']['region']
+    endpoint_url = endpoint_url or CLOUD_PROVIDERS['aws'].get('endpoint_url')
+    key = (region, endpoint_url)
+    
+    client = _lambda_clients.get(key)
+    if client is not None:
+        return client
+    
+    with _lock:
+        client = _lambda_clients.get(key)
+        if client is None:
+            if _session is None:
+                _session = boto3.session.Session()
+            client = _session.client(
+                'lambda',
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=build_lambda_config()
+            )
+            _lambda_clients[key] = client
+        return client
+
+def build_lambda_config() -> Config:
+    """botocore configuration derived from CONNECTION_POOL_CONFIG and CLOUD_PROVIDERS"""
+    return Config(
+        max_pool_connections=CONNECTION_POOL_CONFIG['max_pool_connections'],
+        connect_timeout=CONNECTION_POOL_CONFIG['connect_timeout'],
+        # A synchronous invoke can legitimately run for the whole function timeout
+        read_timeout=CLOUD_PROVIDERS['aws']['timeout'],
+        tcp_keepalive=CONNECTION_POOL_CONFIG['tcp_keepalive'],
+        retries={
+            'mode': CONNECTION_POOL_CONFIG['retry_mode'],
+            'max_attempts': CONNECTION_POOL_CONFIG['max_attempts']
+        }
+    )
+
+def get_http_session() -> requests.Session:
+    """Return the shared keep-alive HTTP session used for Azure and GCP function calls
+    
+    HTTP/1.1 connections are kept alive in a urllib3 pool sized like the
+    Lambda client pool. Only connection failures are retried, because a
+    function invocation that reached the server must not be replayed.
+    """
+    global _http_session
+    if _http_session is not None:
+        return _http_session
+    
+    with _lock:
+        if _http_session is None:
+            retries = Retry(
+                total=None,
+                connect=CONNECTION_POOL_CONFIG['max_attempts'] - 1,
+                read=0,
+                status=0,
+                backoff_factor=0.1
+            )
+            adapter = HTTPAdapter(
+                pool_connections=len(CLOUD_PROVIDERS),
+                pool_maxsize=CONNECTION_POOL_CONFIG['max_pool_connections'],
+                max_retries=retries
+            )
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'Connection': 'keep-alive'})
+            _http_session = session
+        return _http_session
+
+def reset_clients():
+    """Drop every pooled client, e.g. after a fork or a configuration change"""
+    global _session, _http_session
+    with _lock:
+        _lambda_clients.clear()
+        _session = None
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
\ No newline at end of file
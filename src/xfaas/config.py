@@ -38,26 +38,138 @@ CLOUD_PROVIDERS = {
     'aws': {
         'name': 'AWS Lambda',
         'region': 'us-east-1',
-        'timeout': 300
+        'timeout': 300,
+        # Alternative Lambda API endpoint, e.g. the local XFaaS emulator
+        'endpoint_url': os.environ.get('XFAAS_AWS_ENDPOINT_URL')
     },
     'azure': {
         'name': 'Azure Functions',
         'region': 'eastus',
-        'timeout': 300
+        'timeout': 300,
+        # HTTP trigger URL; {function_name} is filled in per invocation
+        'endpoint': os.environ.get(
+            'XFAAS_AZURE_ENDPOINT',
+            'https://{function_name}.azurewebsites.net/api/quantum_processor'
+        ),
+        'function_key': os.environ.get('XFAAS_AZURE_FUNCTION_KEY')
     },
     'gcp': {
         'name': 'Google Cloud Functions',
         'region': 'us-central1',
-        'timeout': 300
+        'timeout': 300,
+        'endpoint': os.environ.get(
+            'XFAAS_GCP_ENDPOINT',
+            'https://us-central1-' + os.environ.get('GOOGLE_CLOUD_PROJECT', 'quantum-xfaas')
+            + '.cloudfunctions.net/{function_name}'
+        ),
+        'identity_token': os.environ.get('XFAAS_GCP_IDENTITY_TOKEN')
+    },
+    'local': {
+        'name': 'Local In-Process',
+        'region': 'local',
+        'timeout': 300,
+        # Which provider handler to run locally: 'aws', 'azure' or 'gcp'
+        'handler': os.environ.get('XFAAS_LOCAL_HANDLER', 'gcp'),
+        # 0 runs in the calling thread, N > 0 uses a pool of N worker processes
+        'max_workers': int(os.environ.get('XFAAS_LOCAL_WORKERS', '0'))
     }
 }
 
+# Shared connection pools for provider SDK clients
+CONNECTION_POOL_CONFIG = {
+    'max_pool_connections': 50,
+    'connect_timeout': 5,
+    'tcp_keepalive': True,
+    'retry_mode': 'standard',
+    'max_attempts': 3
+}
+
+# Latency-aware provider routing
+ROUTING_CONFIG = {
+    'ewma_alpha': 0.2,
+    'max_error_rate': 0.5,
+    # Seconds for an idle provider's error rate to halve, so a demoted provider is
+    # probed again roughly one half-life after its last failure
+    'error_half_life': 30.0,
+    'sketch_relative_accuracy': 0.01,
+    'window_size': 1000
+}
+
+# Per-provider circuit breaker and AIMD concurrency limits
+RESILIENCE_CONFIG = {
+    'failure_threshold': 5,
+    'recovery_timeout': 30.0,
+    'half_open_max_calls': 1,
+    'initial_concurrency': 10,
+    'min_concurrency': 1,
+    'max_concurrency': 100,
+    'backoff_ratio': 0.5,
+    'slow_call_threshold': 30.0
+}
+
+# Micro-batching of individual quantum tasks
+MICRO_BATCH_CONFIG = {
+    'max_batch_size': 100,
+    'max_wait_seconds': 0.02
+}
+
+# Content-addressed cache of execution results, consulted before any provider is invoked
+RESULT_CACHE_CONFIG = {
+    'enabled': os.environ.get('XFAAS_RESULT_CACHE', '1') == '1',
+    'max_entries': 1024,
+    'ttl_seconds': 3600.0,
+    # Optional on-disk tier shared by processes on one host
+    'disk': os.environ.get('XFAAS_RESULT_CACHE_DISK', '0') == '1',
+    'disk_dir': RESULTS_DIR / 'result_cache',
+    'max_disk_bytes': 256 * 2 ** 20
+}
+
+# Local multi-provider emulator defaults (per provider, overridable)
+EMULATOR_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    # Which project handler backs each emulated provider
+    'handlers': {'aws': 'aws', 'azure': 'azure', 'gcp': 'gcp'},
+    # Log-normal injected latency: median seconds and shape parameter
+    'latency_median': 0.05,
+    'latency_sigma': 0.5,
+    'cold_start_delay': 1.0,
+    'idle_timeout': 300.0,
+    'error_rate': 0.0,
+    'max_concurrency': 50
+}
+
 # Quantum simulation parameters
 QUANTUM_CONFIG = {
     'shots': 1024,
     'max_qubits': 20,
     'simulator': 'qasm_simulator',
-    'optimization_level': 1
+    'optimization_level': 1,
+    'batch_size': 100,
+    # 'multinomial' draws all shots from the exact probabilities in one step
+    # (circuits up to max_qubits); 'shots' simulates shot by shot
+    'sampling': 'multinomial',
+    # Largest total variation distance between two results' count distributions
+    # that still counts as agreement. None scales it to the shot counts, so independent
+    # samples of one distribution agree; 0 requires identical counts
+    'consensus_tolerance': None,
+    # Standard deviations of sampling noise allowed by the scaled tolerance
+    'consensus_sigma': 4.0
+}
+
+# QAOA portfolio selection (Markowitz QUBO, angles optimized by Nelder-Mead)
+QAOA_CONFIG = {
+    'risk_aversion': 0.5,
+    'layers': 2,
+    # Assets to select per batch; None selects half of each batch
+    'budget': None
+}
+
+# Big-data analysis pipeline
+ANALYSIS_CONFIG = {
+    # Orchestrator calls in flight per analyzer. Each call fans out to every provider,
+    # so stay below RESILIENCE_CONFIG['initial_concurrency'] to avoid self-inflicted rejections
+    'concurrency': 8
 }
 
 # Experimental parameters
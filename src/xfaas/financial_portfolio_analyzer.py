@@ -8,6 +8,8 @@ import numpy as np
 import kaggle
 import asyncio
 from xfaas_orchestrator import XFaaSOrchestrator
+from qaoa_engine import decode_portfolio
+from config import QAOA_CONFIG
 import time
 import json
 import yfinance as yf
@@ -142,17 +144,38 @@ class FinancialPortfolioAnalyzer:
         # QAOA optimization batches
         results = []
         batch_size = 10
+        qubo = {
+            'risk_aversion': QAOA_CONFIG['risk_aversion'],
+            'budget': QAOA_CONFIG['budget']
+        }
         
         for i in range(0, n_assets, batch_size):
             batch_symbols = symbols[i:i+batch_size]
             batch_returns = expected_returns[i:i+batch_size]
             batch_cov = cov_matrix[i:i+batch_size, i:i+batch_size]
             
-            # Quantum portfolio optimization
+            # Quantum portfolio optimization; the batch's returns and covariance define the QAOA cost
             quantum_result = await self.orchestrator.execute_cross_platform_quantum(
-                'portfolio_qaoa', shots=1000
+                'portfolio_qaoa', shots=1000, n_qubits=len(batch_symbols),
+                params=dict(qubo, returns=batch_returns.tolist(), cov=batch_cov.tolist(),
+                            layers=QAOA_CONFIG['layers'])
             )
             
+            # The best sampled selection across providers becomes the batch portfolio
+            merged_counts = {}
+            for result in quantum_result['provider_results'].values():
+                if result.get('success', False):
+                    for bitstring, count in result.get('measurement_counts', {}).items():
+                        merged_counts[bitstring] = merged_counts.get(bitstring, 0) + count
+            if merged_counts:
+                portfolio = decode_portfolio(merged_counts, batch_returns, batch_cov, **qubo)
+                portfolio['selected_symbols'] = [batch_symbols[a] for a in portfolio['selected_assets']]
+                quantum_result.update({
+                    'qaoa_portfolio': portfolio,
+                    'expected_return': portfolio['expected_return'],
+                    'portfolio_risk': portfolio['portfolio_risk']
+                })
+            
             # Add real financial metrics
             quantum_result.update({
                 'symbols': batch_symbols,
@@ -2,52 +2,47 @@
 Google Cloud Functions Handler for Quantum Processing
 """
 
+import os
 import json
-from google.cloud import storage
-from qiskit import QuantumCircuit, execute, Aer
+import functools
+from quantum_core import handle_request, prewarm_circuits
+from result_writer import ResultWriter
+
+# 'qiskit' runs on Aer, 'numpy' on the built-in statevector engine
+DEFAULT_SIMULATOR = os.environ.get('XFAAS_SIMULATOR', 'qiskit')
 
 def quantum_processor(request):
-    """Google Cloud Function handler for quantum circuit execution"""
+    """Google Cloud Function handler for quantum circuit execution
+    
+    The request body is a quantum_core payload (see handle_request); results
+    are stored in Google Cloud Storage.
+    """
     try:
         request_json = request.get_json()
-        circuit_type = request_json.get('circuit')
-        shots = request_json.get('shots', 100)
-        
-        # Create quantum circuit using Qiskit
-        qc = QuantumCircuit(2, 2)
-        
-        if circuit_type == 'bell_state':
-            qc.h(0)
-            qc.cx(0, 1)
-            qc.measure_all()
-        elif circuit_type == 'superposition':
-            qc.h(0)
-            qc.measure_all()
-        
-        # Execute on local simulator
-        backend = Aer.get_backend('qasm_simulator')
-        job = execute(qc, backend, shots=shots)
-        result = job.result()
-        counts = result.get_counts(qc)
-        
-        # Store results in Google Cloud Storage
-        client = storage.Client()
-        bucket = client.bucket('quantum-xfaas-results')
-        blob = bucket.blob(f'gcp-result-{request.headers.get("X-Cloud-Trace-Context", "unknown")}.json')
-        
-        result_data = {
-            'provider': 'gcp',
-            'measurement_counts': counts,
-            'shots': shots,
-            'success': True
-        }
-        
-        blob.upload_from_string(json.dumps(result_data))
-        
-        return json.dumps(result_data), 200, {'Content-Type': 'application/json'}
-        
     except Exception as e:
         return json.dumps({
             'error': str(e),
             'success': False
-        }), 500, {'Content-Type': 'application/json'}
\ No newline at end of file
+        }), 400, {'Content-Type': 'application/json'}
+    
+    status, result_data = handle_request(
+        request_json, 'gcp',
+        request_id=request.headers.get("X-Cloud-Trace-Context", "unknown"),
+        key_prefix='gcp',
+        writer=RESULT_WRITER,
+        simulator=DEFAULT_SIMULATOR
+    )
+    return json.dumps(result_data), status, {'Content-Type': 'application/json'}
+
+@functools.lru_cache(maxsize=None)
+def storage_client():
+    """Cloud Storage client, created on first use and reused across warm invocations"""
+    from google.cloud import storage
+    return storage.Client()
+
+def upload_result(key, body):
+    storage_client().bucket('quantum-xfaas-results').blob(key).upload_from_string(body)
+
+RESULT_WRITER = ResultWriter(upload_result, batch_prefix='gcp-results')
+
+prewarm_circuits(DEFAULT_SIMULATOR)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Import-Time Budget Report for XFaaS Handlers
+Measures the cold-start cost of each heavy SDK import and handler module in a fresh interpreter
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Any, List
+
+# Import statements timed one per fresh interpreter, so nothing is already cached
+HEAVY_IMPORTS = {
+    'numpy': 'import numpy',
+    'boto3': 'import boto3',
+    'braket': 'import braket.circuits, braket.devices, braket.aws',
+    'qiskit': 'from qiskit import QuantumCircuit, transpile, Aer',
+    'azure': 'import azure.functions, azure.storage.blob',
+    'google.cloud': 'from google.cloud import storage',
+    'aws_lambda_handler': 'import aws_lambda_handler',
+    'azure_function_handler': 'import azure_function_handler',
+    'gcp_function_handler': 'import gcp_function_handler'
+}
+
+_TIMER = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+HANDLER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _run(arguments: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable] + arguments,
+        cwd=HANDLER_DIR,
+        capture_output=True,
+        text=True
+    )
+
+def _parse_importtime(stderr: str) -> Dict[str, int]:
+    """Self time in microseconds per module from `python -X importtime` output"""
+    self_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) == 3:
+            self_times[fields[2].strip()] = int(fields[0])
+    return self_times
+
+def measure_import(statement: str, repeats: int = 3, top: int = 5) -> Dict[str, Any]:
+    """Wall-clock import cost of a statement plus the slowest modules it pulls in"""
+    timings = []
+    for _ in range(repeats):
+        completed = _run(['-c', _TIMER.format(statement=statement)])
+        if completed.returncode != 0:
+            error_lines = completed.stderr.strip().splitlines()
+            return {'available': False, 'error': error_lines[-1] if error_lines else 'import failed'}
+        timings.append(float(completed.stdout.strip().splitlines()[-1]) * 1000)
+    
+    # Interpreter startup imports show up in -X importtime too, so subtract them
+    baseline = _parse_importtime(_run(['-X', 'importtime', '-c', 'pass']).stderr)
+    profiled = _parse_importtime(_run(['-X', 'importtime', '-c', statement]).stderr)
+    slowest = sorted(
+        ((module, micros) for module, micros in profiled.items() if module not in baseline),
+        key=lambda item: item[1],
+        reverse=True
+    )[:top]
+    
+    return {
+        'available': True,
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'max_ms': max(timings),
+        'modules_loaded': len(set(profiled) - set(baseline)),
+        'slowest_modules': [{'module': module, 'self_ms': micros / 1000} for module, micros in slowest]
+    }
+
+def import_budget(names: List[str] = None, repeats: int = 3, top: int = 5) -> Dict[str, Any]:
+    """Measure every entry of HEAVY_IMPORTS (or the selected names)"""
+    names = names or list(HEAVY_IMPORTS)
+    return {name: measure_import(HEAVY_IMPORTS[name], repeats, top) for name in names}
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"{'import':<24}{'median ms':>12}{'min ms':>10}{'modules':>10}  slowest module"]
+    for name, entry in report.items():
+        if not entry['available']:
+            lines.append(f"{name:<24}{'n/a':>12}{'':>10}{'':>10}  {entry['error']}")
+            continue
+        slowest = entry['slowest_modules'][0] if entry['slowest_modules'] else None
+        slowest_text = f"{slowest['module']} ({slowest['self_ms']:.1f} ms)" if slowest else ''
+        lines.append(
+            f"{name:<24}{entry['median_ms']:>12.1f}{entry['min_ms']:>10.1f}"
+            f"{entry['modules_loaded']:>10}  {slowest_text}"
+        )
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Report the cold-start cost of heavy XFaaS imports')
+    parser.add_argument('names', nargs='*', help=f"Imports to measure (default: all of {', '.join(HEAVY_IMPORTS)})")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--top', type=int, default=5, help='Slowest modules listed per import')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    parser.add_argument('--save', action='store_true', help='Save the report under results/performance')
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in HEAVY_IMPORTS]
+    if unknown:
+        parser.error(f"unknown imports: {', '.join(unknown)}")
+    
+    report = import_budget(args.names, args.repeats, args.top)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    
+    if args.save:
+        from result_manager import save_performance
+        save_performance('import_budget', report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
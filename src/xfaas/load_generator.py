@@ -0,0 +1,167 @@
+"""
+XFaaS Load Generator
+Drives XFaaSOrchestrator against the local emulator and reports throughput,
+latency percentiles and failover behaviour
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Any, List
+from xfaas_manager import XFaaSManager
+from xfaas_orchestrator import XFaaSOrchestrator
+from xfaas_emulator import XFaaSEmulator, FaultProfile
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def run_load(orchestrator: XFaaSOrchestrator, total_requests: int = 200,
+                   concurrency: int = 20, circuit: str = 'bell_state', shots: int = 100,
+                   mode: str = 'all', hedge: bool = False, routed: bool = False) -> Dict[str, Any]:
+    """Issue `total_requests` orchestrator calls with at most `concurrency` in flight
+    
+    routed=True sends each request to a single provider through
+    execute_quantum(); otherwise execute_cross_platform_quantum() is used
+    with the given mode and hedging. A request that failed only because the
+    client-side circuit breakers or concurrency limiters shed every call is
+    counted as rejected rather than failed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    outcomes = {'succeeded': 0, 'failed': 0, 'rejected': 0}
+    provider_outcomes: Dict[str, Dict[str, int]] = {}
+    
+    def count(provider, key):
+        provider_outcomes.setdefault(provider, {'success': 0, 'error': 0, 'rejected': 0})[key] += 1
+    
+    async def one_request():
+        async with semaphore:
+            started = time.perf_counter()
+            if routed:
+                response = await orchestrator.execute_quantum(circuit, shots)
+                provider_results = response['attempts']
+                succeeded = response['success']
+            else:
+                response = await orchestrator.execute_cross_platform_quantum(
+                    circuit, shots, mode=mode, hedge=hedge
+                )
+                provider_results = response['provider_results']
+                succeeded = response['successful_executions'] > 0
+            latencies.append(time.perf_counter() - started)
+            
+            if succeeded:
+                outcomes['succeeded'] += 1
+            elif provider_results and all(result.get('rejected', False) for result in provider_results.values()):
+                outcomes['rejected'] += 1
+            else:
+                outcomes['failed'] += 1
+            for provider, result in provider_results.items():
+                if result.get('success', False):
+                    count(provider, 'success')
+                elif result.get('rejected', False):
+                    count(provider, 'rejected')
+                else:
+                    count(provider, 'error')
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[one_request() for _ in range(total_requests)])
+    wall_time = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'mode': 'routed' if routed else mode,
+        'hedged': hedge,
+        'wall_time': wall_time,
+        'throughput_rps': total_requests / wall_time if wall_time > 0 else 0.0,
+        'latency': {
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50': percentile(latencies, 0.50),
+            'p90': percentile(latencies, 0.90),
+            'p99': percentile(latencies, 0.99),
+            'max': latencies[-1] if latencies else 0.0
+        },
+        'outcomes': outcomes,
+        'provider_outcomes': provider_outcomes,
+        'provider_statistics': orchestrator.get_provider_statistics()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test XFaaSOrchestrator against the local emulator')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--circuit', default='bell_state')
+    parser.add_argument('--shots', type=int, default=100)
+    parser.add_argument('--mode', default='all', help="'all', 'first' or 'quorum:k'")
+    parser.add_argument('--hedge', action='store_true')
+    parser.add_argument('--routed', action='store_true', help='Single-provider latency-aware routing')
+    parser.add_argument('--handler', choices=['aws', 'azure', 'gcp'], default='gcp',
+                        help='Handler backing every emulated provider')
+    parser.add_argument('--latency-median', type=float, default=0.05)
+    parser.add_argument('--cold-start-delay', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--degraded-provider', choices=['aws', 'azure', 'gcp'],
+                        help='Give one provider 10x latency and a 50%% error rate to exercise failover')
+    parser.add_argument('--save', action='store_true', help='Save the report under results/performance')
+    args = parser.parse_args()
+    
+    profiles = {}
+    for provider in ('aws', 'azure', 'gcp'):
+        degraded = provider == args.degraded_provider
+        profiles[provider] = FaultProfile(
+            latency_median=args.latency_median * (10 if degraded else 1),
+            cold_start_delay=args.cold_start_delay,
+            error_rate=0.5 if degraded else args.error_rate,
+            max_concurrency=max(args.concurrency, 1)
+        )
+    
+    emulator = XFaaSEmulator(
+        port=0,
+        profiles=profiles,
+        handlers={provider: args.handler for provider in ('aws', 'azure', 'gcp')}
+    )
+    emulator.start()
+    
+    # botocore signs every request, so the emulator needs placeholder credentials
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'xfaas-emulator')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'xfaas-emulator')
+    
+    try:
+        orchestrator = XFaaSOrchestrator(
+            max_workers=3 * args.concurrency,
+            # Cached results would skip the providers this run is measuring, and the default
+            # client-side concurrency limit would shed calls before they reach the emulator
+            manager=XFaaSManager(endpoints=emulator.manager_endpoints(), result_cache=False,
+                                 concurrency_limit=args.concurrency)
+        )
+        report = asyncio.run(run_load(
+            orchestrator,
+            total_requests=args.requests,
+            concurrency=args.concurrency,
+            circuit=args.circuit,
+            shots=args.shots,
+            mode=args.mode,
+            hedge=args.hedge,
+            routed=args.routed
+        ))
+        report['emulator_statistics'] = emulator.get_statistics()
+    finally:
+        emulator.stop()
+    
+    print(json.dumps({key: report[key] for key in
+                      ('requests', 'mode', 'throughput_rps', 'latency', 'outcomes', 'provider_outcomes')},
+                     indent=2))
+    
+    if args.save:
+        from result_manager import save_performance
+        save_performance('xfaas_load_test', report)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Micro-Batching Queue for XFaaS
+Coalesces individual quantum tasks into batched provider invocations
+"""
+
+import asyncio
+from typing import Dict, Any, List, Tuple
+from xfaas_manager import XFaaSManager, CloudProvider
+from config import MICRO_BATCH_CONFIG
+
+class MicroBatcher:
+    """Collects single-task submissions per (provider, function) and flushes them as one batch
+    
+    A queue is flushed when it reaches `max_batch_size` entries or when its
+    oldest entry has waited `max_wait` seconds. Each caller awaits its own
+    future, which receives the matching entry of the batch response.
+    """
+    
+    def __init__(self, manager: XFaaSManager, max_batch_size: int = None,
+                 max_wait: float = None, executor=None):
+        self.manager = manager
+        self.max_batch_size = max_batch_size or MICRO_BATCH_CONFIG['max_batch_size']
+        self.max_wait = max_wait if max_wait is not None else MICRO_BATCH_CONFIG['max_wait_seconds']
+        self.executor = executor
+        self.pending: Dict[Tuple[CloudProvider, str], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        self.timers: Dict[Tuple[CloudProvider, str], asyncio.TimerHandle] = {}
+        self.in_flight = set()
+        self.stats = {'requests': 0, 'batches': 0}
+    
+    async def submit(self, provider: CloudProvider, function_name: str, payload: Dict[str, Any]):
+        """Queue one quantum task and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (provider, function_name)
+        
+        queue = self.pending.setdefault(key, [])
+        queue.append((payload, future))
+        self.stats['requests'] += 1
+        
+        if len(queue) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self.timers:
+            self.timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        
+        return await future
+    
+    async def flush_all(self):
+        """Send every queued task now and wait for all outstanding batches"""
+        for key in list(self.pending):
+            self._flush(key)
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        batches = self.stats['batches']
+        return {
+            'requests': self.stats['requests'],
+            'batches': batches,
+            'average_batch_size': self.stats['requests'] / batches if batches else 0.0,
+            'queued': sum(len(queue) for queue in self.pending.values())
+        }
+    
+    def _flush(self, key):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        
+        entries = self.pending.pop(key, [])
+        # Callers that timed out or were cancelled no longer need a result
+        entries = [(payload, future) for payload, future in entries if not future.done()]
+        if not entries:
+            return
+        
+        self.stats['batches'] += 1
+        task = asyncio.ensure_future(self._dispatch(key, entries))
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+    
+    async def _dispatch(self, key, entries):
+        """Invoke one batch and demultiplex the results to each caller's future"""
+        provider, function_name = key
+        loop = asyncio.get_running_loop()
+        
+        try:
+            results = await loop.run_in_executor(
+                self.executor,
+                self.manager.execute_quantum_batch,
+                provider, function_name, [payload for payload, _ in entries]
+            )
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(entries, results):
+            if not future.done():
+                future.set_result(result)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Noisy Circuit Simulation for XFaaS
+Depolarizing, amplitude damping and readout error, simulated with an exact density
+matrix for small circuits or batched Monte Carlo trajectories for larger ones
+"""
+
+import os
+import numpy as np
+from typing import Dict, Any, Tuple
+from statevector import Circuit, MAX_QUBITS, InvalidRequestError
+from parameter_sweep import apply_operation_batched, apply_single_batched, chunk_size
+
+# A density matrix holds 4^n entries against 2^n per trajectory, so past about
+# log2(trajectories) qubits the default trajectory batch is the cheaper estimate
+DENSITY_MAX_QUBITS = int(os.environ.get('XFAAS_NOISE_DENSITY_MAX_QUBITS', '8'))
+
+DEFAULT_TRAJECTORIES = int(os.environ.get('XFAAS_NOISE_TRAJECTORIES', '256'))
+
+NOISE_METHODS = ('auto', 'density_matrix', 'trajectories')
+
+# Operations defined on the whole basis index rather than on a few qubits
+_GLOBAL_OPERATIONS = ('diagonal', 'oracle', 'diffusion')
+
+_PAULIS = np.array([
+    [[1, 0], [0, 1]],
+    [[0, 1], [1, 0]],
+    [[0, -1j], [1j, 0]],
+    [[1, 0], [0, -1]]
+], dtype=complex)
+
+class NoiseModel:
+    """Uniform gate and readout error rates
+    
+    After every gate each qubit it touched is depolarized (the two-qubit
+    rate applies to gates on two or more qubits) and then amplitude damped;
+    readout flips every measured bit with probability readout_error.
+    """
+    
+    FIELDS = ('depolarizing', 'two_qubit_depolarizing', 'amplitude_damping', 'readout_error')
+    
+    def __init__(self, depolarizing: float = 0.0, two_qubit_depolarizing: float = None,
+                 amplitude_damping: float = 0.0, readout_error: float = 0.0):
+        self.depolarizing = float(depolarizing)
+        self.two_qubit_depolarizing = float(depolarizing if two_qubit_depolarizing is None
+                                            else two_qubit_depolarizing)
+        self.amplitude_damping = float(amplitude_damping)
+        self.readout_error = float(readout_error)
+        for field in self.FIELDS:
+            if not 0.0 <= getattr(self, field) <= 1.0:
+                raise InvalidRequestError(f"Noise rate '{field}' must lie in [0, 1]")
+    
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> 'NoiseModel':
+        unknown = set(spec) - set(cls.FIELDS)
+        if unknown:
+            raise InvalidRequestError(f"Unknown noise parameters {sorted(unknown)}, expected {list(cls.FIELDS)}")
+        return cls(**spec)
+    
+    def to_dict(self) -> Dict[str, float]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def gate_depolarizing(self, n_targets: int) -> float:
+        return self.depolarizing if n_targets == 1 else self.two_qubit_depolarizing
+    
+    def apply_readout(self, probabilities: np.ndarray, n_qubits: int) -> np.ndarray:
+        """Outcome distribution after independent symmetric bit flips on every qubit"""
+        if not self.readout_error:
+            return probabilities
+        e = self.readout_error
+        for q in range(n_qubits):
+            p = probabilities.reshape(2 ** (n_qubits - 1 - q), 2, 2 ** q)
+            flipped = p[:, ::-1, :]
+            probabilities = ((1 - e) * p + e * flipped).reshape(-1)
+        return probabilities
+
+class NoisySimulator:
+    """Runs catalog circuits under a NoiseModel on the density matrix or on trajectories
+    
+    'auto' uses the density matrix up to DENSITY_MAX_QUBITS qubits.
+    Trajectories are simulated as one batched array per memory chunk and
+    their outcome probabilities averaged, which is an unbiased estimate of
+    the density matrix diagonal.
+    """
+    
+    def __init__(self, noise: NoiseModel, method: str = 'auto', trajectories: int = None,
+                 seed=None, memory_budget: int = None):
+        if method not in NOISE_METHODS:
+            raise InvalidRequestError(f"Unknown noise method '{method}', expected one of {list(NOISE_METHODS)}")
+        self.noise = noise
+        self.method = method
+        self.trajectories = int(trajectories or DEFAULT_TRAJECTORIES)
+        self.memory_budget = memory_budget
+        self.rng = np.random.default_rng(seed)
+    
+    def method_for(self, n_qubits: int) -> str:
+        if self.method != 'auto':
+            return self.method
+        return 'density_matrix' if n_qubits <= DENSITY_MAX_QUBITS else 'trajectories'
+    
+    def density_matrix(self, circuit: Circuit) -> np.ndarray:
+        """Final (2^n, 2^n) density matrix, rho -> U rho U^dagger plus noise channels per gate"""
+        n = circuit.n_qubits
+        if 2 * n > MAX_QUBITS:
+            raise InvalidRequestError(f"A {n}-qubit density matrix exceeds the dense simulation limit of {MAX_QUBITS} qubits")
+        index = np.arange(2 ** n, dtype=np.int64)
+        wide_index = np.arange(4 ** n, dtype=np.int64)
+        rho = np.zeros((2 ** n, 2 ** n), dtype=complex)
+        rho[0, 0] = 1.0
+        
+        for name, qubits, params in circuit.operations:
+            rho = self._conjugate_density(rho, n, name, qubits, params, index, wide_index)
+            p = self.noise.gate_depolarizing(len(qubits))
+            for q in qubits:
+                if p:
+                    rho = self._depolarize_density(rho, n, q, p)
+                if self.noise.amplitude_damping:
+                    rho = self._damp_density(rho, n, q, self.noise.amplitude_damping)
+        return rho
+    
+    def _conjugate_density(self, rho: np.ndarray, n: int, name: str, qubits, params,
+                           index: np.ndarray, wide_index: np.ndarray) -> np.ndarray:
+        if name in _GLOBAL_OPERATIONS:
+            # Rows of rho.T are columns of rho, so this is U rho; the conjugated
+            # pass applies U* to the rows of U rho, giving U rho U^dagger
+            rho = apply_operation_batched(rho.T, n, name, qubits, params, index).T
+            return np.conj(apply_operation_batched(np.conj(rho), n, name, qubits, params, index))
+        # Flattened, rho is a 2n-qubit state whose upper n qubits are the ket, so local
+        # gates act on qubits q + n (U) and q (U*) without transposing anything
+        vector = rho.reshape(1, -1)
+        vector = apply_operation_batched(vector, 2 * n, name, [q + n for q in qubits], params, wide_index)
+        vector = np.conj(apply_operation_batched(np.conj(vector), 2 * n, name, qubits, params, wide_index))
+        return vector.reshape(rho.shape)
+    
+    def _depolarize_density(self, rho: np.ndarray, n: int, q: int, p: float) -> np.ndarray:
+        # (1 - p) rho + p/3 (X rho X + Y rho Y + Z rho Z) equals mixing qubit q
+        # towards I/2 with weight 4p/3, which needs only its partial trace
+        mix = 4 * p / 3
+        r = rho.reshape(2 ** (n - 1 - q), 2, 2 ** q, 2 ** (n - 1 - q), 2, 2 ** q)
+        traced = r[:, 0, :, :, 0, :] + r[:, 1, :, :, 1, :]
+        out = (1 - mix) * r
+        out[:, 0, :, :, 0, :] += mix / 2 * traced
+        out[:, 1, :, :, 1, :] += mix / 2 * traced
+        return out.reshape(rho.shape)
+    
+    def _damp_density(self, rho: np.ndarray, n: int, q: int, gamma: float) -> np.ndarray:
+        # Kraus pair K0 = diag(1, sqrt(1 - gamma)), K1 = sqrt(gamma) |0><1| in closed form
+        r = rho.reshape(2 ** (n - 1 - q), 2, 2 ** q, 2 ** (n - 1 - q), 2, 2 ** q).copy()
+        r[:, 0, :, :, 0, :] += gamma * r[:, 1, :, :, 1, :]
+        r[:, 1, :, :, 1, :] *= 1 - gamma
+        r[:, 0, :, :, 1, :] *= np.sqrt(1 - gamma)
+        r[:, 1, :, :, 0, :] *= np.sqrt(1 - gamma)
+        return r.reshape(rho.shape)
+    
+    def trajectory_states(self, circuit: Circuit, trajectories: int) -> np.ndarray:
+        """(trajectories, 2^n) normalized final states, one noise realization per row"""
+        n = circuit.n_qubits
+        index = np.arange(2 ** n, dtype=np.int64)
+        states = np.zeros((trajectories, 2 ** n), dtype=complex)
+        states[:, 0] = 1.0
+        
+        for name, qubits, params in circuit.operations:
+            states = apply_operation_batched(states, n, name, qubits, params, index)
+            p = self.noise.gate_depolarizing(len(qubits))
+            for q in qubits:
+                if p:
+                    states = self._depolarize_trajectories(states, n, q, p)
+                if self.noise.amplitude_damping:
+                    states = self._damp_trajectories(states, n, q, self.noise.amplitude_damping)
+        return states
+    
+    # Both channels update the batch in place; trajectory_states owns it
+    
+    def _depolarize_trajectories(self, states: np.ndarray, n: int, q: int, p: float) -> np.ndarray:
+        # Each row independently picks X, Y or Z with probability p/3 each
+        hit = np.flatnonzero(self.rng.random(len(states)) < p)
+        if hit.size:
+            paulis = _PAULIS[self.rng.integers(1, 4, hit.size)]
+            states[hit] = apply_single_batched(states[hit], n, q, paulis)
+        return states
+    
+    def _damp_trajectories(self, states: np.ndarray, n: int, q: int, gamma: float) -> np.ndarray:
+        # A row decays (K1) with probability gamma * P(q = 1), otherwise takes K0; both renormalized.
+        # Every row is scaled as if it took K0 and only the few decayed rows are gathered.
+        psi = states.reshape(len(states), 2 ** (n - 1 - q), 2, 2 ** q)
+        excited = np.sum(np.abs(psi[:, :, 1, :]) ** 2, axis=(1, 2))
+        jumped = np.flatnonzero(self.rng.random(len(states)) < gamma * excited)
+        decayed = psi[jumped, :, 1, :] / np.sqrt(excited[jumped])[:, None, None]
+        keep = 1 / np.sqrt(np.maximum(1 - gamma * excited, np.finfo(float).tiny))
+        psi[:, :, 0, :] *= keep[:, None, None]
+        psi[:, :, 1, :] *= (np.sqrt(1 - gamma) * keep)[:, None, None]
+        psi[jumped, :, 0, :] = decayed
+        psi[jumped, :, 1, :] = 0
+        return psi.reshape(len(states), -1)
+    
+    def probabilities(self, circuit: Circuit, shots: int = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Noisy outcome distribution including readout error, plus simulation diagnostics
+        
+        Every shot is a draw from a uniformly chosen trajectory, so no more
+        trajectories than shots are simulated.
+        """
+        n = circuit.n_qubits
+        method = self.method_for(n)
+        diagnostics: Dict[str, Any] = {'method': method, 'noise': self.noise.to_dict()}
+        
+        if method == 'density_matrix':
+            rho = self.density_matrix(circuit)
+            probabilities = np.clip(np.real(np.diagonal(rho)), 0.0, None)
+            diagnostics['purity'] = float(np.real(np.vdot(rho, rho)))
+        else:
+            if n > MAX_QUBITS:
+                raise InvalidRequestError(f"{n} qubits exceeds the dense simulation limit of {MAX_QUBITS}")
+            trajectories = min(self.trajectories, shots) if shots else self.trajectories
+            size = chunk_size(n, self.memory_budget)
+            probabilities = np.zeros(2 ** n)
+            for start in range(0, trajectories, size):
+                states = self.trajectory_states(circuit, min(size, trajectories - start))
+                probabilities += np.sum(np.abs(states) ** 2, axis=0)
+            diagnostics['trajectories'] = trajectories
+            diagnostics['chunk_size'] = min(size, trajectories)
+        
+        probabilities = self.noise.apply_readout(probabilities / probabilities.sum(), n)
+        return probabilities, diagnostics
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Process-Pool Execution for XFaaS
+Deals independent circuits, or the sampling of one large directly sampled circuit, out to
+worker processes with SeedSequence-spawned seeds and merges the measurement counts
+"""
+
+import os
+import functools
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Iterable
+
+# Worker processes per handler instance; 1 keeps execution in the calling process.
+# Opting in has a cold cost: the first parallel request spawns the workers, and each one
+# imports NumPy and the engine SDK (1-3 s for Qiskit on a workstation, ~14 s measured in
+# a cold function instance). Warm invocations reuse the pool.
+DEFAULT_WORKERS = int(os.environ.get('XFAAS_WORKERS', '1'))
+
+# A directly sampled run is split only when every worker gets at least this many shots,
+# so shipping the state to the workers stays small next to the sampling it saves
+MIN_SHOTS_PER_WORKER = int(os.environ.get('XFAAS_MIN_SHOTS_PER_WORKER', '20000'))
+
+@functools.lru_cache(maxsize=None)
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool per worker count, started once and reused by warm invocations"""
+    # Handlers run on threads (emulator, orchestrator executors), where forking is unsafe
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def spawn_seeds(seed, count: int) -> List[int]:
+    """`count` independent child seeds of `seed`; reproducible unless seed is None"""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(count)]
+
+def split_shots(payload: Dict[str, Any], parts: int) -> List[Dict[str, Any]]:
+    """Copies of a payload whose shots add up to the original, each with its own spawned seed"""
+    base, extra = divmod(payload.get('shots', 100), parts)
+    return [dict(payload, shots=base + (1 if i < extra else 0), seed=seed)
+            for i, seed in enumerate(spawn_seeds(payload.get('seed'), parts))]
+
+def merge_counts(counts_list: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Sum measurement counts outcome by outcome"""
+    merged: Dict[str, int] = {}
+    for counts in counts_list:
+        for bitstring, count in counts.items():
+            merged[bitstring] = merged.get(bitstring, 0) + count
+    return dict(sorted(merged.items()))
+
+def contiguous_chunks(items: List[Any], parts: int) -> List[List[Any]]:
+    """At most `parts` contiguous chunks whose sizes differ by at most one"""
+    parts = max(1, min(parts, len(items)))
+    base, extra = divmod(len(items), parts)
+    chunks, start = [], 0
+    for i in range(parts):
+        end = start + base + (1 if i < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
\ No newline at end of file
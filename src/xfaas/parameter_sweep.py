@@ -0,0 +1,246 @@
+"""
+Batched Parameter Sweeps for Variational Circuits
+Evaluates one parametric circuit at many parameter sets with the batch as a leading array axis
+"""
+
+import os
+import numpy as np
+from typing import Dict, Any, List
+from statevector import (Circuit, MAX_QUBITS, FIXED_GATES, sample_counts, probability_dict,
+                         InvalidRequestError)
+
+# Working memory for one chunk of batched statevectors; larger chunks stop fitting in
+# cache and get slower per parameter set, so this is a throughput knob as well as a cap
+SWEEP_MEMORY_BUDGET = int(os.environ.get('XFAAS_SWEEP_MEMORY_MB', '32')) * 2 ** 20
+
+# Batched statevector plus the temporaries a gate allocates, per parameter set
+_BYTES_PER_AMPLITUDE = 16 * 4
+
+SWEEP_OUTPUTS = ('expectation', 'probabilities', 'counts')
+
+class Parameter:
+    """Swept gate angle: scale * values[index] + offset
+    
+    Supports the arithmetic builders apply to angles (2 * beta, gamma * J),
+    so catalog builders produce parametric circuits when given Parameters.
+    """
+    
+    # Make NumPy scalars defer to our reflected operators instead of broadcasting
+    __array_ufunc__ = None
+    
+    def __init__(self, index: int, scale: float = 1.0, offset: float = 0.0):
+        self.index = int(index)
+        self.scale = float(scale)
+        self.offset = float(offset)
+    
+    def __mul__(self, other):
+        return Parameter(self.index, self.scale * other, self.offset * other)
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, other):
+        return self * (1.0 / other)
+    
+    def __add__(self, other):
+        return Parameter(self.index, self.scale, self.offset + other)
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        return self + (-other)
+    
+    def __rsub__(self, other):
+        return -self + other
+    
+    def __neg__(self):
+        return self * -1.0
+    
+    def bind(self, values: np.ndarray) -> np.ndarray:
+        """Angle for every row of a (batch, n_parameters) array"""
+        return self.scale * values[:, self.index] + self.offset
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {'parameter': self.index, 'scale': self.scale, 'offset': self.offset}
+    
+    def __repr__(self):
+        return f"Parameter({self.index}, scale={self.scale}, offset={self.offset})"
+
+def parameter_vector(count: int) -> List[Parameter]:
+    return [Parameter(i) for i in range(count)]
+
+def symbolic(value):
+    """Replace JSON placeholders {'parameter': i[, 'scale', 'offset']} with Parameters"""
+    if isinstance(value, dict):
+        if 'parameter' in value and set(value) <= {'parameter', 'scale', 'offset'}:
+            return Parameter(value['parameter'], value.get('scale', 1.0), value.get('offset', 0.0))
+        return {key: symbolic(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [symbolic(item) for item in value]
+    return value
+
+def diagonal_observable(observable, n_qubits: int) -> np.ndarray:
+    """Diagonal of a Z-basis observable
+    
+    Accepts a full 2^n diagonal, or {pauli_string: coefficient} with strings
+    of 'I'/'Z' in Qiskit order (leftmost character is the highest qubit).
+    """
+    if isinstance(observable, dict):
+        index = np.arange(2 ** n_qubits, dtype=np.int64)
+        diagonal = np.zeros(2 ** n_qubits)
+        for term, coefficient in observable.items():
+            if len(term) != n_qubits or set(term) - {'I', 'Z'}:
+                raise InvalidRequestError(f"Observable term '{term}' must be {n_qubits} characters of I/Z")
+            parity = np.zeros(2 ** n_qubits, dtype=np.int64)
+            for k, char in enumerate(term):
+                if char == 'Z':
+                    parity ^= (index >> (n_qubits - 1 - k)) & 1
+            diagonal += coefficient * (1 - 2 * parity)
+        return diagonal
+    diagonal = np.asarray(observable, dtype=float)
+    if diagonal.shape != (2 ** n_qubits,):
+        raise InvalidRequestError(f"Observable diagonal must have length {2 ** n_qubits}")
+    return diagonal
+
+def chunk_size(n_qubits: int, memory_budget: int = None) -> int:
+    """Parameter sets per chunk so batched states fit in the memory budget"""
+    budget = memory_budget or SWEEP_MEMORY_BUDGET
+    return max(1, budget // (2 ** n_qubits * _BYTES_PER_AMPLITUDE))
+
+def apply_single_batched(states: np.ndarray, n: int, q: int, matrices: np.ndarray) -> np.ndarray:
+    """Apply a (2, 2) gate, or one (batch, 2, 2) gate per row, to qubit q of every state"""
+    if q < 3:
+        # A short trailing axis makes matmul loop over tiny blocks; contracting
+        # contiguous runs of 2^(q+1) amplitudes with kron(gate, I) is faster
+        block = np.kron(matrices, np.eye(2 ** q))
+        psi = states.reshape(len(states), -1, 2 ** (q + 1))
+        return np.matmul(psi, block.swapaxes(-1, -2)).reshape(len(states), -1)
+    psi = states.reshape(len(states), 2 ** (n - 1 - q), 2, 2 ** q)
+    if matrices.ndim == 3:
+        # Broadcast each row's matrix over its (high, low) blocks
+        matrices = matrices[:, None]
+    return np.matmul(matrices, psi).reshape(len(states), -1)
+
+def _apply_two_batched(states: np.ndarray, n: int, q0: int, q1: int, matrix: np.ndarray) -> np.ndarray:
+    # Same contraction as statevector._apply_two with the batch axis kept in front
+    psi = states.reshape((len(states),) + (2,) * n)
+    a0, a1 = n - q0, n - q1
+    psi = np.tensordot(matrix.reshape(2, 2, 2, 2), psi, axes=([2, 3], [a0, a1]))
+    return np.moveaxis(psi, [0, 1], [a0, a1]).reshape(len(states), -1)
+
+def rotation_matrices(name: str, thetas: np.ndarray) -> np.ndarray:
+    """(batch, 2, 2) RX or RY matrices for a vector of angles"""
+    c, s = np.cos(thetas / 2), np.sin(thetas / 2)
+    matrices = np.empty((len(thetas), 2, 2), dtype=complex)
+    if name == 'rx':
+        matrices[:, 0, 0], matrices[:, 0, 1], matrices[:, 1, 0], matrices[:, 1, 1] = c, -1j * s, -1j * s, c
+    else:
+        matrices[:, 0, 0], matrices[:, 0, 1], matrices[:, 1, 0], matrices[:, 1, 1] = c, -s, s, c
+    return matrices
+
+_CX = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+_SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+def apply_operation_batched(states: np.ndarray, n: int, name: str, qubits, angles,
+                            index: np.ndarray = None) -> np.ndarray:
+    """Apply one circuit operation to every row of a (batch, 2^n) array
+    
+    Angles are scalars or one value per row; `index` is the cached basis index.
+    """
+    if index is None:
+        index = np.arange(2 ** n, dtype=np.int64)
+    if name in FIXED_GATES:
+        return apply_single_batched(states, n, qubits[0], FIXED_GATES[name])
+    if name in ('rx', 'ry'):
+        theta = np.broadcast_to(np.asarray(angles[0], dtype=float), len(states))
+        return apply_single_batched(states, n, qubits[0], rotation_matrices(name, theta))
+    if name in ('rz', 'rzz'):
+        # Diagonal rotations: exp(-i theta/2 * (+1 or -1)) per basis state and row
+        if name == 'rz':
+            parity = (index >> qubits[0]) & 1
+        else:
+            parity = ((index >> qubits[0]) ^ (index >> qubits[1])) & 1
+        phase = np.exp(-0.5j * np.reshape(np.asarray(angles[0], dtype=float), (-1, 1)))
+        return states * np.where(parity == 1, np.conj(phase), phase)
+    if name == 'cx':
+        return _apply_two_batched(states, n, qubits[0], qubits[1], _CX)
+    if name == 'swap':
+        return _apply_two_batched(states, n, qubits[0], qubits[1], _SWAP)
+    if name in ('cz', 'mcz'):
+        mask = sum(1 << q for q in qubits)
+        return np.where((index & mask) == mask, -states, states)
+    if name == 'diagonal':
+        return states * angles[0]
+    if name == 'oracle':
+        states = states.copy()
+        states[:, angles[0]] *= -1
+        return states
+    if name == 'diffusion':
+        return 2 * states.mean(axis=1, keepdims=True) - states
+    raise ValueError(f"Unsupported gate '{name}'")
+
+class ParameterSweep:
+    """Runs a parametric circuit for a (batch, n_parameters) array, chunk by chunk"""
+    
+    def __init__(self, memory_budget: int = None, seed: int = None):
+        self.memory_budget = memory_budget or SWEEP_MEMORY_BUDGET
+        self.rng = np.random.default_rng(seed)
+    
+    def statevectors(self, circuit: Circuit, parameter_sets) -> np.ndarray:
+        """(batch, 2^n) final statevectors; the whole batch at once, so keep it within one chunk"""
+        values = np.atleast_2d(np.asarray(parameter_sets, dtype=float))
+        n = circuit.n_qubits
+        if n > MAX_QUBITS:
+            raise InvalidRequestError(f"{n} qubits exceeds the dense simulation limit of {MAX_QUBITS}")
+        index = np.arange(2 ** n, dtype=np.int64)
+        states = np.zeros((len(values), 2 ** n), dtype=complex)
+        states[:, 0] = 1.0
+        
+        for name, qubits, params in circuit.operations:
+            angles = [p.bind(values) if isinstance(p, Parameter) else p for p in params]
+            states = apply_operation_batched(states, n, name, qubits, angles, index)
+        return states
+    
+    def _chunks(self, circuit: Circuit, parameter_sets):
+        values = np.atleast_2d(np.asarray(parameter_sets, dtype=float))
+        size = chunk_size(circuit.n_qubits, self.memory_budget)
+        for start in range(0, len(values), size):
+            probabilities = np.abs(self.statevectors(circuit, values[start:start + size])) ** 2
+            yield probabilities / probabilities.sum(axis=1, keepdims=True)
+    
+    def probabilities(self, circuit: Circuit, parameter_sets) -> np.ndarray:
+        """(batch, 2^n) outcome probabilities"""
+        return np.concatenate(list(self._chunks(circuit, parameter_sets)))
+    
+    def expectations(self, circuit: Circuit, parameter_sets, observable) -> np.ndarray:
+        """<observable> for every parameter set, without keeping the probabilities"""
+        diagonal = diagonal_observable(observable, circuit.n_qubits)
+        return np.concatenate([chunk @ diagonal for chunk in self._chunks(circuit, parameter_sets)])
+    
+    def counts(self, circuit: Circuit, parameter_sets, shots: int = 1024) -> List[Dict[str, int]]:
+        """One multinomial sample of `shots` per parameter set"""
+        return [sample_counts(row, shots, circuit.n_qubits, self.rng)
+                for chunk in self._chunks(circuit, parameter_sets) for row in chunk]
+    
+    def run(self, circuit: Circuit, parameter_sets, output: str = 'expectation',
+            observable=None, shots: int = 1024) -> Dict[str, Any]:
+        """JSON-ready sweep result for one of SWEEP_OUTPUTS"""
+        if output not in SWEEP_OUTPUTS:
+            raise InvalidRequestError(f"Unknown sweep output '{output}', expected one of {list(SWEEP_OUTPUTS)}")
+        values = np.atleast_2d(np.asarray(parameter_sets, dtype=float))
+        result = {
+            'parameter_sets': len(values),
+            'chunk_size': chunk_size(circuit.n_qubits, self.memory_budget),
+            'n_qubits': circuit.n_qubits,
+            'output': output
+        }
+        if output == 'expectation':
+            if observable is None:
+                raise InvalidRequestError("An expectation sweep needs an 'observable'")
+            result['expectations'] = self.expectations(circuit, values, observable).tolist()
+        elif output == 'probabilities':
+            result['probabilities'] = [probability_dict(row, circuit.n_qubits)
+                                       for row in self.probabilities(circuit, values)]
+        else:
+            result['counts'] = self.counts(circuit, values, shots)
+            result['shots'] = shots
+        return result
\ No newline at end of file
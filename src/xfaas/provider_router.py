@@ -0,0 +1,198 @@
+"""
+Latency-Aware Provider Routing for XFaaS
+Tracks rolling latency and error statistics per cloud provider
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from xfaas_manager import CloudProvider
+from config import ROUTING_CONFIG
+
+class LatencySketch:
+    """Log-bucketed quantile sketch with bounded relative error"""
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float):
+        """Record a latency sample in seconds"""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+    
+    def merge(self, other: 'LatencySketch'):
+        """Fold another sketch with the same accuracy into this one"""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-th quantile, or None when the sketch is empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class ProviderStats:
+    """Rolling latency and error-rate statistics for a single provider
+    
+    The error rate also decays with time (halving every `error_half_life`
+    seconds without invocations), so a provider demoted for errors and no
+    longer routed to becomes eligible again and the next request probes it.
+    """
+    
+    def __init__(self, alpha: float, relative_accuracy: float, window: int,
+                 error_half_life: float = None):
+        self.alpha = alpha
+        self.relative_accuracy = relative_accuracy
+        self.window = window
+        self.error_half_life = error_half_life
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.total_requests = 0
+        self.total_errors = 0
+        self.last_updated: Optional[float] = None
+        # Two rotating sketches give percentiles over the last one to two windows
+        self._current = LatencySketch(relative_accuracy)
+        self._previous = LatencySketch(relative_accuracy)
+    
+    def error_rate(self, now: float = None) -> float:
+        """EWMA error rate decayed for the time since the last invocation"""
+        if not self.error_half_life or self.last_updated is None:
+            return self.ewma_error_rate
+        idle = max(0.0, (now or time.time()) - self.last_updated)
+        return self.ewma_error_rate * 0.5 ** (idle / self.error_half_life)
+    
+    def record(self, latency: float, success: bool):
+        """Record one completed invocation"""
+        now = time.time()
+        self.total_requests += 1
+        self.ewma_error_rate = self.alpha * (0.0 if success else 1.0) + (1 - self.alpha) * self.error_rate(now)
+        self.last_updated = now
+        
+        if not success:
+            self.total_errors += 1
+            return
+        
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = self.alpha * latency + (1 - self.alpha) * self.ewma_latency
+        
+        self._current.add(latency)
+        if self._current.count >= self.window:
+            self._previous = self._current
+            self._current = LatencySketch(self.relative_accuracy)
+    
+    @property
+    def sample_count(self) -> int:
+        return self._current.count + self._previous.count
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency quantile over the rolling window"""
+        sketch = LatencySketch(self.relative_accuracy)
+        sketch.merge(self._previous)
+        sketch.merge(self._current)
+        return sketch.quantile(q)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'ewma_latency': self.ewma_latency,
+            'ewma_error_rate': self.error_rate(),
+            'p50_latency': self.percentile(0.50),
+            'p95_latency': self.percentile(0.95),
+            'p99_latency': self.percentile(0.99),
+            'window_samples': self.sample_count,
+            'total_requests': self.total_requests,
+            'total_errors': self.total_errors,
+            'last_updated': self.last_updated
+        }
+
+class LatencyRouter:
+    """Routes single-provider requests to the fastest healthy provider"""
+    
+    def __init__(self, providers: List[CloudProvider], alpha: float = None,
+                 max_error_rate: float = None, relative_accuracy: float = None,
+                 window: int = None, error_half_life: float = None):
+        self.max_error_rate = max_error_rate if max_error_rate is not None else ROUTING_CONFIG['max_error_rate']
+        self._lock = threading.Lock()
+        self.stats = {
+            provider: ProviderStats(
+                alpha if alpha is not None else ROUTING_CONFIG['ewma_alpha'],
+                relative_accuracy if relative_accuracy is not None else ROUTING_CONFIG['sketch_relative_accuracy'],
+                window if window is not None else ROUTING_CONFIG['window_size'],
+                error_half_life if error_half_life is not None else ROUTING_CONFIG['error_half_life']
+            )
+            for provider in providers
+        }
+    
+    def record(self, provider: CloudProvider, latency: float, success: bool):
+        """Feed an invocation outcome into the provider's statistics"""
+        with self._lock:
+            self.stats[provider].record(latency, success)
+    
+    def is_healthy(self, provider: CloudProvider) -> bool:
+        return self.stats[provider].error_rate() <= self.max_error_rate
+    
+    def percentile(self, provider: CloudProvider, q: float, min_samples: int = 1) -> Optional[float]:
+        """Latency quantile for a provider, or None below `min_samples` samples"""
+        with self._lock:
+            stats = self.stats[provider]
+            if stats.sample_count < min_samples:
+                return None
+            return stats.percentile(q)
+    
+    def rank_providers(self, candidates: List[CloudProvider] = None) -> List[CloudProvider]:
+        """Order providers from most to least preferred
+        
+        Healthy providers come first; among them, providers that have not been
+        invoked yet are tried before the rest so every provider gets measured,
+        then the lowest EWMA latency wins. Unhealthy providers are ordered by
+        error rate as a last resort, until their error rate decays back under
+        max_error_rate.
+        """
+        candidates = list(candidates or self.stats)
+        now = time.time()
+        with self._lock:
+            def sort_key(provider):
+                stats = self.stats[provider]
+                error_rate = stats.error_rate(now)
+                if error_rate > self.max_error_rate:
+                    return (2, error_rate)
+                if stats.total_requests == 0:
+                    return (0, 0.0)
+                if stats.ewma_latency is None:
+                    return (1, float('inf'))
+                return (1, stats.ewma_latency)
+            return sorted(candidates, key=sort_key)
+    
+    def select_provider(self, candidates: List[CloudProvider] = None) -> CloudProvider:
+        """Currently fastest healthy provider"""
+        return self.rank_providers(candidates)[0]
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Inspectable copy of every provider's statistics"""
+        with self._lock:
+            return {
+                provider.value: dict(stats.snapshot(), healthy=stats.error_rate() <= self.max_error_rate)
+                for provider, stats in self.stats.items()
+            }
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+QAOA Engine for Markowitz Portfolio Selection
+Precomputes the 2^n QUBO cost diagonal once and evolves the statevector with vectorized
+phase multiplications and reshaped mixers, so every optimizer step is O(2^n) NumPy work
+"""
+
+import functools
+import numpy as np
+from typing import Dict, Any, Callable, Tuple
+from statevector import Circuit, MAX_QUBITS, InvalidRequestError
+from parameter_sweep import apply_single_batched, rotation_matrices, chunk_size
+
+def markowitz_qubo(returns, cov, risk_aversion: float = 0.5, budget: int = None,
+                   penalty: float = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Binary asset-selection QUBO: risk_aversion * x'Σx - μ'x + penalty * (Σx - budget)^2
+    
+    Returns (quadratic, linear, constant) with cost(x) = x'Qx + l'x + c, where
+    Q is symmetric with a zero diagonal (x_i^2 = x_i is folded into l).
+    """
+    returns = np.asarray(returns, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    n = len(returns)
+    if cov.shape != (n, n):
+        raise InvalidRequestError(f"Covariance must be {n}x{n} for {n} assets, got {cov.shape}")
+    budget = max(1, n // 2) if budget is None else int(budget)
+    if penalty is None:
+        # Exceeds the most any single asset flip can gain, so leaving the budget never pays,
+        # while staying small enough not to flatten the objective within the budget
+        penalty = (np.abs(returns) + 2 * risk_aversion * np.abs(cov).sum(axis=1)).max() + 1e-12
+    
+    quadratic = risk_aversion * cov + penalty * np.ones((n, n))
+    np.fill_diagonal(quadratic, 0.0)
+    linear = risk_aversion * np.diag(cov) - returns + penalty * (1 - 2 * budget)
+    constant = penalty * budget ** 2
+    return quadratic, linear, float(constant)
+
+def linear_form(weights) -> np.ndarray:
+    """sum_j w_j x_j for every assignment x of len(weights) bits (little-endian index)"""
+    values = np.zeros(1)
+    for weight in weights:
+        values = np.concatenate([values, values + weight])
+    return values
+
+def cost_diagonal(quadratic: np.ndarray, linear: np.ndarray, constant: float = 0.0) -> np.ndarray:
+    """QUBO cost of every basis state, built by doubling one qubit at a time
+    
+    Adding qubit k copies the diagonal of the lower k qubits and shifts the
+    copy by qubit k's linear term plus its couplings to the lower bits, so
+    no (2^n x n) bit matrix is ever materialized.
+    """
+    n = len(linear)
+    diagonal = np.array([constant], dtype=float)
+    for k in range(n):
+        couplings = linear_form(2 * quadratic[k, :k])
+        diagonal = np.concatenate([diagonal, diagonal + linear[k] + couplings])
+    return diagonal
+
+def nelder_mead(objective: Callable[[np.ndarray], float], x0, initial_step: float = 0.1,
+                max_iterations: int = 200, tolerance: float = 1e-8) -> Dict[str, Any]:
+    """Derivative-free simplex minimization (standard reflection/expansion/contraction/shrink)"""
+    x0 = np.asarray(x0, dtype=float)
+    dimension = len(x0)
+    simplex = np.vstack([x0] + [x0 + initial_step * np.eye(dimension)[i] for i in range(dimension)])
+    values = np.array([objective(point) for point in simplex])
+    evaluations = dimension + 1
+    
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        if abs(values[-1] - values[0]) <= tolerance:
+            break
+        
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        reflected_value = objective(reflected)
+        evaluations += 1
+        
+        if reflected_value < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            expanded_value = objective(expanded)
+            evaluations += 1
+            if expanded_value < reflected_value:
+                simplex[-1], values[-1] = expanded, expanded_value
+            else:
+                simplex[-1], values[-1] = reflected, reflected_value
+        elif reflected_value < values[-2]:
+            simplex[-1], values[-1] = reflected, reflected_value
+        else:
+            contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            contracted_value = objective(contracted)
+            evaluations += 1
+            if contracted_value < values[-1]:
+                simplex[-1], values[-1] = contracted, contracted_value
+            else:
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                values[1:] = [objective(point) for point in simplex[1:]]
+                evaluations += dimension
+    
+    best = int(np.argmin(values))
+    return {'x': simplex[best], 'value': float(values[best]), 'iterations': iteration, 'evaluations': evaluations}
+
+class QAOAPortfolioOptimizer:
+    """Optimizes QAOA angles for a Markowitz QUBO directly on the statevector"""
+    
+    def __init__(self, returns, cov, risk_aversion: float = 0.5, budget: int = None,
+                 penalty: float = None, layers: int = 1):
+        self.returns = np.asarray(returns, dtype=float)
+        self.cov = np.asarray(cov, dtype=float)
+        self.n_qubits = len(self.returns)
+        if self.n_qubits < 1:
+            raise InvalidRequestError("QAOA needs at least one asset")
+        self.risk_aversion = risk_aversion
+        self.budget = max(1, self.n_qubits // 2) if budget is None else int(budget)
+        self.layers = layers
+        
+        self.quadratic, self.linear, self.constant = markowitz_qubo(self.returns, self.cov, risk_aversion,
+                                                                   self.budget, penalty)
+        # Phases use the cost shifted by its mean and divided by a bound on its Ising form, so
+        # useful angles fall in (0, pi) for any data scale without enumerating 2^n selections
+        fields, couplings = self._ising_terms()
+        self.offset = float(self.constant + self.quadratic.sum() / 4 + self.linear.sum() / 2)
+        self.scale = float(np.abs(fields).sum() + np.abs(np.triu(couplings, 1)).sum()) or 1.0
+    
+    @functools.cached_property
+    def costs(self) -> np.ndarray:
+        """QUBO cost of every selection; only the dense optimizer needs it"""
+        if self.n_qubits > MAX_QUBITS:
+            raise InvalidRequestError(f"Optimizing angles for {self.n_qubits} assets needs a 2^{self.n_qubits} cost "
+                             f"diagonal (limit {MAX_QUBITS} qubits); pass 'angles' instead")
+        return cost_diagonal(self.quadratic, self.linear, self.constant)
+    
+    @functools.cached_property
+    def scaled_costs(self) -> np.ndarray:
+        return (self.costs - self.offset) / self.scale
+    
+    def _ising_terms(self):
+        # x = (1 - z) / 2 turns x'Qx + l'x + c into sum h_i z_i + sum_{i<j} J_ij z_i z_j + const
+        couplings = self.quadratic / 2
+        fields = -(self.linear + self.quadratic.sum(axis=1)) / 2
+        return fields, couplings
+    
+    def statevectors(self, angle_sets) -> np.ndarray:
+        """QAOA states for rows of angles [gamma_1..gamma_p, beta_1..beta_p], evolved together"""
+        angle_sets = np.atleast_2d(np.asarray(angle_sets, dtype=float))
+        n = self.n_qubits
+        scaled_costs = self.scaled_costs
+        states = np.full((len(angle_sets), 2 ** n), 2 ** (-n / 2), dtype=complex)
+        for layer in range(self.layers):
+            gammas, betas = angle_sets[:, layer], angle_sets[:, self.layers + layer]
+            states = states * np.exp(-1j * gammas[:, None] * scaled_costs)
+            mixers = rotation_matrices('rx', 2 * betas)
+            for q in range(n):
+                states = apply_single_batched(states, n, q, mixers)
+        return states
+    
+    def statevector(self, angles) -> np.ndarray:
+        return self.statevectors([angles])[0]
+    
+    def expectations(self, angle_sets) -> np.ndarray:
+        """Expected (rescaled) cost for every row of angles, in memory-bounded chunks"""
+        angle_sets = np.atleast_2d(np.asarray(angle_sets, dtype=float))
+        size = chunk_size(self.n_qubits)
+        return np.concatenate([np.abs(self.statevectors(angle_sets[start:start + size])) ** 2 @ self.scaled_costs
+                               for start in range(0, len(angle_sets), size)])
+    
+    def expectation(self, angles) -> float:
+        """Expected (rescaled) cost of the QAOA state"""
+        return float(self.expectations([angles])[0])
+    
+    def optimize(self, grid_points: int = 8, max_iterations: int = 200) -> Dict[str, Any]:
+        """Seed from a coarse (gamma, beta) grid, then refine every angle with Nelder-Mead"""
+        gammas, betas = np.meshgrid(np.linspace(0.1, np.pi, grid_points),
+                                    np.linspace(0.1, np.pi / 2, grid_points), indexing='ij')
+        grid = np.hstack([np.repeat(gammas.reshape(-1, 1), self.layers, axis=1),
+                          np.repeat(betas.reshape(-1, 1), self.layers, axis=1)])
+        best_seed = grid[int(np.argmin(self.expectations(grid)))]
+        
+        refined = nelder_mead(self.expectation, best_seed, max_iterations=max_iterations)
+        angles = refined['x']
+        probabilities = np.abs(self.statevector(angles)) ** 2
+        optimum = float(self.costs.min())
+        expected_cost = float(probabilities @ self.costs)
+        return {
+            'angles': [float(a) for a in angles],
+            'layers': self.layers,
+            'expected_cost': expected_cost,
+            'optimal_cost': optimum,
+            'optimal_probability': float(probabilities[self.costs <= optimum + 1e-12].sum()),
+            'optimal_selection': int(np.argmin(self.costs)),
+            'grid_evaluations': grid_points ** 2,
+            'optimizer_iterations': refined['iterations'],
+            'optimizer_evaluations': refined['evaluations']
+        }
+    
+    def ising(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Rescaled cost as sum_i h_i Z_i + sum_{i<j} J_ij Z_i Z_j (up to a constant)"""
+        fields, couplings = self._ising_terms()
+        return fields / self.scale, couplings / self.scale
+    
+    def circuit(self, angles, metadata: Dict[str, Any] = None) -> Circuit:
+        """Catalog circuit for the given angles: RZ/RZZ cost layers and RX mixers
+        
+        Gates rather than a 2^n diagonal keep the circuit cheap to translate
+        and run on every engine; it matches statevector() up to global phase.
+        Angles may be sweep Parameters.
+        """
+        gammas, betas = list(angles[:self.layers]), list(angles[self.layers:])
+        fields, couplings = self.ising()
+        n = self.n_qubits
+        circuit = Circuit(n).h_all()
+        for gamma, beta in zip(gammas, betas):
+            for i in range(n):
+                for j in range(i + 1, n):
+                    circuit.rzz(2 * gamma * couplings[i, j], i, j)
+            for q in range(n):
+                circuit.rz(2 * gamma * fields[q], q)
+            for q in range(n):
+                circuit.rx(2 * beta, q)
+        circuit.metadata.update(metadata or {})
+        return circuit
+
+def selection_bits(bitstring: str) -> np.ndarray:
+    """Asset selection vector from a bitstring (asset i is qubit i, the i-th bit from the right)"""
+    return np.array([int(bit) for bit in reversed(bitstring)], dtype=float)
+
+def decode_portfolio(counts: Dict[str, int], returns, cov, risk_aversion: float = 0.5,
+                     budget: int = None, penalty: float = None) -> Dict[str, Any]:
+    """Best sampled selection by QUBO cost, as an equal-weight portfolio"""
+    returns = np.asarray(returns, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    if not counts:
+        raise ValueError("No measurement counts to decode")
+    quadratic, linear, constant = markowitz_qubo(returns, cov, risk_aversion, budget, penalty)
+    
+    def cost(bitstring):
+        x = selection_bits(bitstring)
+        return float(x @ quadratic @ x + linear @ x + constant)
+    
+    best = min(counts, key=lambda bitstring: (cost(bitstring), -counts[bitstring]))
+    selected = selection_bits(best)
+    weights = selected / selected.sum() if selected.any() else selected
+    portfolio_return = float(weights @ returns)
+    portfolio_risk = float(np.sqrt(weights @ cov @ weights))
+    return {
+        'bitstring': best,
+        'selected_assets': [int(i) for i in np.flatnonzero(selected)],
+        'weights': weights.tolist(),
+        'qubo_cost': cost(best),
+        'sample_frequency': counts[best] / sum(counts.values()),
+        'expected_return': portfolio_return,
+        'portfolio_risk': portfolio_risk,
+        'sharpe_ratio': portfolio_return / portfolio_risk if portfolio_risk > 0 else 0.0
+    }
\ No newline at end of file
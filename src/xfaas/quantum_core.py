@@ -0,0 +1,655 @@
+"""
+Provider-Agnostic Quantum Execution Core for XFaaS
+Builds, executes and shapes results for every handler on NumPy, Qiskit Aer or Braket
+"""
+
+import os
+import logging
+import functools
+import numpy as np
+from typing import Dict, Any, List, Tuple
+from statevector import (Circuit, StatevectorSimulator, MAX_QUBITS, sample_counts, probability_dict,
+                         InvalidRequestError)
+from circuit_catalog import cached_catalog_circuit, RESULT_DECODERS
+from parameter_sweep import ParameterSweep
+from mps import MPSSimulator
+from noise import NoiseModel, NoisySimulator
+from parallel_execution import (DEFAULT_WORKERS, MIN_SHOTS_PER_WORKER, worker_pool, split_shots,
+                                merge_counts, contiguous_chunks)
+from circuit_cache import CircuitCache, circuit_spec, prewarm_circuit_names
+from result_writer import PERSISTENCE_MODES
+
+# 'shots' simulates shot by shot, 'multinomial' samples the exact probabilities once
+DEFAULT_SAMPLING = os.environ.get('XFAAS_SAMPLING', 'shots')
+
+# Engine-specific circuits (transpiled, measurement-free, probability), reused across warm invocations
+CIRCUIT_CACHE = CircuitCache()
+
+# Braket has no diagonal gate, so diagonals and MCZs become dense 2^n x 2^n unitaries
+# (16 MiB at 10 qubits, 68 GB at 16); wider ones are refused rather than built
+BRAKET_UNITARY_MAX_QUBITS = int(os.environ.get('XFAAS_BRAKET_UNITARY_MAX_QUBITS', '10'))
+
+def expand_grover_ops(circuit: Circuit) -> Circuit:
+    """Rewrite 'oracle' and 'diffusion' into H/X/MCZ and diagonal gates for engines without them
+    
+    The oracle becomes a single phase diagonal (-1 on every marked state),
+    so its cost does not grow with the number of marked states; diffusion
+    is H X MCZ X H, which is 2|s><s| - I up to a global phase.
+    """
+    if not any(name in ('oracle', 'diffusion') for name, _, _ in circuit.operations):
+        return circuit
+    expanded = Circuit(circuit.n_qubits)
+    all_qubits = list(range(circuit.n_qubits))
+    # Every Grover iteration repeats the same oracle; share one phase array per marked set
+    oracle_phases = {}
+    for name, qubits, params in circuit.operations:
+        if name == 'oracle':
+            key = params[0].tobytes()
+            if key not in oracle_phases:
+                oracle_phases[key] = np.ones(2 ** circuit.n_qubits, dtype=complex)
+                oracle_phases[key][params[0]] = -1
+            expanded.diagonal(oracle_phases[key])
+        elif name == 'diffusion':
+            expanded.h_all()
+            for q in all_qubits:
+                expanded.x(q)
+            expanded.mcz(all_qubits)
+            for q in all_qubits:
+                expanded.x(q)
+            expanded.h_all()
+        else:
+            expanded.operations.append((name, qubits, params))
+    return expanded
+
+# Every engine reports bitstrings in one convention: qubit k is bit k of the
+# basis index, printed q(n-1) ... q(0) as Qiskit does. Braket output is reordered.
+
+def to_qiskit(circuit: Circuit, measure: bool = True):
+    """Translate a catalog circuit to Qiskit, with one classical bit per qubit when measured"""
+    from qiskit import QuantumCircuit
+    from qiskit.circuit.library import ZGate
+    from qiskit.extensions.quantum_initializer import DiagonalGate
+    qc = QuantumCircuit(circuit.n_qubits)
+    # DiagonalGate validates every phase on construction, so repeated diagonals share one gate
+    diagonal_gates = {}
+    for name, qubits, params in expand_grover_ops(circuit).operations:
+        if name in ('h', 'x', 'y', 'z', 's', 't', 'cx', 'cz', 'swap'):
+            getattr(qc, name)(*qubits)
+        elif name in ('rx', 'ry', 'rz'):
+            getattr(qc, name)(params[0], qubits[0])
+        elif name == 'rzz':
+            qc.rzz(params[0], *qubits)
+        elif name == 'mcz':
+            if len(qubits) == 1:
+                qc.z(qubits[0])
+            else:
+                qc.append(ZGate().control(len(qubits) - 1), list(qubits))
+        elif name == 'diagonal':
+            # DiagonalGate is an Aer basis gate, so it is simulated as one phase
+            # multiplication rather than transpiled into ~2^n CX/RZ gates.
+            # Qiskit's first qarg is the least significant bit, matching the catalog
+            if id(params[0]) not in diagonal_gates:
+                diagonal_gates[id(params[0])] = DiagonalGate(list(params[0]))
+            qc.append(diagonal_gates[id(params[0])], list(qubits))
+        else:
+            raise ValueError(f"Gate '{name}' has no Qiskit translation")
+    if measure:
+        # measure_all adds its own register, so the circuit declares no other classical bits
+        qc.measure_all()
+    return qc
+
+def _check_braket_unitary(name: str, qubits):
+    if len(qubits) > BRAKET_UNITARY_MAX_QUBITS:
+        raise InvalidRequestError(f"Gate '{name}' on {len(qubits)} qubits needs a dense unitary, over the Braket limit of "
+                         f"{BRAKET_UNITARY_MAX_QUBITS} qubits (XFAAS_BRAKET_UNITARY_MAX_QUBITS); "
+                         f"use the 'numpy' or 'qiskit' simulator")
+
+def to_braket(circuit: Circuit, probability: bool = False):
+    """Translate a catalog circuit to Braket, optionally with a probability result type"""
+    from braket.circuits import Circuit as BraketCircuit
+    bc = BraketCircuit()
+    for name, qubits, params in expand_grover_ops(circuit).operations:
+        if name in ('h', 'x', 'y', 'z', 's', 't'):
+            getattr(bc, name)(qubits[0])
+        elif name in ('rx', 'ry', 'rz'):
+            getattr(bc, name)(qubits[0], params[0])
+        elif name == 'cx':
+            bc.cnot(*qubits)
+        elif name in ('cz', 'swap'):
+            getattr(bc, name)(*qubits)
+        elif name == 'rzz':
+            bc.zz(qubits[0], qubits[1], params[0])
+        elif name == 'mcz':
+            _check_braket_unitary(name, qubits)
+            phases = np.ones(2 ** len(qubits), dtype=complex)
+            phases[-1] = -1
+            bc.unitary(matrix=np.diag(phases), targets=list(qubits))
+        elif name == 'diagonal':
+            _check_braket_unitary(name, qubits)
+            # Braket's first target is the most significant bit, so list qubits high to low
+            bc.unitary(matrix=np.diag(params[0]), targets=list(reversed(qubits)))
+        else:
+            raise ValueError(f"Gate '{name}' has no Braket translation")
+    
+    # Braket only measures qubits that appear in the circuit
+    used = {int(q) for q in bc.qubits}
+    for q in range(circuit.n_qubits):
+        if q not in used:
+            bc.i(q)
+    if probability:
+        bc.probability()
+    return bc
+
+# Engine capability flags checked by execute_payloads: runs_shots engines implement
+# run_shots(), the others are always sampled from probabilities(); direct_sampling engines
+# draw shots from the simulated state without a 2^n probability vector.
+
+class NumpyEngine:
+    """Built-in statevector engine; every request goes through exact probabilities"""
+    
+    name = 'numpy'
+    runs_shots = False
+    direct_sampling = False
+    
+    def __init__(self):
+        self.simulator = StatevectorSimulator()
+    
+    def n_qubits(self, payload: Dict[str, Any]) -> int:
+        return cached_catalog_circuit(payload).n_qubits
+    
+    def probabilities(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        outcomes = []
+        for payload in payloads:
+            try:
+                outcomes.append(self.simulator.probabilities(cached_catalog_circuit(payload)))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def prewarm(self, payload: Dict[str, Any]):
+        cached_catalog_circuit(payload)
+
+class QiskitEngine:
+    """Qiskit Aer engine; shot runs are grouped into one job per distinct shot count and seed"""
+    
+    name = 'qiskit'
+    runs_shots = True
+    direct_sampling = False
+    
+    @functools.cached_property
+    def backend(self):
+        from qiskit import Aer
+        return Aer.get_backend('qasm_simulator')
+    
+    def circuit(self, payload: Dict[str, Any], variant: str = 'transpiled'):
+        """'transpiled' is ready for backend.run(); 'statevector' has no measurements"""
+        def builder():
+            catalog_circuit = cached_catalog_circuit(payload)
+            if variant == 'statevector':
+                return to_qiskit(catalog_circuit, measure=False)
+            from qiskit import transpile
+            return transpile(to_qiskit(catalog_circuit), self.backend)
+        return CIRCUIT_CACHE.get_or_build((self.name, variant) + circuit_spec(payload), builder)
+    
+    def n_qubits(self, payload: Dict[str, Any]) -> int:
+        return cached_catalog_circuit(payload).n_qubits
+    
+    def probabilities(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        from qiskit.quantum_info import Statevector
+        outcomes = []
+        for payload in payloads:
+            try:
+                outcomes.append(Statevector.from_instruction(self.circuit(payload, 'statevector')).probabilities())
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def run_shots(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        outcomes = [None] * len(payloads)
+        by_shots = {}
+        for index, payload in enumerate(payloads):
+            by_shots.setdefault((payload.get('shots', 100), payload.get('seed')), []).append(index)
+        
+        for (shots, seed), indices in by_shots.items():
+            try:
+                circuits = [self.circuit(payloads[i]) for i in indices]
+                options = {} if seed is None else {'seed_simulator': seed}
+                job_result = self.backend.run(circuits, shots=shots, **options).result()
+                for position, index in enumerate(indices):
+                    outcomes[index] = dict(job_result.get_counts(position))
+            except Exception as e:
+                for index in indices:
+                    outcomes[index] = e
+        return outcomes
+    
+    def prewarm(self, payload: Dict[str, Any]):
+        self.circuit(payload, 'transpiled')
+        self.circuit(payload, 'statevector')
+
+class BraketEngine:
+    """Braket engine (SV1, or the local simulator for device='local'); tasks are submitted before any is collected"""
+    
+    name = 'braket'
+    runs_shots = True
+    direct_sampling = False
+    
+    def __init__(self, device_name: str = None):
+        self.device_name = device_name
+    
+    @functools.cached_property
+    def device(self):
+        if self.device_name == 'local':
+            from braket.devices import LocalSimulator
+            return LocalSimulator()
+        from braket.aws import AwsDevice
+        return AwsDevice(self.device_name or "arn:aws:braket:::device/quantum-simulator/amazon/sv1")
+    
+    def circuit(self, payload: Dict[str, Any], variant: str = 'circuit'):
+        """'circuit' is measured shot by shot; 'probability' carries the probability result type"""
+        return CIRCUIT_CACHE.get_or_build(
+            (self.name, variant) + circuit_spec(payload),
+            lambda: to_braket(cached_catalog_circuit(payload), probability=variant == 'probability')
+        )
+    
+    def n_qubits(self, payload: Dict[str, Any]) -> int:
+        return cached_catalog_circuit(payload).n_qubits
+    
+    def _collect(self, payloads, submit, collect) -> List[Any]:
+        # Submit every task first so the device works on them concurrently
+        tasks = []
+        for payload in payloads:
+            try:
+                tasks.append(submit(payload))
+            except Exception as e:
+                tasks.append(e)
+        outcomes = []
+        for payload, task in zip(payloads, tasks):
+            try:
+                if isinstance(task, Exception):
+                    raise task
+                outcomes.append(collect(payload, task.result()))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def probabilities(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        def collect(payload, result):
+            n_qubits = self.n_qubits(payload)
+            # Braket indexes qubit 0 as the most significant bit; reverse the axes
+            return np.asarray(result.values[0], dtype=float).reshape((2,) * n_qubits).transpose().reshape(-1)
+        return self._collect(
+            payloads,
+            lambda payload: self.device.run(self.circuit(payload, 'probability'), shots=0),
+            collect
+        )
+    
+    def run_shots(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        return self._collect(
+            payloads,
+            lambda payload: self.device.run(self.circuit(payload), shots=payload.get('shots', 100)),
+            # Braket bitstrings start with qubit 0
+            lambda payload, result: {bits[::-1]: int(count) for bits, count in result.measurement_counts.items()}
+        )
+    
+    def prewarm(self, payload: Dict[str, Any]):
+        self.circuit(payload, 'circuit')
+        self.circuit(payload, 'probability')
+
+class MPSEngine:
+    """Matrix product state engine for wide, low-entanglement circuits
+    
+    Shots are always sampled straight from the MPS, so no 2^n vector is
+    built; results carry the bond dimension and truncation error.
+    Payloads may set 'max_bond_dimension' and 'truncation_cutoff'. Like
+    every direct-sampling engine it exposes simulate_state, so a large shot
+    run can be simulated once and sampled in parts (see execute_parallel).
+    """
+    
+    name = 'mps'
+    runs_shots = True
+    direct_sampling = True
+    
+    def n_qubits(self, payload: Dict[str, Any]) -> int:
+        return cached_catalog_circuit(payload).n_qubits
+    
+    def _simulator(self, payload: Dict[str, Any]) -> MPSSimulator:
+        return MPSSimulator(payload.get('max_bond_dimension'), payload.get('truncation_cutoff'),
+                            payload.get('seed'))
+    
+    def probabilities(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        outcomes = []
+        for payload in payloads:
+            try:
+                outcomes.append(self._simulator(payload).simulate(cached_catalog_circuit(payload)).probabilities())
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def simulate_state(self, payload: Dict[str, Any]):
+        """Final MPS of a payload's circuit; sampling it does not change it"""
+        return self._simulator(payload).simulate(cached_catalog_circuit(payload))
+    
+    def run_shots(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        outcomes = []
+        for payload in payloads:
+            try:
+                state = self.simulate_state(payload)
+                outcomes.append((_sample_state(state, payload.get('shots', 100), payload.get('seed')),
+                                 state.diagnostics()))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def prewarm(self, payload: Dict[str, Any]):
+        cached_catalog_circuit(payload)
+
+class NoisyEngine:
+    """NumPy engine under a per-payload noise model (see noise.NoisySimulator)
+    
+    Payloads carry 'noise' ({'depolarizing', 'two_qubit_depolarizing',
+    'amplitude_damping', 'readout_error'}) and optionally 'noise_method'
+    ('auto', 'density_matrix' or 'trajectories') and 'trajectories'.
+    Probabilities come back as (probabilities, diagnostics).
+    """
+    
+    name = 'noisy'
+    runs_shots = False
+    direct_sampling = False
+    
+    def n_qubits(self, payload: Dict[str, Any]) -> int:
+        return cached_catalog_circuit(payload).n_qubits
+    
+    def probabilities(self, payloads: List[Dict[str, Any]]) -> List[Any]:
+        outcomes = []
+        for payload in payloads:
+            try:
+                seed = payload.get('seed')
+                # Trajectory draws use their own stream, not the shot sampler's
+                simulator = NoisySimulator(NoiseModel.from_dict(payload.get('noise') or {}),
+                                           payload.get('noise_method', 'auto'), payload.get('trajectories'),
+                                           None if seed is None else (seed, 1))
+                outcomes.append(simulator.probabilities(cached_catalog_circuit(payload), payload.get('shots', 100)))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+    
+    def prewarm(self, payload: Dict[str, Any]):
+        cached_catalog_circuit(payload)
+
+ENGINES = {'numpy': NumpyEngine, 'qiskit': QiskitEngine, 'braket': BraketEngine, 'mps': MPSEngine,
+           'noisy': NoisyEngine}
+
+@functools.lru_cache(maxsize=None)
+def get_engine(simulator: str, device: str = None):
+    """Engine instance per simulator (and Braket device), reused across warm invocations"""
+    if simulator not in ENGINES:
+        raise InvalidRequestError(f"Unknown simulator '{simulator}', expected one of {sorted(ENGINES)}")
+    if simulator == 'braket':
+        return BraketEngine(device)
+    return ENGINES[simulator]()
+
+def shape_result(provider: str, engine, payload: Dict[str, Any], counts: Dict[str, int],
+                 probabilities: np.ndarray = None, diagnostics: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Common result layout returned by every provider"""
+    n_qubits = engine.n_qubits(payload)
+    result = {
+        'provider': provider,
+        'measurement_counts': counts,
+        'shots': payload.get('shots', 100),
+        'n_qubits': n_qubits,
+        'simulator': engine.name,
+        'success': True
+    }
+    if probabilities is not None and payload.get('exact', False):
+        result['probabilities'] = probability_dict(probabilities, n_qubits)
+    if diagnostics:
+        result['simulation'] = diagnostics
+    circuit = cached_catalog_circuit(payload)
+    if circuit.metadata:
+        result['circuit_metadata'] = circuit.metadata
+    decoder = RESULT_DECODERS.get(payload.get('circuit'))
+    if decoder is not None:
+        result.update(decoder(circuit, counts))
+    return result
+
+def run_sweep(payload: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    """Evaluate a parametric catalog circuit at every row of payload['parameter_sets']
+    
+    Always runs on the batched NumPy engine. 'output' is 'expectation' (needs
+    an 'observable'), 'probabilities' or 'counts' (with 'shots').
+    """
+    circuit = cached_catalog_circuit(payload)
+    sweep = ParameterSweep(seed=payload.get('seed'))
+    result = {'provider': provider, 'circuit': payload.get('circuit'), 'simulator': 'numpy'}
+    result.update(sweep.run(circuit, payload['parameter_sets'], payload.get('output', 'expectation'),
+                            payload.get('observable'), payload.get('shots', 100)))
+    if circuit.metadata:
+        result['circuit_metadata'] = circuit.metadata
+    result['success'] = True
+    return result
+
+def error_result(error: Exception) -> Dict[str, Any]:
+    """Result entry for a failed payload; 'client_error' marks a problem with the request itself"""
+    result = {'error': str(error), 'success': False}
+    if isinstance(error, InvalidRequestError):
+        result['client_error'] = True
+    return result
+
+def _samples_exactly(engine, payload: Dict[str, Any], sampling: str) -> bool:
+    """Whether a payload's shots are drawn from exact probabilities rather than run shot by shot"""
+    if not engine.runs_shots:
+        return True
+    multinomial = payload.get('sampling', sampling) == 'multinomial'
+    return multinomial and engine.n_qubits(payload) <= MAX_QUBITS and not engine.direct_sampling
+
+def _sample_exact(engine, payloads: List[Dict[str, Any]], indices: List[int], provider: str,
+                  results: List[Dict[str, Any]]):
+    """Draw every shot of the selected payloads from the engine's probabilities, filling `results`"""
+    for index, outcome in zip(indices, engine.probabilities([payloads[i] for i in indices])):
+        payload = payloads[index]
+        if isinstance(outcome, Exception):
+            results[index] = error_result(outcome)
+            continue
+        # Engines may return (probabilities, diagnostics)
+        probabilities, diagnostics = outcome if isinstance(outcome, tuple) else (outcome, None)
+        rng = np.random.default_rng(payload.get('seed'))
+        counts = sample_counts(probabilities, payload.get('shots', 100), engine.n_qubits(payload), rng)
+        results[index] = shape_result(provider, engine, payload, counts, probabilities, diagnostics)
+
+def execute_payloads(payloads: List[Dict[str, Any]], provider: str, simulator: str,
+                     sampling: str = None, device: str = None) -> List[Dict[str, Any]]:
+    """Execute circuit payloads on one engine, one result (or error) per payload, in order
+    
+    Entries with 'sampling': 'multinomial' (or on an engine without runs_shots) draw
+    all shots from the exact probabilities; the rest are run shot by shot
+    together (engines that sample directly, like MPS, always take this
+    path). 'exact': True adds the probabilities to a result. Entries with
+    'parameter_sets' are parameter sweeps (see run_sweep), and entries with
+    'noise' run on the noisy engine whatever the simulator.
+    """
+    engine = get_engine(simulator, device)
+    sampling = sampling or DEFAULT_SAMPLING
+    results: List[Dict[str, Any]] = [None] * len(payloads)
+    exact_indices, shot_indices, noisy_indices = [], [], []
+    
+    for index, payload in enumerate(payloads):
+        try:
+            if 'parameter_sets' in payload:
+                results[index] = run_sweep(payload, provider)
+                continue
+            if payload.get('noise') and engine.name != 'noisy':
+                noisy_indices.append(index)
+                continue
+            if _samples_exactly(engine, payload, sampling):
+                exact_indices.append(index)
+            else:
+                shot_indices.append(index)
+        except Exception as e:
+            results[index] = error_result(e)
+    
+    _sample_exact(engine, payloads, exact_indices, provider, results)
+    if noisy_indices:
+        _sample_exact(get_engine('noisy'), payloads, noisy_indices, provider, results)
+    
+    if shot_indices:
+        shot_payloads = [payloads[i] for i in shot_indices]
+        wants_exact = [i for i in shot_indices
+                       if payloads[i].get('exact', False) and engine.n_qubits(payloads[i]) <= MAX_QUBITS]
+        exact_outcomes = dict(zip(wants_exact, engine.probabilities([payloads[i] for i in wants_exact])))
+        
+        for index, outcome in zip(shot_indices, engine.run_shots(shot_payloads)):
+            if isinstance(outcome, Exception):
+                results[index] = error_result(outcome)
+                continue
+            probabilities = exact_outcomes.get(index)
+            if isinstance(probabilities, Exception):
+                probabilities = None
+            # Engines may return (counts, diagnostics) for a shot run
+            counts, diagnostics = outcome if isinstance(outcome, tuple) else (outcome, None)
+            results[index] = shape_result(provider, engine, payloads[index], counts, probabilities, diagnostics)
+    
+    return results
+
+def _shot_parts(engine, payload: Dict[str, Any], workers: int) -> int:
+    """Workers a payload's shots are split across; 1 unless its engine samples directly with many shots
+    
+    Only a direct-sampling engine can simulate once and hand the state to
+    every part. Dense engines either sample exact probabilities in one
+    multinomial or (Aer) already sample all shots from one simulation, so
+    splitting them would only repeat the simulation in every worker.
+    """
+    if not engine.direct_sampling or 'parameter_sets' in payload or payload.get('noise'):
+        return 1
+    return max(1, min(workers, payload.get('shots', 100) // MIN_SHOTS_PER_WORKER))
+
+def _sample_state(state, shots: int, seed) -> Dict[str, int]:
+    """Shots drawn from a simulated state, e.g. one part of a split shot run in a worker process"""
+    return state.sample(shots, np.random.default_rng(seed))
+
+def _split_sampling(engine, payload: Dict[str, Any], parts: int, pool, provider: str):
+    """Simulate a payload once here and sample its shot parts in the pool; returns a result getter"""
+    try:
+        state = engine.simulate_state(payload)
+        n_qubits = engine.n_qubits(payload)
+        probabilities = (state.probabilities()
+                         if payload.get('exact', False) and n_qubits <= MAX_QUBITS else None)
+    except Exception as e:
+        error = error_result(e)
+        return lambda: error
+    futures = [pool.submit(_sample_state, state, part['shots'], part['seed'])
+               for part in split_shots(payload, parts)]
+    
+    def collect():
+        try:
+            counts = merge_counts(future.result() for future in futures)
+        except Exception as e:
+            return error_result(e)
+        result = shape_result(provider, engine, payload, counts, probabilities, state.diagnostics())
+        result['shot_splits'] = parts
+        return result
+    return collect
+
+def execute_parallel(payloads: List[Dict[str, Any]], provider: str, simulator: str,
+                     sampling: str = None, device: str = None, workers: int = None) -> List[Dict[str, Any]]:
+    """execute_payloads spread over a process pool; one result per payload, in order
+    
+    Payloads are dealt to `workers` processes (default XFAAS_WORKERS) in
+    contiguous chunks. A payload on a direct-sampling engine (MPS) with at
+    least MIN_SHOTS_PER_WORKER shots per worker is simulated once here and
+    only its sampling is split, each part seeded from
+    SeedSequence(seed).spawn and the counts merged, so a seeded payload is
+    reproducible for a given worker count.
+    """
+    workers = workers or DEFAULT_WORKERS
+    if workers <= 1:
+        return execute_payloads(payloads, provider, simulator, sampling, device)
+    engine = get_engine(simulator, device)
+    
+    splits = {index: _shot_parts(engine, payload, workers) for index, payload in enumerate(payloads)}
+    whole = [index for index, parts in splits.items() if parts == 1]
+    if len(whole) == len(payloads) == 1:
+        return execute_payloads(payloads, provider, simulator, sampling, device)
+    
+    pool = worker_pool(workers)
+    chunks = [chunk for chunk in contiguous_chunks(whole, workers) if chunk]
+    chunk_futures = [pool.submit(execute_payloads, [payloads[i] for i in chunk], provider, simulator, sampling, device)
+                     for chunk in chunks]
+    # Split payloads simulate here while the chunks run in the workers
+    collectors = {index: _split_sampling(engine, payloads[index], parts, pool, provider)
+                  for index, parts in splits.items() if parts > 1}
+    
+    results: List[Dict[str, Any]] = [None] * len(payloads)
+    for chunk, future in zip(chunks, chunk_futures):
+        for index, result in zip(chunk, future.result()):
+            results[index] = result
+    for index, collect in collectors.items():
+        results[index] = collect()
+    return results
+
+def handle_request(payload: Dict[str, Any], provider: str, request_id: str, key_prefix: str,
+                   writer, simulator: str, device: str = None) -> Tuple[int, Dict[str, Any]]:
+    """Serve one handler request end to end; returns (HTTP status, response body)
+    
+    A single request carries {'circuit', 'shots'} plus optional 'n_qubits',
+    'params', 'seed', 'sampling' and 'exact'; a batch request carries
+    {'batch': [...]} and returns one result per entry. Adding
+    'parameter_sets' makes a request a parameter sweep and adding 'noise'
+    simulates it under that noise model. 'simulator' picks 'numpy',
+    'qiskit', 'braket', 'mps' or 'noisy', and 'workers' spreads the work
+    over that many processes (see execute_parallel). 'persist': False skips the result upload
+    and 'persistence' ('sync', 'async' or 'batched') selects how it is written; every request
+    first waits, within the writer's time bound, for uploads left by earlier ones.
+    
+    Invalid requests get status 400 and failed executions 500. A batch only
+    fails when every entry does, with 400 if all of them were invalid.
+    """
+    try:
+        writer.on_invocation()
+        simulator = payload.get('simulator', simulator)
+        sampling = payload.get('sampling', DEFAULT_SAMPLING)
+        device = payload.get('device', device)
+        workers = payload.get('workers')
+        persistence = payload.get('persistence')
+        if persistence is not None and persistence not in PERSISTENCE_MODES:
+            raise InvalidRequestError(f"Unknown persistence mode '{persistence}', "
+                                      f"expected one of {PERSISTENCE_MODES}")
+        
+        if 'batch' in payload:
+            batch = payload['batch']
+            if not isinstance(batch, list) or not all(isinstance(entry, dict) for entry in batch):
+                raise InvalidRequestError("'batch' must be a list of payload objects")
+            results = execute_parallel(batch, provider, simulator, sampling, device, workers)
+            failed = [result for result in results if not result['success']]
+            result_data = {
+                'provider': provider,
+                'results': results,
+                'batch_size': len(results),
+                'failed_entries': len(failed),
+                'success': not results or len(failed) < len(results)
+            }
+            if not result_data['success']:
+                if all(result.get('client_error') for result in failed):
+                    result_data['client_error'] = True
+                    return 400, result_data
+                return 500, result_data
+            key = f'{key_prefix}-batch-result-{request_id}.json'
+        else:
+            result_data = execute_parallel([payload], provider, simulator, sampling, device, workers)[0]
+            if not result_data['success']:
+                return (400 if result_data.get('client_error') else 500), result_data
+            key = f'{key_prefix}-result-{request_id}.json'
+        
+        if payload.get('persist', True):
+            writer.write(key, result_data, persistence)
+        return 200, result_data
+    
+    except Exception as e:
+        return (400 if isinstance(e, InvalidRequestError) else 500), error_result(e)
+
+def prewarm_circuits(simulator: str, device: str = None):
+    """Build the XFAAS_PREWARM_CIRCUITS templates at import so warm requests skip construction"""
+    for name in prewarm_circuit_names():
+        try:
+            get_engine(simulator, device).prewarm({'circuit': name})
+        except Exception as e:
+            logging.warning(f"Could not prewarm circuit '{name}': {e}")
\ No newline at end of file
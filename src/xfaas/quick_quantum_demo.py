@@ -7,37 +7,22 @@ import time
 from qiskit import QuantumCircuit, transpile
 from qiskit_aer import AerSimulator
 import json
+from grover_engine import GroverSearch
 
 def quantum_search_demo(n_items=16):
     """Quick Grover's search demo"""
     print(f"Quantum Search Demo ({n_items} items)")
     
-    # Quantum search (Grover's algorithm simulation)
+    # Quantum search (Grover's algorithm simulation) for the same worst-case target as the classical demo
     start_time = time.time()
-    n_qubits = int(np.log2(n_items))
-    qc = QuantumCircuit(n_qubits, n_qubits)
-    
-    # Initialize superposition
-    qc.h(range(n_qubits))
-    
-    # Oracle and diffusion (simplified)
-    for _ in range(int(np.sqrt(n_items))):
-        qc.z(0)  # Oracle
-        qc.h(range(n_qubits))
-        qc.x(range(n_qubits))
-        qc.h(n_qubits-1)
-        qc.cx(range(n_qubits-1), n_qubits-1)
-        qc.h(n_qubits-1)
-        qc.x(range(n_qubits))
-        qc.h(range(n_qubits))
-    
-    qc.measure_all()
-    
-    # Simulate
-    simulator = AerSimulator()
-    job = simulator.run(transpile(qc, simulator), shots=1024)
+    items = np.arange(n_items)
+    target = n_items - 1
+    search = GroverSearch(n_items, predicate=lambda values: values == target, items=items, vectorized=True)
+    result = search.run(shots=1024)
     quantum_time = time.time() - start_time
     
+    print(f"Found {result['found_indices'][:1]} after {result['iterations']} iterations "
+          f"(success probability {result['success_probability']:.3f})")
     return quantum_time
 
 def classical_search_demo(n_items=16):
@@ -8,6 +8,7 @@ import numpy as np
 import kaggle
 import asyncio
 from xfaas_orchestrator import XFaaSOrchestrator
+from grover_engine import marked_indices
 import time
 import json
 
@@ -155,15 +156,26 @@ class RealDatasetQuantumAnalyzer:
         search_results = []
         n_searches = min(1000, len(product_ids))  # 1K search queries
         
+        # The oracle marks the reviews the classical search would match, 500 reviews per search
+        payloads, marked_counts = [], []
         for i in range(n_searches):
-            target_product = product_ids[i]
-            search_space = review_ids[i*500:(i+1)*500]  # 500 reviews per search
-            
-            quantum_result = await self.orchestrator.execute_cross_platform_quantum(
-                'grover_search', shots=500
-            )
-            quantum_result['target'] = target_product
-            quantum_result['search_space_size'] = len(search_space)
+            target_bucket = self._search_bucket(product_ids[i])
+            search_space = review_ids[i*500:(i+1)*500]
+            marked = marked_indices(search_space, lambda item: self._search_bucket(item) == target_bucket)
+            marked_counts.append(len(marked))
+            payloads.append({
+                'circuit': 'grover_search',
+                'shots': 500,
+                'params': {'marked': marked.tolist(), 'space_size': len(search_space)}
+            })
+        
+        # Searches are sent in batches, one invocation per provider per batch
+        quantum_results = await self.orchestrator.execute_cross_platform_quantum_batch(payloads)
+        
+        for i, quantum_result in enumerate(quantum_results):
+            quantum_result['target'] = product_ids[i]
+            quantum_result['search_space_size'] = payloads[i]['params']['space_size']
+            quantum_result['n_marked'] = marked_counts[i]
             search_results.append(quantum_result)
         
         execution_time = time.time() - start_time
@@ -307,10 +319,14 @@ class RealDatasetQuantumAnalyzer:
             'iterations': len(prices) * 10
         }
     
+    def _search_bucket(self, value):
+        """Hash bucket that decides whether a review matches a search target"""
+        return hash(str(value)) % 1000
+    
     def _classical_linear_search(self, target, search_space):
         """Classical linear search simulation"""
         for i, item in enumerate(search_space):
-            if hash(str(item)) % 1000 == hash(str(target)) % 1000:  # Simulate match
+            if self._search_bucket(item) == self._search_bucket(target):  # Simulate match
                 return {'found': True, 'position': i, 'comparisons': i + 1}
         return {'found': False, 'comparisons': len(search_space)}
     
@@ -0,0 +1,128 @@
+"""
+Resilience Primitives for XFaaS
+Per-provider circuit breaking and adaptive (AIMD) concurrency limits
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Dict, Any, Optional
+from config import RESILIENCE_CONFIG
+
+class ProviderUnavailableError(RuntimeError):
+    """Raised when a provider call is rejected before being sent"""
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for a single provider"""
+    
+    def __init__(self, name: str, failure_threshold: int = None,
+                 recovery_timeout: float = None, half_open_max_calls: int = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or RESILIENCE_CONFIG['failure_threshold']
+        self.recovery_timeout = recovery_timeout or RESILIENCE_CONFIG['recovery_timeout']
+        self.half_open_max_calls = half_open_max_calls or RESILIENCE_CONFIG['half_open_max_calls']
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.half_open_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Whether a call may be sent; reserves a probe slot when half-open"""
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self.half_open_in_flight = 0
+            
+            if self.state == CircuitState.HALF_OPEN:
+                if self.half_open_in_flight >= self.half_open_max_calls:
+                    return False
+                self.half_open_in_flight += 1
+            
+            return True
+    
+    def release(self):
+        """Give back a reserved probe slot for a call that was never sent or was rejected as invalid"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self.half_open_in_flight > 0:
+                self.half_open_in_flight -= 1
+    
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state == CircuitState.HALF_OPEN:
+                self.state = CircuitState.CLOSED
+                self.half_open_in_flight = 0
+    
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if (self.state == CircuitState.HALF_OPEN
+                    or self.consecutive_failures >= self.failure_threshold):
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+                self.half_open_in_flight = 0
+    
+    def is_open(self) -> bool:
+        """Open and still inside the recovery timeout"""
+        with self._lock:
+            return (self.state == CircuitState.OPEN
+                    and time.monotonic() - self.opened_at < self.recovery_timeout)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'circuit_state': self.state.value,
+                'consecutive_failures': self.consecutive_failures
+            }
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: grow additively on fast successes, halve on failures or slow calls"""
+    
+    def __init__(self, initial_limit: float = None, min_limit: float = None,
+                 max_limit: float = None, backoff_ratio: float = None,
+                 slow_call_threshold: float = None):
+        self.limit = float(initial_limit or RESILIENCE_CONFIG['initial_concurrency'])
+        self.min_limit = float(min_limit or RESILIENCE_CONFIG['min_concurrency'])
+        self.max_limit = max(float(max_limit or RESILIENCE_CONFIG['max_concurrency']), self.limit)
+        self.backoff_ratio = backoff_ratio or RESILIENCE_CONFIG['backoff_ratio']
+        self.slow_call_threshold = slow_call_threshold or RESILIENCE_CONFIG['slow_call_threshold']
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> bool:
+        """Take a slot without blocking; False means the call should be shed"""
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self, latency: float = None, success: bool = True):
+        """Return a slot and adjust the limit; latency=None skips the adjustment"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if latency is None:
+                return
+            if not success or latency > self.slow_call_threshold:
+                self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+            else:
+                # Roughly +1 per limit's worth of successful calls
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'concurrency_limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'rejected_calls': self.rejected
+            }
\ No newline at end of file
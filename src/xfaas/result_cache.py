@@ -0,0 +1,192 @@
+"""
+Content-Addressed Result Cache for XFaaS
+Canonical payload hashing and a TTL-bounded LRU of execution results, with an optional on-disk tier
+"""
+
+import os
+import json
+import copy
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+from config import RESULT_CACHE_CONFIG
+
+# Payload fields that only affect how a result is stored, never what it contains
+_STORAGE_FIELDS = ('persist', 'persistence', 'cache')
+
+def _json_default(value):
+    if hasattr(value, 'tolist'):
+        # NumPy scalars and arrays
+        return value.tolist()
+    raise TypeError(f"Cannot hash a payload value of type {type(value).__name__}")
+
+def canonical_hash(payload: Dict[str, Any], backend: str) -> str:
+    """SHA-256 of a payload in canonical JSON form together with the backend that runs it
+    
+    Covers everything that determines a result: the circuit name, qubit
+    count and parameters (which fix the circuit structure), shots, seed,
+    sampling and any engine options. Key order does not matter.
+    """
+    fields = {key: value for key, value in payload.items() if key not in _STORAGE_FIELDS}
+    text = json.dumps({'backend': backend, 'payload': fields}, sort_keys=True,
+                      separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class ResultCache:
+    """Thread-safe LRU of successful results keyed by canonical hash
+    
+    Entries expire `ttl` seconds after they are stored, and the memory tier
+    holds at most `max_entries`. With a `directory`, results are also
+    written there as JSON (bounded by `max_disk_bytes`, oldest first), so
+    they survive restarts and are shared by processes on the same host.
+    Returned results are copies and can be modified freely.
+    """
+    
+    def __init__(self, max_entries: int = None, ttl: float = None, directory=None,
+                 max_disk_bytes: int = None):
+        self.max_entries = max_entries if max_entries is not None else RESULT_CACHE_CONFIG['max_entries']
+        self.ttl = ttl if ttl is not None else RESULT_CACHE_CONFIG['ttl_seconds']
+        self.max_disk_bytes = (max_disk_bytes if max_disk_bytes is not None
+                               else RESULT_CACHE_CONFIG['max_disk_bytes'])
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict = OrderedDict()
+        self._disk_files: OrderedDict = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0,
+                      'evictions': 0, 'expirations': 0}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index_disk()
+    
+    @classmethod
+    def from_config(cls) -> Optional['ResultCache']:
+        """Cache configured by RESULT_CACHE_CONFIG, or None when caching is disabled"""
+        if not RESULT_CACHE_CONFIG['enabled']:
+            return None
+        return cls(directory=RESULT_CACHE_CONFIG['disk_dir'] if RESULT_CACHE_CONFIG['disk'] else None)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for `key`, or None on a miss or after expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return copy.deepcopy(result)
+                del self._entries[key]
+                self.stats['expirations'] += 1
+        
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._remember(key, *entry)
+        return copy.deepcopy(entry[1])
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a result; failed results are never cached"""
+        if not isinstance(result, dict) or result.get('success') is not True:
+            return
+        stored_at = time.time()
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, stored_at, result)
+            self.stats['stores'] += 1
+        self._write_disk(key, stored_at, result)
+    
+    def _remember(self, key: str, stored_at: float, result: Dict[str, Any]):
+        self._entries[key] = (stored_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.json'
+    
+    def _index_disk(self):
+        # Oldest files first, so size eviction removes them first
+        files = sorted(self.directory.glob('*/*.json'), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._disk_files[path.stem] = size
+            self._disk_bytes += size
+    
+    def _read_disk(self, key: str, now: float):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if now - entry['stored_at'] > self.ttl:
+            self._remove_disk(key)
+            with self._lock:
+                self.stats['expirations'] += 1
+            return None
+        return entry['stored_at'], entry['result']
+    
+    def _write_disk(self, key: str, stored_at: float, result: Dict[str, Any]):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps({'stored_at': stored_at, 'result': result}, default=_json_default)
+        # Write then rename, so concurrent readers never see a partial file
+        temporary = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        temporary.write_text(data)
+        os.replace(temporary, path)
+        
+        with self._lock:
+            self._disk_bytes += len(data) - self._disk_files.pop(key, 0)
+            self._disk_files[key] = len(data)
+            evicted = []
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk_files) > 1:
+                old_key, size = self._disk_files.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+            self.stats['evictions'] += len(evicted)
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
+    
+    def _remove_disk(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+        with self._lock:
+            self._disk_bytes -= self._disk_files.pop(key, 0)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            keys = list(self._disk_files)
+            self._disk_files.clear()
+            self._disk_bytes = 0
+            for name in self.stats:
+                self.stats[name] = 0
+        if self.directory is not None:
+            for key in keys:
+                self._path(key).unlink(missing_ok=True)
+    
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'hits': hits,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'disk_entries': len(self._disk_files),
+                'disk_bytes': self._disk_bytes
+            }
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Result Persistence for XFaaS Handlers
+Writes handler results to object storage synchronously, in the background, or batched into shared objects
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+# 'sync' uploads inline, 'async' uploads on a background thread, 'batched' packs
+# the results buffered between invocations into one object uploaded in the background
+PERSISTENCE_MODES = ('sync', 'async', 'batched')
+DEFAULT_PERSISTENCE = os.environ.get('XFAAS_PERSISTENCE', 'sync')
+BATCH_SIZE = int(os.environ.get('XFAAS_PERSIST_BATCH_SIZE', '50'))
+# Longest an invocation waits for uploads left by earlier invocations before it starts
+DRAIN_TIMEOUT = float(os.environ.get('XFAAS_PERSIST_DRAIN_TIMEOUT', '5'))
+
+class ResultWriter:
+    """Persists result JSON through an `upload(key, body)` callable
+    
+    Serverless runtimes may freeze the container once the response is sent,
+    stalling background uploads until the next invocation thaws it. So
+    on_invocation() first waits up to drain_timeout for the uploads queued
+    before it, then queues the buffered batch; a response never waits for
+    its own upload. close() (registered with atexit) flushes everything on
+    shutdown. Uploads still pending when a container is reclaimed are lost.
+    """
+    
+    def __init__(self, upload: Callable[[str, str], None], batch_prefix: str,
+                 batch_size: int = None, drain_timeout: float = None):
+        self.upload = upload
+        self.batch_prefix = batch_prefix
+        self.batch_size = batch_size or BATCH_SIZE
+        self.drain_timeout = drain_timeout if drain_timeout is not None else DRAIN_TIMEOUT
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = None
+        self.idle = threading.Condition()
+        self.in_flight = 0
+        self.queued = 0
+        self.finished = 0
+        self.batch_lock = threading.Lock()
+        self.batch: List[Tuple[str, Dict[str, Any]]] = []
+        self.stats = {'objects_written': 0, 'results_batched': 0, 'failed_uploads': 0,
+                      'undrained_invocations': 0}
+        atexit.register(self.close)
+    
+    def write(self, key: str, result_data: Dict[str, Any], mode: str = None):
+        """Persist one result under `key` using the given persistence mode"""
+        mode = mode or DEFAULT_PERSISTENCE
+        if mode == 'sync':
+            self.upload(key, json.dumps(result_data))
+            with self.idle:
+                self.stats['objects_written'] += 1
+        elif mode == 'async':
+            self._enqueue(key, json.dumps(result_data))
+        elif mode == 'batched':
+            with self.batch_lock:
+                self.batch.append((key, result_data))
+                full = len(self.batch) >= self.batch_size
+            if full:
+                self.flush_batch()
+        else:
+            raise ValueError(f"Unknown persistence mode '{mode}', expected one of {PERSISTENCE_MODES}")
+    
+    def flush_batch(self):
+        """Queue the buffered results as a single object"""
+        with self.batch_lock:
+            entries, self.batch = self.batch, []
+        if not entries:
+            return
+        key = f"{self.batch_prefix}-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.json"
+        body = json.dumps({
+            'count': len(entries),
+            'results': [{'key': entry_key, 'result': data} for entry_key, data in entries]
+        })
+        with self.idle:
+            self.stats['results_batched'] += len(entries)
+        self._enqueue(key, body)
+    
+    def on_invocation(self) -> bool:
+        """Wait up to drain_timeout for uploads queued so far, then queue the buffered batch
+        
+        Returns False if earlier uploads were still pending when the wait ended.
+        Uploads queued by concurrent invocations after this call are not waited for.
+        """
+        with self.idle:
+            target = self.queued
+            drained = self.idle.wait_for(lambda: self.finished >= target, self.drain_timeout)
+            if not drained:
+                self.stats['undrained_invocations'] += 1
+                pending = target - self.finished
+        if not drained:
+            logging.warning(f"{pending} earlier result uploads still pending after {self.drain_timeout}s")
+        self.flush_batch()
+        return drained
+    
+    def drain(self, timeout: float = None) -> bool:
+        """Wait until every queued upload has finished; False on timeout"""
+        with self.idle:
+            return self.idle.wait_for(lambda: self.in_flight == 0, timeout)
+    
+    def close(self):
+        self.flush_batch()
+        self.drain(self.drain_timeout)
+    
+    def statistics(self) -> Dict[str, Any]:
+        with self.idle:
+            stats = dict(self.stats, pending_uploads=self.in_flight)
+        with self.batch_lock:
+            stats['buffered_results'] = len(self.batch)
+        return stats
+    
+    def _enqueue(self, key: str, body: str):
+        with self.idle:
+            self.in_flight += 1
+            self.queued += 1
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._worker, name='xfaas-result-writer', daemon=True)
+                self.thread.start()
+        self.queue.put((key, body))
+    
+    def _worker(self):
+        while True:
+            key, body = self.queue.get()
+            try:
+                self.upload(key, body)
+                succeeded = True
+            except Exception as e:
+                logging.warning(f"Background upload of {key} failed: {e}")
+                succeeded = False
+            with self.idle:
+                self.stats['objects_written' if succeeded else 'failed_uploads'] += 1
+                self.in_flight -= 1
+                self.finished += 1
+                self.idle.notify_all()
\ No newline at end of file
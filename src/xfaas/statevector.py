@@ -0,0 +1,210 @@
+"""
+Vectorized NumPy Statevector Simulator for XFaaS
+Lightweight engine for the circuit catalog that only depends on NumPy
+"""
+
+import os
+import numpy as np
+from typing import Dict, Any, List, Tuple
+
+# Dense simulation limit, mirrors QUANTUM_CONFIG['max_qubits'] (handlers cannot import config)
+MAX_QUBITS = int(os.environ.get('XFAAS_MAX_QUBITS', '20'))
+
+class InvalidRequestError(ValueError):
+    """A request the caller must fix (unknown circuit or simulator, bad parameters, too many
+    qubits) rather than a failing provider; handlers answer it with HTTP 400"""
+
+# Qubit k is bit k of the basis index (little-endian, same as Qiskit), so
+# measurement bitstrings read q(n-1) ... q(0) from left to right.
+
+_SQRT_HALF = 1 / np.sqrt(2)
+
+FIXED_GATES = {
+    'h': np.array([[_SQRT_HALF, _SQRT_HALF], [_SQRT_HALF, -_SQRT_HALF]], dtype=complex),
+    'x': np.array([[0, 1], [1, 0]], dtype=complex),
+    'y': np.array([[0, -1j], [1j, 0]], dtype=complex),
+    'z': np.array([[1, 0], [0, -1]], dtype=complex),
+    's': np.array([[1, 0], [0, 1j]], dtype=complex),
+    't': np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]], dtype=complex)
+}
+
+def rx_matrix(theta: float) -> np.ndarray:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+def ry_matrix(theta: float) -> np.ndarray:
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+def rz_matrix(theta: float) -> np.ndarray:
+    return np.array([[np.exp(-0.5j * theta), 0], [0, np.exp(0.5j * theta)]], dtype=complex)
+
+PARAMETRIC_GATES = {'rx': rx_matrix, 'ry': ry_matrix, 'rz': rz_matrix}
+
+def sample_counts(probabilities: np.ndarray, shots: int, n_qubits: int, rng=None) -> Dict[str, int]:
+    """Draw every shot with a single multinomial over the outcome probabilities
+    
+    Cost depends on the number of basis states, not on `shots`. Bitstrings
+    are the basis index in binary, so they follow the ordering of whatever
+    produced the probability vector.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    probabilities = np.clip(np.asarray(probabilities, dtype=float), 0.0, None)
+    counts = rng.multinomial(shots, probabilities / probabilities.sum())
+    return {format(int(i), f'0{n_qubits}b'): int(counts[i]) for i in np.flatnonzero(counts)}
+
+def probability_dict(probabilities: np.ndarray, n_qubits: int, tolerance: float = 1e-12) -> Dict[str, float]:
+    """Exact outcome probabilities as {bitstring: p}, omitting outcomes below `tolerance`"""
+    probabilities = np.asarray(probabilities, dtype=float)
+    return {format(int(i), f'0{n_qubits}b'): float(probabilities[i])
+            for i in np.flatnonzero(probabilities > tolerance)}
+
+class Circuit:
+    """Gate list for the NumPy engines; builder methods return self for chaining"""
+    
+    def __init__(self, n_qubits: int):
+        if n_qubits < 1:
+            raise InvalidRequestError("A circuit needs at least one qubit")
+        self.n_qubits = n_qubits
+        self.operations: List[Tuple[str, Tuple[int, ...], tuple]] = []
+        # JSON-safe facts about how the circuit was built, echoed in results
+        self.metadata: Dict[str, Any] = {}
+    
+    def _add(self, name: str, qubits, params=()):
+        qubits = tuple(int(q) for q in qubits)
+        for q in qubits:
+            if not 0 <= q < self.n_qubits:
+                raise InvalidRequestError(f"Qubit {q} out of range for a {self.n_qubits}-qubit circuit")
+        if len(set(qubits)) != len(qubits):
+            raise InvalidRequestError(f"Gate '{name}' applied to repeated qubits {qubits}")
+        self.operations.append((name, qubits, tuple(params)))
+        return self
+    
+    def h(self, q): return self._add('h', (q,))
+    def x(self, q): return self._add('x', (q,))
+    def y(self, q): return self._add('y', (q,))
+    def z(self, q): return self._add('z', (q,))
+    def s(self, q): return self._add('s', (q,))
+    def t(self, q): return self._add('t', (q,))
+    def rx(self, theta, q): return self._add('rx', (q,), (theta,))
+    def ry(self, theta, q): return self._add('ry', (q,), (theta,))
+    def rz(self, theta, q): return self._add('rz', (q,), (theta,))
+    def cx(self, control, target): return self._add('cx', (control, target))
+    def cz(self, a, b): return self._add('cz', (a, b))
+    def swap(self, a, b): return self._add('swap', (a, b))
+    def rzz(self, theta, a, b): return self._add('rzz', (a, b), (theta,))
+    
+    def mcz(self, qubits):
+        """Phase-flip the basis states where every listed qubit is 1"""
+        return self._add('mcz', qubits)
+    
+    def diagonal(self, phases):
+        """Multiply the state elementwise by a full-length diagonal (e.g. an oracle or cost layer)"""
+        phases = np.asarray(phases, dtype=complex)
+        if phases.shape != (2 ** self.n_qubits,):
+            raise InvalidRequestError(f"Diagonal must have length {2 ** self.n_qubits}")
+        return self._add('diagonal', range(self.n_qubits), (phases,))
+    
+    def oracle(self, marked):
+        """Phase-flip the listed basis states (a Grover oracle as a sparse -1 mask)"""
+        marked = np.unique(np.asarray(list(marked), dtype=np.int64))
+        if marked.size and (marked[0] < 0 or marked[-1] >= 2 ** self.n_qubits):
+            raise InvalidRequestError(f"Marked states must lie in [0, {2 ** self.n_qubits})")
+        return self._add('oracle', range(self.n_qubits), (marked,))
+    
+    def diffusion(self):
+        """Grover diffusion 2|s><s| - I over every qubit (inversion about the mean)"""
+        return self._add('diffusion', range(self.n_qubits))
+    
+    def h_all(self):
+        for q in range(self.n_qubits):
+            self.h(q)
+        return self
+
+def _apply_single(state: np.ndarray, n: int, q: int, matrix: np.ndarray) -> np.ndarray:
+    # Split the index into (high bits, qubit q, low bits) and contract the middle axis
+    psi = state.reshape(2 ** (n - 1 - q), 2, 2 ** q)
+    return np.matmul(matrix, psi).reshape(-1)
+
+def _apply_two(state: np.ndarray, n: int, q0: int, q1: int, matrix: np.ndarray) -> np.ndarray:
+    # matrix acts on (q0, q1) with q0 as the more significant index
+    psi = state.reshape((2,) * n)
+    a0, a1 = n - 1 - q0, n - 1 - q1
+    gate = matrix.reshape(2, 2, 2, 2)
+    psi = np.tensordot(gate, psi, axes=([2, 3], [a0, a1]))
+    return np.moveaxis(psi, [0, 1], [a0, a1]).reshape(-1)
+
+_CX = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+_SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+class StatevectorSimulator:
+    """Applies catalog circuits to a dense statevector with reshaped tensor operations"""
+    
+    def __init__(self, seed: int = None):
+        self.rng = np.random.default_rng(seed)
+        self._index_cache: Dict[int, np.ndarray] = {}
+    
+    def basis_indices(self, n: int) -> np.ndarray:
+        if n not in self._index_cache:
+            self._index_cache[n] = np.arange(2 ** n, dtype=np.int64)
+        return self._index_cache[n]
+    
+    def statevector(self, circuit: Circuit) -> np.ndarray:
+        """Final statevector of a circuit starting from |0...0>"""
+        n = circuit.n_qubits
+        if n > MAX_QUBITS:
+            raise InvalidRequestError(f"{n} qubits exceeds the dense simulation limit of {MAX_QUBITS}")
+        state = np.zeros(2 ** n, dtype=complex)
+        state[0] = 1.0
+        for name, qubits, params in circuit.operations:
+            state = self.apply(state, n, name, qubits, params)
+        return state
+    
+    def apply(self, state: np.ndarray, n: int, name: str, qubits, params) -> np.ndarray:
+        """Apply one operation to a statevector"""
+        if name in FIXED_GATES:
+            return _apply_single(state, n, qubits[0], FIXED_GATES[name])
+        if name in PARAMETRIC_GATES:
+            return _apply_single(state, n, qubits[0], PARAMETRIC_GATES[name](*params))
+        if name == 'cx':
+            return _apply_two(state, n, qubits[0], qubits[1], _CX)
+        if name == 'swap':
+            return _apply_two(state, n, qubits[0], qubits[1], _SWAP)
+        
+        # Diagonal gates are elementwise phase multiplications over bit masks
+        index = self.basis_indices(n)
+        if name == 'cz' or name == 'mcz':
+            mask = sum(1 << q for q in qubits)
+            return np.where((index & mask) == mask, -state, state)
+        if name == 'rzz':
+            a, b = qubits
+            parity = ((index >> a) ^ (index >> b)) & 1
+            return state * np.exp(-0.5j * params[0] * (1 - 2 * parity))
+        if name == 'diagonal':
+            return state * params[0]
+        if name == 'oracle':
+            state = state.copy()
+            state[params[0]] *= -1
+            return state
+        if name == 'diffusion':
+            return 2 * state.mean() - state
+        raise ValueError(f"Unsupported gate '{name}'")
+    
+    def probabilities(self, circuit: Circuit) -> np.ndarray:
+        probabilities = np.abs(self.statevector(circuit)) ** 2
+        return probabilities / probabilities.sum()
+    
+    def run(self, circuit: Circuit, shots: int = 1024, exact: bool = False) -> Dict[str, Any]:
+        """Simulate a circuit once and sample `shots` measurements of every qubit
+        
+        exact=True also returns the exact outcome probabilities.
+        """
+        probabilities = self.probabilities(circuit)
+        result = {
+            'measurement_counts': sample_counts(probabilities, shots, circuit.n_qubits, self.rng),
+            'shots': shots,
+            'n_qubits': circuit.n_qubits
+        }
+        if exact:
+            result['probabilities'] = probability_dict(probabilities, circuit.n_qubits)
+        return result
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Shared test setup for the XFaaS modules
+The modules import each other flat (as the handlers do), so their directory goes on sys.path
+"""
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Building a boto3 client needs a region even when no call is ever sent
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+@pytest.fixture
+def emulated_providers(monkeypatch):
+    """Factory for a running emulator (every provider backed by the AWS handler) and a manager for it"""
+    from client_pool import reset_clients
+    from xfaas_emulator import XFaaSEmulator, FaultProfile
+    from xfaas_manager import XFaaSManager
+    
+    # The Lambda client signs requests, so it needs credentials even for the emulator
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    reset_clients()
+    emulators = []
+    
+    def start(**profiles):
+        settings = {'latency_median': 0, 'latency_sigma': 0, 'cold_start_delay': 0}
+        emulator = XFaaSEmulator(
+            port=0,
+            handlers={'aws': 'aws', 'azure': 'aws', 'gcp': 'aws'},
+            profiles={provider: FaultProfile(**dict(settings, **profiles.get(provider, {})))
+                      for provider in ('aws', 'azure', 'gcp')}
+        )
+        emulator.start()
+        emulators.append(emulator)
+        return emulator, XFaaSManager(endpoints=emulator.manager_endpoints(), result_cache=False)
+    
+    yield start
+    for emulator in emulators:
+        emulator.stop()
+    reset_clients()
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+Tests for the circuit cache
+"""
+
+from circuit_cache import CircuitCache, circuit_spec
+
+def test_spec_ignores_parameter_order():
+    first = circuit_spec({'circuit': 'portfolio_qaoa', 'n_qubits': 4, 'params': {'gamma': 0.1, 'beta': [1, 2]}})
+    second = circuit_spec({'params': {'beta': (1, 2), 'gamma': 0.1}, 'n_qubits': 4, 'circuit': 'portfolio_qaoa'})
+    assert first == second
+    assert first != circuit_spec({'circuit': 'portfolio_qaoa', 'n_qubits': 5, 'params': {'gamma': 0.1}})
+
+def test_builds_once_and_evicts_least_recently_used():
+    cache = CircuitCache(maxsize=2)
+    builds = []
+    
+    def build(name):
+        builds.append(name)
+        return name
+    
+    assert cache.get_or_build('a', lambda: build('a')) == 'a'
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('b', lambda: build('b'))
+    cache.get_or_build('a', lambda: build('a'))
+    cache.get_or_build('c', lambda: build('c'))
+    cache.get_or_build('b', lambda: build('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+    assert cache.statistics()['hits'] == 2
\ No newline at end of file
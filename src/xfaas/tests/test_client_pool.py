@@ -0,0 +1,26 @@
+"""
+Tests for the shared client pool
+"""
+
+import client_pool
+
+def test_clients_are_shared_per_region_and_endpoint():
+    client_pool.reset_clients()
+    first = client_pool.get_lambda_client('us-east-1', 'http://127.0.0.1:1')
+    assert client_pool.get_lambda_client('us-east-1', 'http://127.0.0.1:1') is first
+    assert client_pool.get_lambda_client('us-east-1', 'http://127.0.0.1:2') is not first
+    assert client_pool.get_http_session() is client_pool.get_http_session()
+    client_pool.reset_clients()
+
+def test_reset_builds_new_clients():
+    session = client_pool.get_http_session()
+    client = client_pool.get_lambda_client('us-east-1', 'http://127.0.0.1:1')
+    client_pool.reset_clients()
+    assert client_pool.get_http_session() is not session
+    assert client_pool.get_lambda_client('us-east-1', 'http://127.0.0.1:1') is not client
+    client_pool.reset_clients()
+
+def test_lambda_client_uses_pool_settings():
+    config = client_pool.build_lambda_config()
+    assert config.max_pool_connections == client_pool.CONNECTION_POOL_CONFIG['max_pool_connections']
+    assert config.retries['max_attempts'] == client_pool.CONNECTION_POOL_CONFIG['max_attempts']
\ No newline at end of file
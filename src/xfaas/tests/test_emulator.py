@@ -0,0 +1,61 @@
+"""
+Tests for the multi-provider emulator and the manager's failure accounting against it
+"""
+
+import asyncio
+import pytest
+from load_generator import run_load
+from resilience import ProviderUnavailableError
+from xfaas_manager import XFaaSManager, CloudProvider
+from xfaas_orchestrator import XFaaSOrchestrator
+
+PAYLOAD = {'circuit': 'bell_state', 'shots': 50, 'simulator': 'numpy'}
+
+@pytest.mark.parametrize('provider', [CloudProvider.AWS, CloudProvider.AZURE, CloudProvider.GCP])
+def test_invocations_run_the_handler(emulated_providers, provider):
+    emulator, manager = emulated_providers()
+    result = manager.execute_quantum_task(provider, 'quantum-processor', dict(PAYLOAD, seed=2))
+    assert result['success'] and sum(result['measurement_counts'].values()) == 50
+    stats = emulator.get_statistics()[f'{provider.value}/quantum-processor']
+    assert stats['invocations'] == 1 and stats['cold_starts'] == 1
+
+@pytest.mark.parametrize('provider', [CloudProvider.AWS, CloudProvider.AZURE])
+def test_invalid_requests_leave_provider_health_alone(emulated_providers, provider):
+    _, manager = emulated_providers()
+    limit = manager.concurrency_limiters[provider].limit
+    for _ in range(8):
+        result = manager.execute_quantum_task(provider, 'f', dict(PAYLOAD, circuit='no_such_circuit'))
+        assert result['status_code'] == 400 and result['client_error']
+    health = manager.get_provider_health()[provider.value]
+    assert health['circuit_state'] == 'closed' and health['consecutive_failures'] == 0
+    assert manager.concurrency_limiters[provider].limit == limit
+
+@pytest.mark.parametrize('provider', [CloudProvider.AWS, CloudProvider.GCP])
+def test_injected_failures_open_the_circuit(emulated_providers, provider):
+    _, manager = emulated_providers(**{provider.value: {'error_rate': 1.0}})
+    with pytest.raises(ProviderUnavailableError):
+        for _ in range(10):
+            assert not manager.execute_quantum_task(provider, 'f', PAYLOAD)['success']
+    assert manager.get_provider_health()[provider.value]['circuit_state'] == 'open'
+
+def test_throttled_calls_count_as_failures(emulated_providers):
+    emulator, manager = emulated_providers(azure={'max_concurrency': 0})
+    result = manager.execute_quantum_task(CloudProvider.AZURE, 'f', PAYLOAD)
+    assert result['status_code'] == 429 and not result['success']
+    assert manager.get_provider_health()['azure']['consecutive_failures'] == 1
+    assert emulator.get_statistics()['azure/f']['throttled'] == 1
+
+def _load_run(emulated_providers, concurrency_limit):
+    emulator, _ = emulated_providers(**{provider: {'latency_median': 0.2} for provider in ('aws', 'azure', 'gcp')})
+    manager = XFaaSManager(endpoints=emulator.manager_endpoints(), result_cache=False,
+                           concurrency_limit=concurrency_limit)
+    return asyncio.run(run_load(XFaaSOrchestrator(manager=manager), total_requests=4, concurrency=4))['outcomes']
+
+def test_load_run_reports_shed_requests_as_rejected(emulated_providers):
+    # Three providers with one slot each cannot serve four concurrent requests
+    outcomes = _load_run(emulated_providers, concurrency_limit=1)
+    assert outcomes['rejected'] > 0 and outcomes['failed'] == 0
+    assert outcomes['succeeded'] + outcomes['rejected'] == 4
+
+def test_load_run_with_a_sized_limit_sheds_nothing(emulated_providers):
+    assert _load_run(emulated_providers, concurrency_limit=4) == {'succeeded': 4, 'failed': 0, 'rejected': 0}
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Tests for the Grover search engine
+"""
+
+import numpy as np
+from circuit_catalog import build_catalog_circuit
+from grover_engine import GroverSearch, optimal_iterations, success_probability, decode_search
+from quantum_core import execute_payloads
+from statevector import StatevectorSimulator
+
+def test_success_probability_matches_simulation():
+    search = GroverSearch(64, marked=[5, 40])
+    probabilities = search.statevector() ** 2
+    expected = success_probability(64, 2, optimal_iterations(64, 2))
+    assert np.isclose(probabilities[search.marked].sum(), expected)
+    assert expected > 0.9
+
+def test_catalog_circuit_matches_direct_evolution():
+    circuit = build_catalog_circuit('grover_search', 6, {'marked': [5, 40]})
+    np.testing.assert_allclose(StatevectorSimulator().probabilities(circuit),
+                               GroverSearch(64, marked=[5, 40]).statevector() ** 2, atol=1e-12)
+
+def test_predicate_marks_items_and_search_finds_them():
+    items = np.arange(100) * 3
+    search = GroverSearch(0, items=items, predicate=lambda values: values % 97 == 0, vectorized=True, seed=1)
+    assert list(search.marked) == [0, 97]
+    result = search.run(shots=500)
+    assert set(result['found_indices']) <= {0, 97} and result['hit_rate'] > 0.8
+
+def test_decode_search_orders_by_hits():
+    decoded = decode_search({'011': 5, '101': 9, '000': 2}, marked=[3, 5])
+    assert decoded['found_indices'] == [5, 3] and decoded['hit_rate'] == 14 / 16
+
+def test_decoding_does_not_need_an_oracle_iteration():
+    # Half the space marked: the optimal iteration count is zero, so the circuit has no oracle
+    result = execute_payloads([{'circuit': 'grover_search', 'n_qubits': 2, 'params': {'marked': [0, 1]},
+                                'shots': 200, 'seed': 3}], 'local', 'numpy')[0]
+    assert result['circuit_metadata']['iterations'] == 0
+    assert set(result['found_indices']) == {0, 1} and 0.3 < result['hit_rate'] < 0.7
\ No newline at end of file
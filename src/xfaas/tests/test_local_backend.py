@@ -0,0 +1,31 @@
+"""
+Tests for the local in-process provider backend
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from local_backend import LocalBackend
+from xfaas_manager import XFaaSManager, CloudProvider
+
+PAYLOAD = {'circuit': 'bell_state', 'shots': 20, 'simulator': 'numpy', 'seed': 4}
+
+def test_worker_pool_spawns_and_matches_in_thread_results():
+    backend = LocalBackend(handler='aws', max_workers=1)
+    try:
+        assert backend.pool._mp_context.get_start_method() == 'spawn'
+        pooled = backend.invoke('f', PAYLOAD)
+    finally:
+        backend.shutdown()
+    in_thread = LocalBackend(handler='aws', max_workers=0).invoke('f', PAYLOAD)
+    assert pooled['success'] and pooled['measurement_counts'] == in_thread['measurement_counts']
+
+def test_concurrent_calls_share_one_backend():
+    manager = XFaaSManager(result_cache=False)
+    # A slow construction widens the window in which threads race to create the backend
+    slow_init = mock.Mock(side_effect=lambda *args: time.sleep(0.05))
+    with mock.patch('local_backend.LocalBackend.__init__', slow_init), \
+            mock.patch('local_backend.LocalBackend.invoke', return_value={'success': True}):
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: manager.execute_quantum_task(CloudProvider.LOCAL, 'f', PAYLOAD), range(8)))
+    assert slow_init.call_count == 1
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Tests for the micro-batching queue
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from micro_batcher import MicroBatcher
+from xfaas_manager import XFaaSManager, CloudProvider
+
+class EchoManager(XFaaSManager):
+    """Answers batch invocations with one result per entry, echoing its payload, and records them"""
+    
+    def __init__(self):
+        super().__init__()
+        self.invocations = []
+    
+    def execute_quantum_task(self, provider, function_name, payload):
+        self.invocations.append((provider, function_name, len(payload['batch'])))
+        return {'results': [{'payload': entry, 'success': True} for entry in payload['batch']], 'success': True}
+
+def test_concurrent_tasks_share_one_invocation():
+    manager = EchoManager()
+    batcher = MicroBatcher(manager, max_batch_size=10, max_wait=0.05, executor=ThreadPoolExecutor(2))
+    
+    async def run():
+        return await asyncio.gather(*[
+            batcher.submit(CloudProvider.GCP, 'f', {'circuit': 'superposition', 'n_qubits': n})
+            for n in range(1, 6)
+        ])
+    
+    results = asyncio.run(run())
+    # Each caller gets the entry for its own payload
+    assert [result['payload']['n_qubits'] for result in results] == [1, 2, 3, 4, 5]
+    assert manager.invocations == [(CloudProvider.GCP, 'f', 5)]
+    assert batcher.get_statistics()['batches'] == 1
+
+def test_queues_are_kept_per_provider_and_function():
+    manager = EchoManager()
+    batcher = MicroBatcher(manager, max_batch_size=10, max_wait=0.05, executor=ThreadPoolExecutor(2))
+    
+    async def run():
+        return await asyncio.gather(
+            batcher.submit(CloudProvider.AWS, 'f', {'n': 1}),
+            batcher.submit(CloudProvider.AZURE, 'f', {'n': 2}),
+            batcher.submit(CloudProvider.AWS, 'g', {'n': 3}),
+            batcher.submit(CloudProvider.AWS, 'f', {'n': 4})
+        )
+    
+    assert [result['payload']['n'] for result in asyncio.run(run())] == [1, 2, 3, 4]
+    assert sorted((p.value, f, n) for p, f, n in manager.invocations) == [
+        ('aws', 'f', 2), ('aws', 'g', 1), ('azure', 'f', 1)]
+
+def test_full_queue_flushes_without_waiting():
+    manager = EchoManager()
+    batcher = MicroBatcher(manager, max_batch_size=2, max_wait=60, executor=ThreadPoolExecutor(2))
+    
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(
+            batcher.submit(CloudProvider.AWS, 'f', {'n': 1}),
+            batcher.submit(CloudProvider.AWS, 'f', {'n': 2})
+        ), timeout=10)
+    
+    assert all(result['success'] for result in asyncio.run(run()))
+    assert batcher.get_statistics()['average_batch_size'] == 2.0
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Tests for the matrix product state simulator
+"""
+
+import numpy as np
+import pytest
+from circuit_catalog import build_catalog_circuit
+from mps import MPSSimulator
+from statevector import Circuit, StatevectorSimulator
+
+@pytest.mark.parametrize('name, n_qubits, params', [
+    ('bell_state', None, {}),
+    ('optimization_circuit', 5, {}),
+    ('portfolio_qaoa', 7, {'layers': 2})
+])
+def test_matches_dense_statevector(name, n_qubits, params):
+    circuit = build_catalog_circuit(name, n_qubits, params)
+    state = MPSSimulator().simulate(circuit)
+    np.testing.assert_allclose(state.probabilities(), StatevectorSimulator().probabilities(circuit), atol=1e-10)
+    assert state.diagnostics()['truncation_error'] < 1e-12
+
+def test_long_range_gates_are_routed():
+    circuit = Circuit(5).h(0).cx(0, 4).ry(0.3, 2).cx(4, 1).rzz(0.7, 3, 0)
+    np.testing.assert_allclose(MPSSimulator().simulate(circuit).probabilities(),
+                               StatevectorSimulator().probabilities(circuit), atol=1e-10)
+
+def test_bond_limit_truncates_and_reports_it():
+    circuit = build_catalog_circuit('portfolio_qaoa', 10, {'layers': 3})
+    diagnostics = MPSSimulator(max_bond_dimension=2).simulate(circuit).diagnostics()
+    assert diagnostics['bond_dimension_reached'] <= 2
+    assert diagnostics['truncations'] > 0 and diagnostics['fidelity_estimate'] < 1.0
+
+def test_wide_ghz_sampling_without_dense_vector():
+    n = 40
+    circuit = Circuit(n).h(0)
+    for q in range(n - 1):
+        circuit.cx(q, q + 1)
+    counts = MPSSimulator(seed=3).run(circuit, shots=400)['measurement_counts']
+    assert set(counts) <= {'0' * n, '1' * n} and sum(counts.values()) == 400
\ No newline at end of file
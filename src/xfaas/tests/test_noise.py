@@ -0,0 +1,39 @@
+"""
+Tests for noisy circuit simulation
+"""
+
+import numpy as np
+import pytest
+from circuit_catalog import build_catalog_circuit
+from noise import NoiseModel, NoisySimulator
+from statevector import StatevectorSimulator
+
+def test_zero_noise_matches_ideal_simulation():
+    circuit = build_catalog_circuit('optimization_circuit', 4)
+    ideal = StatevectorSimulator().probabilities(circuit)
+    for method in ('density_matrix', 'trajectories'):
+        probabilities, _ = NoisySimulator(NoiseModel(), method=method, trajectories=8).probabilities(circuit)
+        np.testing.assert_allclose(probabilities, ideal, atol=1e-10)
+
+def test_trajectories_estimate_the_density_matrix():
+    circuit = build_catalog_circuit('portfolio_qaoa', 4)
+    noise = NoiseModel(depolarizing=0.02, amplitude_damping=0.01, readout_error=0.01)
+    exact, diagnostics = NoisySimulator(noise, method='density_matrix').probabilities(circuit)
+    estimate, _ = NoisySimulator(noise, method='trajectories', trajectories=4000, seed=5).probabilities(circuit)
+    assert diagnostics['purity'] < 1.0
+    assert 0.5 * np.abs(exact - estimate).sum() < 0.05
+
+def test_readout_error_flips_bits():
+    probabilities = NoiseModel(readout_error=0.1).apply_readout(np.array([1.0, 0.0, 0.0, 0.0]), 2)
+    np.testing.assert_allclose(probabilities, [0.81, 0.09, 0.09, 0.01])
+
+def test_full_depolarizing_gives_uniform_distribution():
+    circuit = build_catalog_circuit('bell_state')
+    probabilities, _ = NoisySimulator(NoiseModel(depolarizing=0.75)).probabilities(circuit)
+    np.testing.assert_allclose(probabilities, np.full(4, 0.25), atol=1e-12)
+
+def test_invalid_noise_specs_are_rejected():
+    with pytest.raises(ValueError):
+        NoiseModel.from_dict({'bitflip': 0.1})
+    with pytest.raises(ValueError):
+        NoiseModel(depolarizing=1.5)
\ No newline at end of file
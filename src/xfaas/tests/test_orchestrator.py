@@ -0,0 +1,66 @@
+"""
+Tests for cross-platform execution modes
+"""
+
+import asyncio
+import time
+import pytest
+from xfaas_manager import XFaaSManager
+from xfaas_orchestrator import XFaaSOrchestrator
+
+COUNTS = {'00': 51, '11': 49}
+
+class ScriptedManager(XFaaSManager):
+    """Answers each provider after a fixed delay, failing the providers listed in `failing`"""
+    
+    def __init__(self, delays=None, failing=()):
+        super().__init__()
+        self.delays = delays or {}
+        self.failing = set(failing)
+    
+    def execute_quantum_task(self, provider, function_name, payload):
+        time.sleep(self.delays.get(provider.value, 0.0))
+        if provider.value in self.failing:
+            return {'error': 'provider failure', 'success': False}
+        return {'measurement_counts': dict(COUNTS), 'shots': 100, 'success': True}
+
+def _orchestrator(**scripted):
+    orchestrator = XFaaSOrchestrator()
+    orchestrator.manager = ScriptedManager(**scripted)
+    return orchestrator
+
+def test_quorum_returns_without_the_slow_provider():
+    orchestrator = _orchestrator(delays={'gcp': 3.0})
+    started = time.monotonic()
+    analysis = asyncio.run(orchestrator.execute_cross_platform_quantum('bell_state', mode='quorum:2'))
+    assert time.monotonic() - started < 2.0
+    assert analysis['quorum_reached']
+    assert sorted(analysis['agreeing_providers']) == ['aws', 'azure']
+    assert analysis['cancelled_providers'] == ['gcp']
+
+def test_first_mode_tolerates_a_failing_provider():
+    orchestrator = _orchestrator(failing=['aws'])
+    analysis = asyncio.run(orchestrator.execute_cross_platform_quantum('bell_state', mode='first'))
+    assert analysis['quorum_reached'] and analysis['agreeing_providers']
+    assert 'aws' not in analysis['agreeing_providers']
+
+def test_hedging_invokes_the_next_provider_after_a_failure():
+    orchestrator = _orchestrator(failing=['aws'])
+    analysis = asyncio.run(orchestrator.execute_cross_platform_quantum('bell_state', mode='first', hedge=True))
+    assert analysis['quorum_reached'] and analysis['hedged']
+    assert not analysis['provider_results']['aws']['success']
+    assert len(analysis['provider_results']) == 2
+
+def test_independent_samples_agree_and_different_circuits_do_not():
+    orchestrator = XFaaSOrchestrator()
+    uniform = {'success': True, 'shots': 1000, 'measurement_counts': {'00': 262, '01': 241, '10': 251, '11': 246}}
+    resampled = {'success': True, 'shots': 1000, 'measurement_counts': {'00': 239, '01': 255, '10': 258, '11': 248}}
+    bell = {'success': True, 'shots': 1000, 'measurement_counts': {'00': 508, '11': 492}}
+    assert orchestrator._agrees(uniform, resampled)
+    assert not orchestrator._agrees(uniform, bell)
+
+def test_invalid_execution_modes_are_rejected():
+    orchestrator = XFaaSOrchestrator()
+    for mode in ('quorum:0', 'quorum:4', 'fastest'):
+        with pytest.raises(ValueError):
+            orchestrator._parse_execution_mode(mode)
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Tests for shot splitting and chunking across worker processes
+"""
+
+from parallel_execution import spawn_seeds, split_shots, merge_counts, contiguous_chunks
+
+def test_split_shots_preserves_the_total_with_distinct_seeds():
+    parts = split_shots({'circuit': 'bell_state', 'shots': 1001, 'seed': 4}, 4)
+    assert [part['shots'] for part in parts] == [251, 250, 250, 250]
+    assert len({part['seed'] for part in parts}) == 4
+    assert split_shots({'shots': 1001, 'seed': 4}, 4)[2]['seed'] == parts[2]['seed']
+
+def test_unseeded_splits_are_not_reproducible():
+    assert spawn_seeds(None, 3) != spawn_seeds(None, 3)
+    assert spawn_seeds(9, 3) == spawn_seeds(9, 3)
+
+def test_merge_counts_sums_by_outcome():
+    assert merge_counts([{'01': 2, '11': 1}, {'11': 4}, {}]) == {'01': 2, '11': 5}
+
+def test_contiguous_chunks_are_balanced_and_ordered():
+    chunks = contiguous_chunks(list(range(7)), 3)
+    assert chunks == [[0, 1, 2], [3, 4], [5, 6]]
+    assert contiguous_chunks([1, 2], 5) == [[1], [2]]
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Tests for batched parameter sweeps
+"""
+
+import numpy as np
+import pytest
+from circuit_catalog import build_catalog_circuit
+from parameter_sweep import ParameterSweep, parameter_vector, symbolic, diagonal_observable
+from statevector import StatevectorSimulator
+
+def _bound_circuit(values):
+    return build_catalog_circuit('portfolio_qaoa', 4, {'layers': 2, 'gamma': values[0], 'beta': values[1]})
+
+def test_sweep_matches_per_point_simulation():
+    gamma, beta = parameter_vector(2)
+    circuit = build_catalog_circuit('portfolio_qaoa', 4, {'layers': 2, 'gamma': gamma, 'beta': beta})
+    parameter_sets = np.random.default_rng(0).uniform(0, np.pi, size=(12, 2))
+    simulator = StatevectorSimulator()
+    expected = np.array([simulator.probabilities(_bound_circuit(values)) for values in parameter_sets])
+    np.testing.assert_allclose(ParameterSweep().probabilities(circuit, parameter_sets), expected, atol=1e-12)
+
+def test_chunking_does_not_change_results():
+    gamma, beta = parameter_vector(2)
+    circuit = build_catalog_circuit('portfolio_qaoa', 4, {'gamma': gamma, 'beta': beta})
+    parameter_sets = np.random.default_rng(1).uniform(0, np.pi, size=(9, 2))
+    # A budget this small holds a single parameter set per chunk
+    small = ParameterSweep(memory_budget=1).expectations(circuit, parameter_sets, {'ZZII': 1.0})
+    whole = ParameterSweep().expectations(circuit, parameter_sets, {'ZZII': 1.0})
+    np.testing.assert_allclose(small, whole, atol=1e-12)
+
+def test_symbolic_placeholders_become_parameters():
+    params = symbolic({'gamma': {'parameter': 1, 'scale': 2.0}, 'beta': 0.3})
+    assert params['gamma'].index == 1 and params['gamma'].scale == 2.0 and params['beta'] == 0.3
+
+def test_pauli_observable_uses_qiskit_order():
+    diagonal = diagonal_observable({'ZI': 1.0}, 2)
+    # The leftmost character is qubit 1, bit 1 of the basis index
+    np.testing.assert_array_equal(diagonal, [1, 1, -1, -1])
+    with pytest.raises(ValueError):
+        diagonal_observable({'ZX': 1.0}, 2)
\ No newline at end of file
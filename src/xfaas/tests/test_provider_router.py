@@ -0,0 +1,38 @@
+"""
+Tests for latency-aware provider routing
+"""
+
+from unittest import mock
+from provider_router import LatencyRouter, LatencySketch
+from xfaas_manager import CloudProvider
+
+AWS, AZURE, GCP = CloudProvider.AWS, CloudProvider.AZURE, CloudProvider.GCP
+
+def test_sketch_quantiles_within_relative_accuracy():
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in range(1, 1001):
+        sketch.add(value / 1000)
+    assert abs(sketch.quantile(0.5) - 0.5) <= 0.5 * 0.02
+    assert abs(sketch.quantile(0.99) - 0.99) <= 0.99 * 0.02
+
+def test_unmeasured_then_fastest_provider_first():
+    router = LatencyRouter([AWS, AZURE, GCP], alpha=0.5, max_error_rate=0.5)
+    router.record(AWS, 0.3, True)
+    router.record(AZURE, 0.1, True)
+    assert router.rank_providers() == [GCP, AZURE, AWS]
+    router.record(GCP, 0.2, True)
+    assert router.select_provider() == AZURE
+
+def test_failing_provider_is_demoted_then_recovers():
+    router = LatencyRouter([AWS, AZURE], alpha=0.5, max_error_rate=0.3, error_half_life=10)
+    with mock.patch('provider_router.time.time', return_value=0.0):
+        router.record(AWS, 0.1, True)
+        router.record(AZURE, 0.5, True)
+        router.record(AWS, 0.1, False)
+        router.record(AWS, 0.1, False)
+        assert not router.is_healthy(AWS)
+        assert router.rank_providers() == [AZURE, AWS]
+    # Idle for three half-lives: 0.75 decays to under 0.1
+    with mock.patch('provider_router.time.time', return_value=30.0):
+        assert router.is_healthy(AWS)
+        assert router.rank_providers() == [AWS, AZURE]
\ No newline at end of file
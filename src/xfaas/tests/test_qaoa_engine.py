@@ -0,0 +1,58 @@
+"""
+Tests for the QAOA portfolio engine
+"""
+
+import itertools
+import numpy as np
+from qaoa_engine import markowitz_qubo, cost_diagonal, decode_portfolio, QAOAPortfolioOptimizer
+from statevector import StatevectorSimulator
+
+def _market(n, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.1, 0.05, n)
+    factors = rng.normal(size=(n, n))
+    return returns, factors @ factors.T / n
+
+def test_cost_diagonal_matches_brute_force():
+    returns, cov = _market(6)
+    quadratic, linear, constant = markowitz_qubo(returns, cov, risk_aversion=0.7, budget=3)
+    diagonal = cost_diagonal(quadratic, linear, constant)
+    for index in range(2 ** 6):
+        x = np.array([(index >> k) & 1 for k in range(6)], dtype=float)
+        expected = 0.7 * x @ cov @ x - returns @ x
+        penalty = diagonal[index] - expected
+        # The budget penalty vanishes exactly on selections of the budget size
+        assert (abs(penalty) < 1e-9) == (x.sum() == 3)
+        assert penalty > -1e-9
+
+def test_optimum_respects_budget():
+    returns, cov = _market(5, seed=3)
+    optimizer = QAOAPortfolioOptimizer(returns, cov, budget=2)
+    best = int(np.argmin(optimizer.costs))
+    assert bin(best).count('1') == 2
+    selections = list(itertools.combinations(range(5), 2))
+    objective = [0.5 * cov[np.ix_(s, s)].sum() - returns[list(s)].sum() for s in selections]
+    assert sorted(k for k in range(5) if best >> k & 1) == list(selections[int(np.argmin(objective))])
+
+def test_circuit_matches_statevector_up_to_phase():
+    returns, cov = _market(4, seed=1)
+    optimizer = QAOAPortfolioOptimizer(returns, cov, layers=2)
+    angles = [0.4, 0.9, 0.3, 0.7]
+    state = StatevectorSimulator().statevector(optimizer.circuit(angles))
+    assert np.isclose(abs(np.vdot(state, optimizer.statevector(angles))), 1.0)
+
+def test_optimized_angles_beat_uniform_sampling():
+    returns, cov = _market(5, seed=2)
+    optimizer = QAOAPortfolioOptimizer(returns, cov)
+    metadata = optimizer.optimize(grid_points=6, max_iterations=80)
+    assert metadata['expected_cost'] < optimizer.costs.mean()
+    assert metadata['optimal_cost'] == optimizer.costs.min()
+
+def test_decode_portfolio_picks_lowest_cost_sample():
+    returns, cov = _market(4, seed=4)
+    quadratic, linear, constant = markowitz_qubo(returns, cov, budget=2)
+    costs = cost_diagonal(quadratic, linear, constant)
+    counts = {format(i, '04b'): 10 for i in range(16)}
+    portfolio = decode_portfolio(counts, returns, cov, budget=2)
+    assert int(portfolio['bitstring'], 2) == int(np.argmin(costs))
+    assert np.isclose(sum(portfolio['weights']), 1.0)
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Tests for the handler-side execution core
+"""
+
+import time
+from unittest import mock
+import numpy as np
+import pytest
+from circuit_catalog import CIRCUIT_BUILDERS
+from quantum_core import NumpyEngine, NoisyEngine, MPSEngine, execute_payloads, handle_request
+from result_writer import ResultWriter
+
+def test_seeded_payloads_are_reproducible():
+    payload = {'circuit': 'optimization_circuit', 'shots': 500, 'seed': 7}
+    first, second = execute_payloads([payload, dict(payload)], 'local', 'numpy')
+    assert first['success'] and first['measurement_counts'] == second['measurement_counts']
+    assert sum(first['measurement_counts'].values()) == 500
+
+def test_exact_probabilities_of_bell_state():
+    result = execute_payloads([{'circuit': 'bell_state', 'shots': 100, 'exact': True}], 'local', 'numpy')[0]
+    assert result['probabilities'] == pytest.approx({'00': 0.5, '11': 0.5})
+    assert set(result['measurement_counts']) <= {'00', '11'}
+
+def test_engines_without_shot_runs_sample_probabilities():
+    assert not NumpyEngine.runs_shots and not hasattr(NumpyEngine, 'run_shots')
+    assert not NoisyEngine.runs_shots and not hasattr(NoisyEngine, 'run_shots')
+    payload = {'circuit': 'bell_state', 'shots': 200, 'seed': 1, 'sampling': 'shots'}
+    for simulator in ('numpy', 'noisy'):
+        result = execute_payloads([payload], 'local', simulator)[0]
+        assert result['success'] and sum(result['measurement_counts'].values()) == 200
+
+def test_mps_matches_statevector_engine():
+    payload = {'circuit': 'portfolio_qaoa', 'n_qubits': 6, 'params': {'layers': 2}}
+    mps = MPSEngine().probabilities([payload])[0]
+    dense = NumpyEngine().probabilities([payload])[0]
+    np.testing.assert_allclose(mps, dense, atol=1e-10)
+
+def test_grover_probabilities_match_qiskit():
+    pytest.importorskip('qiskit')
+    from quantum_core import QiskitEngine
+    payload = {'circuit': 'grover_search', 'n_qubits': 5, 'params': {'marked': [3, 17, 30]}}
+    qiskit_probabilities = QiskitEngine().probabilities([payload])[0]
+    np.testing.assert_allclose(qiskit_probabilities, NumpyEngine().probabilities([payload])[0], atol=1e-10)
+
+def test_invalid_request_is_a_client_error():
+    uploads = []
+    writer = ResultWriter(lambda key, body: uploads.append(key), 'test')
+    status, result = handle_request({'circuit': 'no_such_circuit'}, 'local', 'r1', 'test', writer, 'numpy')
+    assert status == 400 and result['client_error'] and not result['success']
+    status, _ = handle_request({'circuit': 'bell_state'}, 'local', 'r2', 'test', writer, 'no_such_simulator')
+    assert status == 400
+    status, _ = handle_request({'circuit': 'bell_state', 'params': {'angle': 1}},
+                               'local', 'r2', 'test', writer, 'numpy')
+    assert status == 400
+    assert uploads == []
+
+def test_batch_request_keeps_per_entry_errors():
+    writer = ResultWriter(lambda key, body: None, 'test')
+    status, result = handle_request({'batch': [{'circuit': 'bell_state', 'shots': 10}, {'circuit': 'nope'}],
+                                     'persist': False}, 'local', 'r3', 'test', writer, 'numpy')
+    assert status == 200 and result['batch_size'] == 2 and result['failed_entries'] == 1
+    assert result['results'][0]['success'] and result['results'][1]['client_error']
+
+def test_errors_outside_request_validation_are_server_errors():
+    def broken(n_qubits):
+        raise KeyError('engine bug')
+    writer = ResultWriter(lambda key, body: None, 'test')
+    with mock.patch.dict(CIRCUIT_BUILDERS, {'broken': broken}):
+        status, result = handle_request({'circuit': 'broken'}, 'local', 'r6', 'test', writer, 'numpy')
+        assert status == 500 and 'client_error' not in result
+        status, result = handle_request({'batch': [{'circuit': 'broken'}, {'circuit': 'nope'}], 'persist': False},
+                                        'local', 'r7', 'test', writer, 'numpy')
+        assert status == 500 and not result['success'] and result['failed_entries'] == 2
+
+def test_batch_of_invalid_entries_is_a_client_error():
+    writer = ResultWriter(lambda key, body: None, 'test')
+    status, result = handle_request({'batch': [{'circuit': 'nope'}, {'circuit': 'superposition', 'n_qubits': 99}],
+                                     'persist': False}, 'local', 'r8', 'test', writer, 'numpy')
+    assert status == 400 and result['client_error'] and not result['success']
+
+def test_response_does_not_wait_for_its_own_upload():
+    uploads = []
+    writer = ResultWriter(lambda key, body: (time.sleep(0.5), uploads.append(key)), 'test')
+    started = time.monotonic()
+    status, _ = handle_request({'circuit': 'bell_state', 'shots': 10, 'persistence': 'async'},
+                               'local', 'r4', 'test', writer, 'numpy')
+    assert status == 200 and time.monotonic() - started < 0.4 and uploads == []
+    # The next request, even an invalid one, lets the earlier upload finish first
+    status, _ = handle_request({'circuit': 'no_such_circuit'}, 'local', 'r5', 'test', writer, 'numpy')
+    assert status == 400 and uploads == ['test-result-r4.json']
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Tests for the circuit breaker and the adaptive concurrency limiter
+"""
+
+from unittest import mock
+from resilience import CircuitBreaker, CircuitState, AdaptiveConcurrencyLimiter
+
+def test_breaker_opens_after_threshold_and_recovers_through_half_open():
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=10, half_open_max_calls=1)
+    with mock.patch('resilience.time.monotonic', return_value=100.0):
+        for _ in range(3):
+            assert breaker.allow_request()
+            breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN and not breaker.allow_request()
+    with mock.patch('resilience.time.monotonic', return_value=111.0):
+        assert breaker.allow_request() and breaker.state == CircuitState.HALF_OPEN
+        # Only one probe at a time while half-open
+        assert not breaker.allow_request()
+        breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED and breaker.consecutive_failures == 0
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=10, half_open_max_calls=1)
+    with mock.patch('resilience.time.monotonic', return_value=0.0):
+        breaker.record_failure()
+    with mock.patch('resilience.time.monotonic', return_value=20.0):
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN and not breaker.allow_request()
+
+def test_release_returns_a_probe_slot_without_an_outcome():
+    breaker = CircuitBreaker('test', failure_threshold=1, recovery_timeout=10, half_open_max_calls=1)
+    with mock.patch('resilience.time.monotonic', return_value=0.0):
+        breaker.record_failure()
+    with mock.patch('resilience.time.monotonic', return_value=20.0):
+        assert breaker.allow_request()
+        breaker.release()
+        assert breaker.state == CircuitState.HALF_OPEN and breaker.allow_request()
+
+def test_limiter_grows_additively_and_halves_on_failure():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=1, max_limit=8,
+                                         backoff_ratio=0.5, slow_call_threshold=1.0)
+    assert limiter.try_acquire()
+    limiter.release(0.1, True)
+    assert limiter.limit == 4.25
+    assert limiter.try_acquire()
+    limiter.release(0.1, False)
+    assert limiter.limit == 2.125
+    assert limiter.try_acquire()
+    limiter.release(5.0, True)
+    assert limiter.limit == 1.0625
+    assert limiter.try_acquire()
+    limiter.release()
+    assert limiter.limit == 1.0625 and limiter.in_flight == 0
+
+def test_limiter_sheds_calls_over_the_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=8)
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    assert limiter.snapshot()['rejected_calls'] == 1
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Tests for the content-addressed result cache
+"""
+
+from unittest import mock
+from result_cache import ResultCache, canonical_hash
+from xfaas_manager import XFaaSManager, CloudProvider
+
+RESULT = {'success': True, 'measurement_counts': {'00': 3, '11': 5}}
+
+def test_hash_ignores_key_order_and_storage_fields():
+    payload = {'circuit': 'bell_state', 'shots': 8, 'seed': 1, 'params': {'a': 1, 'b': 2}}
+    reordered = {'params': {'b': 2, 'a': 1}, 'seed': 1, 'shots': 8, 'circuit': 'bell_state'}
+    assert canonical_hash(payload, 'aws/f') == canonical_hash(dict(reordered, persist=False), 'aws/f')
+    assert canonical_hash(payload, 'aws/f') != canonical_hash(payload, 'gcp/f')
+    assert canonical_hash(payload, 'aws/f') != canonical_hash(dict(payload, seed=2), 'aws/f')
+
+def test_entries_expire_after_ttl():
+    cache = ResultCache(ttl=10)
+    with mock.patch('result_cache.time.time', return_value=1000.0):
+        cache.put('k', RESULT)
+    with mock.patch('result_cache.time.time', return_value=1009.0):
+        assert cache.get('k') == RESULT
+    with mock.patch('result_cache.time.time', return_value=1011.0):
+        assert cache.get('k') is None
+    assert cache.statistics()['expirations'] == 1
+
+def test_results_are_copied_in_and_out():
+    cache = ResultCache()
+    stored = {'success': True, 'measurement_counts': {'0': 1}}
+    cache.put('k', stored)
+    stored['measurement_counts']['0'] = 99
+    returned = cache.get('k')
+    returned['measurement_counts']['1'] = 5
+    assert cache.get('k')['measurement_counts'] == {'0': 1}
+
+def test_failed_results_are_not_stored_and_lru_evicts():
+    cache = ResultCache(max_entries=2)
+    cache.put('failed', {'success': False, 'error': 'boom'})
+    assert cache.get('failed') is None
+    cache.put('a', RESULT)
+    cache.put('b', RESULT)
+    cache.get('a')
+    cache.put('c', RESULT)
+    assert cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    ResultCache(directory=tmp_path).put('k', RESULT)
+    fresh = ResultCache(directory=tmp_path)
+    assert fresh.get('k') == RESULT
+    assert fresh.statistics()['disk_hits'] == 1
+
+class CountingManager(XFaaSManager):
+    """Counts the invocations that get past the result cache"""
+    
+    calls = 0
+    
+    def _execute_uncached(self, provider, function_name, payload):
+        self.calls += 1
+        return dict(RESULT)
+
+def test_manager_caches_only_seeded_payloads_by_default():
+    manager = CountingManager(result_cache=ResultCache())
+    for payload, expected_calls in (({'circuit': 'bell_state', 'seed': 1}, 1),
+                                    ({'circuit': 'bell_state'}, 2),
+                                    ({'circuit': 'bell_state', 'cache': True}, 1)):
+        manager.calls = 0
+        manager.execute_quantum_task(CloudProvider.AWS, 'f', payload)
+        manager.execute_quantum_task(CloudProvider.AWS, 'f', payload)
+        assert manager.calls == expected_calls
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Tests for result persistence
+"""
+
+import json
+import threading
+import time
+from result_writer import ResultWriter
+
+def test_background_uploads_finish_before_the_next_invocation():
+    uploads = {}
+    writer = ResultWriter(lambda key, body: (time.sleep(0.2), uploads.__setitem__(key, body)), 'batch')
+    writer.on_invocation()
+    started = time.monotonic()
+    writer.write('sync-key', {'n': 1}, 'sync')
+    writer.write('async-key', {'n': 2}, 'async')
+    writer.write('batched-key', {'n': 3}, 'batched')
+    # Only the sync upload is on the invocation's own path
+    assert time.monotonic() - started < 0.35
+    assert writer.on_invocation()
+    assert json.loads(uploads['async-key']) == {'n': 2}
+    assert writer.drain(1.0)
+    batches = [json.loads(body) for key, body in uploads.items() if key.startswith('batch-')]
+    assert batches == [{'count': 1, 'results': [{'key': 'batched-key', 'result': {'n': 3}}]}]
+
+def test_wait_for_earlier_uploads_is_bounded_and_counted():
+    release = threading.Event()
+    writer = ResultWriter(lambda key, body: release.wait(), 'batch', drain_timeout=0.05)
+    writer.write('slow', {}, 'async')
+    started = time.monotonic()
+    assert not writer.on_invocation()
+    assert time.monotonic() - started < 1.0
+    assert writer.statistics()['undrained_invocations'] == 1
+    release.set()
+    assert writer.drain(1.0)
+
+def test_failed_background_uploads_are_counted():
+    def fail(key, body):
+        raise IOError('storage unavailable')
+    writer = ResultWriter(fail, 'batch')
+    writer.write('k', {}, 'async')
+    assert writer.on_invocation()
+    assert writer.statistics()['failed_uploads'] == 1
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+Local Multi-Provider Emulator for XFaaS
+Serves Lambda-invoke, Azure Functions and GCP Functions compatible HTTP endpoints
+backed by the project's handlers, with injectable latency, cold starts, errors and throttling
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any
+from local_backend import run_handler
+from config import EMULATOR_CONFIG
+
+LAMBDA_INVOKE_PATH = re.compile(r'^/2015-03-31/functions/(?P<name>[^/]+)/invocations$')
+AZURE_PATH = re.compile(r'^/api/(?P<name>[^/]+)$')
+GCP_PATH = re.compile(r'^/(?P<name>[^/]+)$')
+
+class FaultProfile:
+    """Injected latency, cold-start, error and throttling behaviour for one provider"""
+    
+    def __init__(self, **overrides):
+        settings = {key: EMULATOR_CONFIG[key] for key in (
+            'latency_median', 'latency_sigma', 'cold_start_delay',
+            'idle_timeout', 'error_rate', 'max_concurrency'
+        )}
+        unknown = set(overrides) - set(settings)
+        if unknown:
+            raise ValueError(f"Unknown fault profile settings: {sorted(unknown)}")
+        settings.update(overrides)
+        self.__dict__.update(settings)
+    
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency_median <= 0:
+            return 0.0
+        return rng.lognormvariate(0.0, self.latency_sigma) * self.latency_median
+
+class EmulatedFunction:
+    """Warm-container and concurrency bookkeeping for one emulated function"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.warm_containers = 0
+        self.busy = 0
+        self.last_activity = 0.0
+        self.stats = {'invocations': 0, 'cold_starts': 0, 'throttled': 0, 'injected_errors': 0}
+    
+    def acquire(self, profile: FaultProfile):
+        """Claim a container; returns (admitted, cold_start)"""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.last_activity > profile.idle_timeout:
+                # Every container has been reclaimed after the idle period
+                self.warm_containers = self.busy
+            self.last_activity = now
+            
+            if self.busy >= profile.max_concurrency:
+                self.stats['throttled'] += 1
+                return False, False
+            
+            self.busy += 1
+            self.stats['invocations'] += 1
+            cold = self.busy > self.warm_containers
+            if cold:
+                self.warm_containers += 1
+                self.stats['cold_starts'] += 1
+            return True, cold
+    
+    def release(self):
+        with self.lock:
+            self.busy -= 1
+            self.last_activity = time.monotonic()
+
+class XFaaSEmulator:
+    """Threaded HTTP server emulating all three providers' invoke APIs"""
+    
+    def __init__(self, host: str = None, port: int = None,
+                 profiles: Dict[str, FaultProfile] = None,
+                 handlers: Dict[str, str] = None, seed: int = None):
+        self.host = host or EMULATOR_CONFIG['host']
+        self.port = port if port is not None else EMULATOR_CONFIG['port']
+        self.handlers = dict(EMULATOR_CONFIG['handlers'], **(handlers or {}))
+        self.profiles = {provider: FaultProfile() for provider in ('aws', 'azure', 'gcp')}
+        self.profiles.update(profiles or {})
+        self.functions: Dict[tuple, EmulatedFunction] = {}
+        self.functions_lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.server = None
+        self.thread = None
+    
+    def start(self) -> str:
+        """Start serving on a background thread and return the base URL"""
+        self.server = ThreadingHTTPServer((self.host, self.port), self._make_request_handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+    
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def manager_endpoints(self) -> Dict[str, str]:
+        """Endpoint overrides for XFaaSManager(endpoints=...)"""
+        return {
+            'aws': self.base_url,
+            'azure': self.base_url + '/api/{function_name}',
+            'gcp': self.base_url + '/{function_name}'
+        }
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.functions_lock:
+            return {f"{provider}/{name}": dict(function.stats)
+                    for (provider, name), function in self.functions.items()}
+    
+    def invoke(self, provider: str, function_name: str, payload: Dict[str, Any]):
+        """Run one emulated invocation; returns (status, body, extra headers)"""
+        profile = self.profiles[provider]
+        with self.functions_lock:
+            function = self.functions.setdefault((provider, function_name), EmulatedFunction())
+        
+        admitted, cold = function.acquire(profile)
+        if not admitted:
+            return self._throttled_response(provider)
+        
+        try:
+            with self.rng_lock:
+                delay = profile.sample_latency(self.rng)
+                inject_error = self.rng.random() < profile.error_rate
+            if cold:
+                delay += profile.cold_start_delay
+            time.sleep(delay)
+            
+            if inject_error:
+                with function.lock:
+                    function.stats['injected_errors'] += 1
+                return self._error_response(provider, 'Injected emulator failure')
+            
+            try:
+                body = run_handler(self.handlers[provider], payload)
+            except Exception as e:
+                return self._error_response(provider, str(e))
+            
+            # Answer with the handler's own status, e.g. 400 for an invalid request
+            status = body.pop('status_code', 200) if isinstance(body, dict) else 200
+            if provider == 'aws':
+                # Lambda returns the handler's own {'statusCode', 'body'} envelope
+                return 200, {'statusCode': status, 'body': json.dumps(body)}, {}
+            return status, body, {}
+        finally:
+            function.release()
+    
+    def _throttled_response(self, provider: str):
+        if provider == 'aws':
+            return 429, {'Type': 'User', 'message': 'Rate Exceeded.'}, {
+                'x-amzn-ErrorType': 'TooManyRequestsException'
+            }
+        return 429, {'error': 'Too many requests', 'success': False}, {}
+    
+    def _error_response(self, provider: str, message: str):
+        if provider == 'aws':
+            # An unhandled function error still returns 200 from the Invoke API
+            return 200, {'errorMessage': message, 'errorType': 'EmulatorError'}, {
+                'X-Amz-Function-Error': 'Unhandled'
+            }
+        return 500, {'error': message, 'success': False}, {}
+    
+    def _make_request_handler(self):
+        emulator = self
+        
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_POST(self):
+                path = self.path.split('?', 1)[0]
+                length = int(self.headers.get('Content-Length', 0))
+                raw = self.rfile.read(length) if length else b''
+                
+                for provider, pattern in (('aws', LAMBDA_INVOKE_PATH),
+                                          ('azure', AZURE_PATH),
+                                          ('gcp', GCP_PATH)):
+                    match = pattern.match(path)
+                    if match:
+                        break
+                else:
+                    self._respond(404, {'error': f'No emulated function at {path}'}, {})
+                    return
+                
+                try:
+                    payload = json.loads(raw) if raw else {}
+                except ValueError:
+                    self._respond(400, {'error': 'Request body is not valid JSON'}, {})
+                    return
+                
+                status, body, headers = emulator.invoke(provider, match.group('name'), payload)
+                self._respond(status, body, headers)
+            
+            def _respond(self, status, body, headers):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return RequestHandler
+
+def main():
+    parser = argparse.ArgumentParser(description='Local XFaaS multi-provider emulator')
+    parser.add_argument('--host', default=EMULATOR_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=EMULATOR_CONFIG['port'])
+    parser.add_argument('--handler', choices=['aws', 'azure', 'gcp'],
+                        help='Back every provider with this handler instead of its own')
+    parser.add_argument('--latency-median', type=float, default=EMULATOR_CONFIG['latency_median'])
+    parser.add_argument('--latency-sigma', type=float, default=EMULATOR_CONFIG['latency_sigma'])
+    parser.add_argument('--cold-start-delay', type=float, default=EMULATOR_CONFIG['cold_start_delay'])
+    parser.add_argument('--error-rate', type=float, default=EMULATOR_CONFIG['error_rate'])
+    parser.add_argument('--max-concurrency', type=int, default=EMULATOR_CONFIG['max_concurrency'])
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    
+    profile = dict(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        cold_start_delay=args.cold_start_delay,
+        error_rate=args.error_rate,
+        max_concurrency=args.max_concurrency
+    )
+    handlers = {provider: args.handler for provider in ('aws', 'azure', 'gcp')} if args.handler else None
+    emulator = XFaaSEmulator(
+        host=args.host,
+        port=args.port,
+        profiles={provider: FaultProfile(**profile) for provider in ('aws', 'azure', 'gcp')},
+        handlers=handlers,
+        seed=args.seed
+    )
+    
+    base_url = emulator.start()
+    print(f"XFaaS emulator listening on {base_url}")
+    for provider, endpoint in emulator.manager_endpoints().items():
+        print(f"  {provider}: {endpoint}")
+    
+    try:
+        emulator.thread.join()
+    except KeyboardInterrupt:
+        print("\nStopping emulator...")
+        emulator.stop()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
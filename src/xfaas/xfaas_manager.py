@@ -4,18 +4,44 @@ Handles cross-platform serverless function deployment and execution
 """
 
 import json
-import boto3
-from typing import Dict, Any
+import time
+import threading
+from typing import Dict, Any, List
 from enum import Enum
+from client_pool import get_lambda_client, get_http_session
+from config import CLOUD_PROVIDERS, CONNECTION_POOL_CONFIG
+from resilience import CircuitBreaker, AdaptiveConcurrencyLimiter, ProviderUnavailableError
+from result_cache import ResultCache, canonical_hash
 
 class CloudProvider(Enum):
     AWS = "aws"
     AZURE = "azure"
     GCP = "gcp"
+    LOCAL = "local"
 
 class XFaaSManager:
-    def __init__(self):
-        self.aws_lambda = boto3.client('lambda')
+    def __init__(self, endpoints: Dict[str, str] = None, result_cache=None, concurrency_limit: int = None):
+        # HTTP trigger URL templates per provider, e.g. a local stand-in server;
+        # an 'aws' entry replaces the Lambda API endpoint
+        self.endpoints = {
+            provider: CLOUD_PROVIDERS[provider]['endpoint']
+            for provider in ('azure', 'gcp')
+        }
+        self.endpoints.update(endpoints or {})
+        # Shared across managers so every orchestrator reuses one connection pool
+        self.aws_lambda = get_lambda_client(endpoint_url=self.endpoints.get('aws'))
+        self.http_session = get_http_session()
+        # Created on first use so cloud-only managers never import the handlers
+        self.local_backend = None
+        self.local_backend_lock = threading.Lock()
+        self.circuit_breakers = {provider: CircuitBreaker(provider.value) for provider in CloudProvider}
+        # concurrency_limit replaces RESILIENCE_CONFIG['initial_concurrency'], e.g. for load runs
+        self.concurrency_limiters = {
+            provider: AdaptiveConcurrencyLimiter(initial_limit=concurrency_limit) for provider in CloudProvider
+        }
+        # Identical payloads are answered from here without invoking anything; the default
+        # follows RESULT_CACHE_CONFIG and result_cache=False turns caching off
+        self.result_cache = ResultCache.from_config() if result_cache is None else (result_cache or None)
     
     def deploy_quantum_function(self, provider: CloudProvider, function_config: Dict[str, Any]):
         """Deploy quantum processing function to specified cloud provider"""
@@ -25,6 +51,8 @@ class XFaaSManager:
             return self._deploy_azure_function(function_config)
         elif provider == CloudProvider.GCP:
             return self._deploy_gcp_function(function_config)
+        elif provider == CloudProvider.LOCAL:
+            return {"status": "deployed", "provider": "local"}
     
     def _deploy_aws_lambda(self, config: Dict[str, Any]):
         """Deploy to AWS Lambda"""
@@ -49,13 +77,161 @@ class XFaaSManager:
         return {"status": "deployed", "provider": "gcp"}
     
     def execute_quantum_task(self, provider: CloudProvider, function_name: str, payload: Dict[str, Any]):
-        """Execute quantum task on specified cloud provider"""
+        """Execute quantum task on specified cloud provider
+        
+        Calls are rejected with ProviderUnavailableError, without contacting the
+        provider, while its circuit is open or its concurrency limit is reached.
+        Successful results of seeded payloads are cached by canonical payload
+        hash, and a cached result is returned before any of those checks.
+        """
+        key = self._cache_key(provider, function_name, payload)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = self._execute_uncached(provider, function_name, payload)
+        if key is not None:
+            self.result_cache.put(key, result)
+        return result
+    
+    def _execute_uncached(self, provider: CloudProvider, function_name: str, payload: Dict[str, Any]):
+        breaker = self.circuit_breakers[provider]
+        limiter = self.concurrency_limiters[provider]
+        
+        if not breaker.allow_request():
+            raise ProviderUnavailableError(f"Circuit open for {provider.value}")
+        if not limiter.try_acquire():
+            breaker.release()
+            raise ProviderUnavailableError(f"Concurrency limit reached for {provider.value}")
+        
+        start_time = time.monotonic()
+        outcome = 'failure'
+        try:
+            result = self._dispatch_quantum_task(provider, function_name, payload)
+            if self.is_client_error(result):
+                outcome = 'neutral'
+            elif not self._is_failed_result(result):
+                outcome = 'success'
+            return result
+        except Exception as e:
+            if self._is_client_status(self._exception_status(e)):
+                outcome = 'neutral'
+            raise
+        finally:
+            if outcome == 'neutral':
+                # A rejected request says nothing about the provider's health
+                limiter.release()
+                breaker.release()
+            else:
+                limiter.release(time.monotonic() - start_time, outcome == 'success')
+                if outcome == 'success':
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+    
+    def execute_quantum_batch(self, provider: CloudProvider, function_name: str,
+                              payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute several quantum tasks in a single invocation, one result per payload
+        
+        Cached entries are answered directly and only the rest are sent.
+        """
+        if not payloads:
+            return []
+        keys = [self._cache_key(provider, function_name, payload) for payload in payloads]
+        results = [self.result_cache.get(key) if key is not None else None for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        response = self.execute_quantum_task(provider, function_name,
+                                             {'batch': [payloads[i] for i in missing]})
+        for index, result in zip(missing, self._unpack_batch_response(response, len(missing))):
+            results[index] = result
+            if keys[index] is not None:
+                self.result_cache.put(keys[index], result)
+        return results
+    
+    def _cache_key(self, provider: CloudProvider, function_name: str, payload: Dict[str, Any]):
+        """Canonical result-cache key, or None for batch envelopes and uncached payloads
+        
+        Only seeded payloads are cached by default: an unseeded one asks for
+        fresh samples, so replaying stored counts would change its meaning.
+        'cache': True opts an unseeded payload in, 'cache': False opts out.
+        """
+        if self.result_cache is None or 'batch' in payload:
+            return None
+        if not payload.get('cache', payload.get('seed') is not None):
+            return None
+        return canonical_hash(payload, f'{provider.value}/{function_name}')
+    
+    def get_cache_statistics(self):
+        """Hit rate, size and evictions of the result cache (None when caching is off)"""
+        return self.result_cache.statistics() if self.result_cache is not None else None
+    
+    def _unpack_batch_response(self, response, expected: int):
+        """Split a batch response into per-payload results"""
+        body = response
+        if isinstance(body, dict) and isinstance(body.get('body'), str):
+            body = json.loads(body['body'])
+        
+        results = body.get('results') if isinstance(body, dict) else None
+        if isinstance(results, list) and len(results) == expected:
+            return results
+        
+        error = body.get('error') if isinstance(body, dict) else None
+        error = error or f'Expected {expected} batch results from provider'
+        return [{'error': error, 'success': False} for _ in range(expected)]
+    
+    def get_provider_health(self):
+        """Circuit breaker and concurrency limiter state per provider"""
+        return {
+            provider.value: {
+                **self.circuit_breakers[provider].snapshot(),
+                **self.concurrency_limiters[provider].snapshot()
+            }
+            for provider in CloudProvider
+        }
+    
+    def _is_failed_result(self, result):
+        """Whether a provider response reports a failed execution"""
+        if not isinstance(result, dict):
+            return False
+        return result.get('success') is False or result.get('statusCode', 200) >= 500
+    
+    def is_client_error(self, result):
+        """Whether a failed result was the request's fault rather than the provider's
+        
+        Transport errors, timeouts, throttling and 5xx responses count against
+        a provider's health; a request it rejected as invalid does not.
+        """
+        if not isinstance(result, dict) or result.get('success') is not False:
+            return False
+        return self._is_client_status(result.get('status_code', result.get('statusCode')))
+    
+    def _is_client_status(self, status):
+        """4xx other than request timeout and throttling"""
+        return status is not None and 400 <= status < 500 and status not in (408, 429)
+    
+    def _exception_status(self, error: Exception):
+        """HTTP status carried by a client exception, if any"""
+        response = getattr(error, 'response', None)
+        if isinstance(response, dict):
+            # botocore ClientError
+            return response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+        # requests HTTPError
+        return getattr(response, 'status_code', None)
+    
+    def _dispatch_quantum_task(self, provider: CloudProvider, function_name: str, payload: Dict[str, Any]):
+        """Send a quantum task to the provider-specific invocation path"""
         if provider == CloudProvider.AWS:
             return self._invoke_aws_lambda(function_name, payload)
         elif provider == CloudProvider.AZURE:
             return self._invoke_azure_function(function_name, payload)
         elif provider == CloudProvider.GCP:
             return self._invoke_gcp_function(function_name, payload)
+        elif provider == CloudProvider.LOCAL:
+            return self._invoke_local_function(function_name, payload)
     
     def _invoke_aws_lambda(self, function_name: str, payload: Dict[str, Any]):
         """Invoke AWS Lambda function"""
@@ -64,12 +240,60 @@ class XFaaSManager:
             InvocationType='RequestResponse',
             Payload=json.dumps(payload)
         )
-        return json.loads(response['Payload'].read())
+        result = json.loads(response['Payload'].read())
+        
+        if response.get('FunctionError'):
+            message = result.get('errorMessage') if isinstance(result, dict) else None
+            return {'error': message or response['FunctionError'], 'success': False}
+        
+        # Unwrap the {'statusCode', 'body'} envelope so results match the HTTP providers
+        if isinstance(result, dict) and isinstance(result.get('body'), str):
+            status = result.get('statusCode', 200)
+            result = json.loads(result['body'])
+            if status >= 400 and isinstance(result, dict):
+                result.setdefault('success', False)
+                result['status_code'] = status
+        return result
     
     def _invoke_azure_function(self, function_name: str, payload: Dict[str, Any]):
         """Invoke Azure Function"""
-        return {"result": "azure_execution_complete"}
+        headers = {}
+        if CLOUD_PROVIDERS['azure'].get('function_key'):
+            headers['x-functions-key'] = CLOUD_PROVIDERS['azure']['function_key']
+        return self._invoke_http_function('azure', function_name, payload, headers)
     
     def _invoke_gcp_function(self, function_name: str, payload: Dict[str, Any]):
         """Invoke Google Cloud Function"""
-        return {"result": "gcp_execution_complete"}
\ No newline at end of file
+        headers = {}
+        if CLOUD_PROVIDERS['gcp'].get('identity_token'):
+            headers['Authorization'] = f"Bearer {CLOUD_PROVIDERS['gcp']['identity_token']}"
+        return self._invoke_http_function('gcp', function_name, payload, headers)
+    
+    def _invoke_local_function(self, function_name: str, payload: Dict[str, Any]):
+        """Run the handler logic locally without any cloud calls"""
+        if self.local_backend is None:
+            with self.local_backend_lock:
+                if self.local_backend is None:
+                    from local_backend import LocalBackend
+                    self.local_backend = LocalBackend()
+        return self.local_backend.invoke(function_name, payload)
+    
+    def _invoke_http_function(self, provider: str, function_name: str,
+                              payload: Dict[str, Any], headers: Dict[str, str]):
+        """POST a payload to an HTTP-triggered function over the pooled session"""
+        url = self.endpoints[provider].format(function_name=function_name)
+        timeout = (CONNECTION_POOL_CONFIG['connect_timeout'], CLOUD_PROVIDERS[provider]['timeout'])
+        
+        response = self.http_session.post(url, json=payload, headers=headers, timeout=timeout)
+        try:
+            result = response.json() if response.content else {}
+        except ValueError:
+            response.raise_for_status()
+            raise
+        
+        if response.status_code >= 400:
+            if not isinstance(result, dict):
+                response.raise_for_status()
+            result.setdefault('success', False)
+            result['status_code'] = response.status_code
+        return result
\ No newline at end of file
@@ -4,35 +4,319 @@ XFaaS Orchestrator for Cross-Platform Quantum Execution
 
 import asyncio
 import json
+import math
+import time
+from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 from xfaas_manager import XFaaSManager, CloudProvider
+from resilience import ProviderUnavailableError
+from provider_router import LatencyRouter
+from micro_batcher import MicroBatcher
+from config import CLOUD_PROVIDERS, QUANTUM_CONFIG
 
 class XFaaSOrchestrator:
-    def __init__(self):
-        self.manager = XFaaSManager()
-        self.active_providers = [CloudProvider.AWS, CloudProvider.AZURE, CloudProvider.GCP]
+    def __init__(self, max_workers: int = None, hedge_delay: float = 1.0,
+                 micro_batching: bool = False, providers=None, manager: XFaaSManager = None,
+                 consensus_tolerance: float = None):
+        self.manager = manager or XFaaSManager()
+        # e.g. providers=[CloudProvider.LOCAL] for offline benchmarks
+        self.active_providers = list(providers or [CloudProvider.AWS, CloudProvider.AZURE, CloudProvider.GCP])
+        # Provider SDK calls are blocking, so each one runs on its own worker thread.
+        # Extra headroom keeps abandoned stragglers from starving new requests.
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or 4 * len(self.active_providers),
+            thread_name_prefix='xfaas-provider'
+        )
+        # Hedge delay used until a provider has enough latency samples for a p95
+        self.hedge_delay = hedge_delay
+        self.router = LatencyRouter(self.active_providers)
+        # Optionally coalesce concurrent single-task calls into batched invocations
+        self.batcher = MicroBatcher(self.manager, executor=self.executor) if micro_batching else None
+        # Independent samples never repeat counts exactly, so agreement allows some distance;
+        # None derives it from the shot counts (see _agreement_tolerance)
+        self.consensus_tolerance = (QUANTUM_CONFIG['consensus_tolerance']
+                                    if consensus_tolerance is None else consensus_tolerance)
+        self.consensus_sigma = QUANTUM_CONFIG['consensus_sigma']
+    
+    async def execute_cross_platform_quantum(self, circuit_type: str, shots: int = 100,
+                                             mode: str = 'all', hedge: bool = False,
+                                             params: Dict[str, Any] = None, n_qubits: int = None,
+                                             noise: Dict[str, float] = None, simulator: str = None):
+        """Execute quantum circuit across multiple cloud platforms
+        
+        mode='all' waits for every provider, mode='first' returns the first
+        successful result and mode='quorum:k' returns once k results agree.
+        With hedge=True only the providers needed for the quorum are invoked
+        up front, and a duplicate goes to the next provider whenever the
+        latest one passes its p95 latency or fails. `params` and `n_qubits`
+        are passed to the circuit builder; `noise` (e.g. {'depolarizing':
+        0.001, 'readout_error': 0.02}) runs the circuit under that noise model
+        and `simulator` ('numpy', 'qiskit', 'braket' or 'mps') overrides each
+        handler's default engine.
+        """
+        payload = self._build_payload(circuit_type, shots, params, n_qubits, noise, simulator)
+        quorum = self._parse_execution_mode(mode)
+        
+        if quorum is None and not hedge:
+            # Fan out to every provider at once; wall-clock time is the slowest provider
+            tasks = [
+                self._execute_on_provider(provider, payload)
+                for provider in self.active_providers
+            ]
+            provider_results = await asyncio.gather(*tasks)
+            
+            results = {
+                provider.value: result
+                for provider, result in zip(self.active_providers, provider_results)
+            }
+            analysis = self._analyze_cross_platform_results(results)
+            analysis['execution_mode'] = mode
+            return analysis
+        
+        return await self._execute_until_quorum(
+            payload, quorum or len(self.active_providers), mode, hedge
+        )
+    
+    async def execute_cross_platform_quantum_batch(self, payloads, batch_size: int = None):
+        """Execute many circuits across platforms, one invocation per provider per chunk
+        
+        Returns one cross-platform analysis per payload, in input order.
+        """
+        batch_size = batch_size or QUANTUM_CONFIG['batch_size']
+        analyses = []
+        
+        for start in range(0, len(payloads), batch_size):
+            chunk = payloads[start:start + batch_size]
+            provider_results = await asyncio.gather(*[
+                self._execute_batch_on_provider(provider, chunk)
+                for provider in self.active_providers
+            ])
+            
+            for index in range(len(chunk)):
+                results = {
+                    provider.value: batch_results[index]
+                    for provider, batch_results in zip(self.active_providers, provider_results)
+                }
+                analyses.append(self._analyze_cross_platform_results(results))
+        
+        return analyses
     
-    async def execute_cross_platform_quantum(self, circuit_type: str, shots: int = 100):
-        """Execute quantum circuit across multiple cloud platforms"""
+    async def execute_quantum(self, circuit_type: str, shots: int = 100,
+                              params: Dict[str, Any] = None, n_qubits: int = None,
+                              noise: Dict[str, float] = None, simulator: str = None):
+        """Execute a quantum circuit on the fastest healthy provider
+        
+        Falls back to the next provider in routing order when an invocation fails.
+        """
+        return await self._execute_routed(
+            self._build_payload(circuit_type, shots, params, n_qubits, noise, simulator)
+        )
+    
+    async def execute_parameter_sweep(self, circuit_type: str, parameter_sets, params: Dict[str, Any] = None,
+                                      n_qubits: int = None, output: str = 'expectation',
+                                      observable=None, shots: int = 100):
+        """Evaluate a parametric circuit at every parameter set in one routed invocation
+        
+        `params` holds the builder arguments, with {'parameter': i} marking the
+        ones taken from column i of `parameter_sets`. Returns execute_quantum's
+        layout; the result holds one expectation, distribution or count per row.
+        """
+        payload = self._build_payload(circuit_type, shots, params, n_qubits)
+        payload.update({
+            'parameter_sets': [[float(value) for value in row] for row in parameter_sets],
+            'output': output
+        })
+        if observable is not None:
+            payload['observable'] = observable if isinstance(observable, dict) else [float(v) for v in observable]
+        return await self._execute_routed(payload)
+    
+    async def _execute_routed(self, payload):
+        """Invoke providers in routing order until one succeeds"""
+        attempts = {}
+        for provider in self._ranked_providers():
+            result = await self._execute_on_provider(provider, payload)
+            attempts[provider.value] = result
+            if result.get('success', False):
+                return {
+                    'provider': provider.value,
+                    'result': result,
+                    'attempts': attempts,
+                    'success': True
+                }
+        
+        return {'provider': None, 'result': None, 'attempts': attempts, 'success': False}
+    
+    def get_provider_statistics(self):
+        """Snapshot of rolling latency, error-rate and health statistics per provider"""
+        statistics = self.router.snapshot()
+        for provider, health in self.manager.get_provider_health().items():
+            if provider in statistics:
+                statistics[provider].update(health)
+        return statistics
+    
+    def _ranked_providers(self):
+        """Providers in routing order, with open circuits moved to the back"""
+        ranked = self.router.rank_providers(self.active_providers)
+        available = [p for p in ranked if not self.manager.circuit_breakers[p].is_open()]
+        return available + [p for p in ranked if p not in available]
+    
+    def _build_payload(self, circuit_type: str, shots: int, params: Dict[str, Any] = None,
+                       n_qubits: int = None, noise: Dict[str, float] = None, simulator: str = None):
+        """Single-circuit payload sent to every provider"""
         payload = {
             'circuit': circuit_type,
-            'shots': shots
+            'shots': shots,
+            'sampling': QUANTUM_CONFIG['sampling']
         }
+        if params:
+            payload['params'] = params
+        if n_qubits is not None:
+            payload['n_qubits'] = n_qubits
+        if noise:
+            # Handlers route any payload with 'noise' to the noisy engine
+            payload['noise'] = dict(noise)
+        if simulator is not None:
+            # e.g. 'mps' for circuits wider than the dense statevector limit
+            payload['simulator'] = simulator
+        return payload
+    
+    def _parse_execution_mode(self, mode: str):
+        """Return the number of agreeing results required, or None for 'all'"""
+        if mode == 'all':
+            return None
+        if mode == 'first':
+            return 1
+        if mode.startswith('quorum:'):
+            try:
+                quorum = int(mode.split(':', 1)[1])
+            except ValueError:
+                raise ValueError(f"Invalid quorum size in mode '{mode}'")
+            if not 1 <= quorum <= len(self.active_providers):
+                raise ValueError(
+                    f"Quorum must be between 1 and {len(self.active_providers)}, got {quorum}"
+                )
+            return quorum
+        raise ValueError(f"Unknown execution mode '{mode}', expected 'all', 'first' or 'quorum:k'")
+    
+    async def _execute_until_quorum(self, payload, quorum: int, mode: str, hedge: bool):
+        """Run providers until `quorum` successful results agree, then drop the stragglers"""
+        # Fastest healthy providers go first so hedging starts from the best candidate
+        waiting = self._ranked_providers()
+        running = {}
+        results = {}
+        agreeing = []
+        winners = None
+        last_launch = None
         
-        tasks = []
-        for provider in self.active_providers:
-            function_name = f"quantum-processor-{provider.value}"
-            task = self.manager.execute_quantum_task(provider, function_name, payload)
-            tasks.append((provider, task))
+        def launch(count):
+            nonlocal last_launch
+            for _ in range(min(count, len(waiting))):
+                provider = waiting.pop(0)
+                task = asyncio.ensure_future(self._execute_on_provider(provider, payload))
+                running[task] = provider
+                last_launch = (provider, time.monotonic())
         
-        results = {}
-        for provider, task in tasks:
-            try:
-                result = await task if asyncio.iscoroutine(task) else task
+        launch(quorum if hedge else len(waiting))
+        
+        while running and winners is None:
+            timeout = None
+            if hedge and waiting:
+                provider, launched_at = last_launch
+                timeout = max(0.0, launched_at + self._p95_latency(provider) - time.monotonic())
+            
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                # Latest invocation passed its p95, so hedge onto the next provider
+                launch(1)
+                continue
+            
+            for task in done:
+                provider = running.pop(task)
+                result = task.result()
                 results[provider.value] = result
-            except Exception as e:
-                results[provider.value] = {'error': str(e), 'success': False}
+                
+                if result.get('success', False):
+                    group = self._agreeing_group(agreeing, result)
+                    group.append(provider.value)
+                    if len(group) >= quorum and winners is None:
+                        winners = group
+                elif hedge:
+                    launch(1)
+        
+        # Stragglers are cancelled; their executor threads finish and are ignored
+        for task in running:
+            task.cancel()
+        
+        analysis = self._analyze_cross_platform_results(results)
+        analysis.update({
+            'execution_mode': mode,
+            'hedged': hedge,
+            'quorum': quorum,
+            'quorum_reached': winners is not None,
+            'agreeing_providers': winners or [],
+            'cancelled_providers': [provider.value for provider in running.values()],
+            'skipped_providers': [provider.value for provider in waiting]
+        })
+        return analysis
+    
+    def _p95_latency(self, provider: CloudProvider):
+        """95th percentile of recent successful latencies for a provider"""
+        p95 = self.router.percentile(provider, 0.95, min_samples=5)
+        return self.hedge_delay if p95 is None else p95
+    
+    async def _execute_on_provider(self, provider: CloudProvider, payload):
+        """Run a single provider invocation on the executor with its configured timeout"""
+        function_name = f"quantum-processor-{provider.value}"
+        timeout = CLOUD_PROVIDERS[provider.value]['timeout']
+        loop = asyncio.get_running_loop()
+        
+        started = time.monotonic()
+        try:
+            if self.batcher is not None:
+                call = self.batcher.submit(provider, function_name, payload)
+            else:
+                call = loop.run_in_executor(
+                    self.executor,
+                    self.manager.execute_quantum_task,
+                    provider, function_name, payload
+                )
+            result = await asyncio.wait_for(call, timeout=timeout)
+        except ProviderUnavailableError as e:
+            # Shed before reaching the provider, so there is no latency to record
+            return {'error': str(e), 'success': False, 'rejected': True}
+        except asyncio.TimeoutError:
+            result = {'error': f'Timed out after {timeout}s', 'success': False}
+        except Exception as e:
+            result = {'error': str(e), 'success': False}
+        
+        if self.manager.is_client_error(result):
+            # An invalid request says nothing about the provider
+            return result
+        success = isinstance(result, dict) and result.get('success', False)
+        self.router.record(provider, time.monotonic() - started, success)
+        return result
+    
+    async def _execute_batch_on_provider(self, provider: CloudProvider, payloads):
+        """Run one batch invocation on the executor, expanding failures to every payload"""
+        function_name = f"quantum-processor-{provider.value}"
+        timeout = CLOUD_PROVIDERS[provider.value]['timeout']
+        loop = asyncio.get_running_loop()
         
-        return self._analyze_cross_platform_results(results)
+        # Batch latency scales with batch size, so it is kept out of the routing statistics
+        try:
+            call = loop.run_in_executor(
+                self.executor,
+                self.manager.execute_quantum_batch,
+                provider, function_name, payloads
+            )
+            return await asyncio.wait_for(call, timeout=timeout)
+        except asyncio.TimeoutError:
+            error = {'error': f'Timed out after {timeout}s', 'success': False}
+        except Exception as e:
+            error = {'error': str(e), 'success': False}
+        return [dict(error) for _ in payloads]
     
     def _analyze_cross_platform_results(self, results):
         """Analyze and compare results from different cloud providers"""
@@ -51,19 +335,74 @@ class XFaaSOrchestrator:
         if not successful_results:
             return {'consensus': False, 'reason': 'No successful executions'}
         
-        # Compare measurement counts for consensus
-        first_result = successful_results[0].get('measurement_counts', {})
-        consensus = all(
-            r.get('measurement_counts', {}) == first_result 
-            for r in successful_results
-        )
+        # Compare measurement count distributions for consensus
+        first_result = successful_results[0]
+        distances = [self._count_distance(first_result.get('measurement_counts', {}),
+                                          r.get('measurement_counts', {}))
+                     for r in successful_results[1:]]
         
         return {
-            'consensus': consensus,
+            'consensus': all(self._agrees(first_result, r) for r in successful_results[1:]),
             'agreement_percentage': len(successful_results) / len(results) * 100,
-            'reference_counts': first_result
+            'reference_counts': first_result.get('measurement_counts', {}),
+            'max_distance': max(distances, default=0.0)
         }
     
+    def _agreeing_group(self, groups, result):
+        """Provider list of the first group whose reference result agrees with `result`, or a new group"""
+        for reference, members in groups:
+            if self._agrees(reference, result):
+                return members
+        groups.append((result, []))
+        return groups[-1][1]
+    
+    def _agrees(self, first, second):
+        """Whether two results' count distributions lie within the agreement tolerance"""
+        distance = self._count_distance(first.get('measurement_counts', {}), second.get('measurement_counts', {}))
+        return distance <= self._agreement_tolerance(first, second)
+    
+    def _agreement_tolerance(self, first, second):
+        """Total variation distance up to which two results agree
+        
+        A fixed consensus_tolerance is used as given. Otherwise it is the
+        sampling noise between two independent draws of n1 and n2 shots from
+        one distribution over the k observed outcomes: a mean distance of at
+        most sqrt((k - 1) / (2 pi) * (1/n1 + 1/n2)) plus consensus_sigma
+        standard deviations of at most 0.3 * sqrt(1/n1 + 1/n2) each. Samples
+        with fewer shots than observed outcomes are too sparse to tell apart
+        and always agree.
+        """
+        if self.consensus_tolerance is not None:
+            return self.consensus_tolerance
+        first_counts, second_counts = first.get('measurement_counts', {}), second.get('measurement_counts', {})
+        outcomes = len(set(first_counts) | set(second_counts))
+        first_shots, second_shots = self._effective_shots(first), self._effective_shots(second)
+        if min(first_shots, second_shots) < outcomes:
+            return 1.0
+        spread = math.sqrt(1 / first_shots + 1 / second_shots)
+        return (math.sqrt((outcomes - 1) / (2 * math.pi)) + 0.3 * self.consensus_sigma) * spread
+    
+    def _effective_shots(self, result):
+        """Shots of a result discounted for the trajectory noise in its distribution
+        
+        A noisy trajectory run samples an average of T random trajectories,
+        which adds at most p(1 - p)/T to each outcome's variance, as if
+        1 / (1/shots + 1/T) shots were drawn from the exact noisy distribution.
+        """
+        shots = max(sum(result.get('measurement_counts', {}).values()), 1)
+        trajectories = (result.get('simulation') or {}).get('trajectories')
+        if trajectories:
+            return 1 / (1 / shots + 1 / trajectories)
+        return shots
+    
+    def _count_distance(self, first, second):
+        """Total variation distance between two measurement count distributions (0 when identical)"""
+        if first == second:
+            return 0.0
+        first_total, second_total = sum(first.values()) or 1, sum(second.values()) or 1
+        return 0.5 * sum(abs(first.get(k, 0) / first_total - second.get(k, 0) / second_total)
+                         for k in set(first) | set(second))
+    
     def deploy_to_all_platforms(self):
         """Deploy quantum functions to all cloud platforms"""
         deployment_results = {}